@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""Local stand-in for https://api.wheelofheaven.world/v1/, served from the corpus.
+
+The dataset pages link to API payloads that cannot be exercised offline.
+This server builds them from the shared page scan and serves them with the
+headers the real API needs:
+
+    /v1/                                 endpoint index
+    /v1/graph/                           the content graph (also .../content-graph.json)
+    /v1/graph/content-graph.graphml      the same graph as GraphML
+    /v1/graph/{section}/{slug}/          one node's ego network
+    /v1/coverage/                        translation coverage per language and section
+    /v1/pages/{url}                      page metadata, e.g. /v1/pages/de/wiki/adam-and-eve/
+    /v1/datasets/                        the dataset pages and their downloads
+    /v1/datasets/{name}.json|csv         tables the corpus holds (see dataset_tables.py)
+
+Collection payloads are rendered, hashed and gzipped once per corpus
+generation. Per-page payloads are rendered on first request and kept in an
+LRU cache. Every response carries a strong ETag (the gzip variant has its
+own), `If-None-Match` revalidation answers 304, and gzip is served when the
+client accepts it. A background thread keeps the SQLite corpus index
+(.cache/corpus.sqlite) up to date; when it re-indexes a page, the server
+swaps in a fresh generation, so an edit shows up on the next request.
+
+Usage:
+    python scripts/api_server.py                 # serve on http://127.0.0.1:8787/v1/
+    python scripts/api_server.py --port 9000 --no-reload
+    python scripts/api_server.py --bench         # requests per second, cold and warm
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import http.client
+import json
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import urlsplit
+
+from content_graph import build_graph, ego_network, is_node, node_id, to_graphml
+from corpus import ROOT, Page, normalize_url, scan
+from corpus_db import connect, update
+from dataset_tables import TABLES, dataset_pages, describe
+from i18n_dashboard import get_english_content, get_translation_coverage
+from namespace import build_namespace
+
+PREFIX = "/v1"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8787
+DEFAULT_CACHE_SIZE = 4096  # lazily rendered responses kept per generation; the corpus has ~2,800 pages
+DEFAULT_RELOAD_INTERVAL = 1.0
+
+JSON = "application/json; charset=utf-8"
+CSV = "text/csv; charset=utf-8"
+GRAPHML = "application/graphml+xml; charset=utf-8"
+
+# Bodies below this size are not worth a gzip variant
+MIN_GZIP_BYTES = 512
+
+
+@dataclass(frozen=True)
+class Response:
+    status: int
+    content_type: str
+    body: bytes
+    etag: str
+    gzipped: Optional[bytes] = None
+
+    @property
+    def gzip_etag(self) -> str:
+        return self.etag[:-1] + '-gzip"'
+
+
+def make_response(payload, content_type: str = JSON, status: int = 200) -> Response:
+    """Encode, hash and (when it pays off) gzip a payload once."""
+    if isinstance(payload, str):
+        body = payload.encode("utf-8")
+    elif isinstance(payload, bytes):
+        body = payload
+    else:
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+    etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+    gzipped = None
+    if len(body) >= MIN_GZIP_BYTES:
+        gzipped = gzip.compress(body, compresslevel=6, mtime=0)
+        if len(gzipped) >= len(body):
+            gzipped = None
+    return Response(status, content_type, body, etag, gzipped)
+
+
+def not_found(path: str) -> Response:
+    return make_response({"error": "not found", "path": path}, status=404)
+
+
+def accepts_gzip(header: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip (q=0 refuses it)."""
+    best = None
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if coding not in ("gzip", "x-gzip", "*"):
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding != "*" or best is None:
+            best = quality
+    return bool(best)
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """If-None-Match uses the weak comparison, so `W/"x"` matches `"x"`."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+class Api:
+    """Every payload of one corpus generation."""
+
+    def __init__(self, pages: list[Page], coverage: dict, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.built = datetime.now().isoformat(timespec="seconds")
+        self.pages = pages
+        self.namespace = build_namespace(pages)
+        self.translations: dict[str, dict[str, str]] = {}
+        for page in pages:
+            self.translations.setdefault(page.key, {})[page.lang] = page.url
+
+        self.graph = build_graph(pages)
+        graph = make_response(self.graph)
+        self.responses: dict[str, Response] = {
+            f"{PREFIX}/graph/": graph,
+            f"{PREFIX}/graph/content-graph.json": graph,
+            f"{PREFIX}/graph/content-graph.graphml": make_response(to_graphml(self.graph), GRAPHML),
+            f"{PREFIX}/coverage/": make_response({"generated": self.built, "languages": coverage}),
+        }
+        for name, table in ((name, build(pages)) for name, build in TABLES.items()):
+            self.responses[f"{PREFIX}/datasets/{name}.json"] = make_response(table.to_json())
+            self.responses[f"{PREFIX}/datasets/{name}.csv"] = make_response(table.to_csv(), CSV)
+
+        datasets = []
+        for page in dataset_pages(pages):
+            dataset = describe(page)
+            for download in dataset["downloads"]:
+                download["available"] = download["path"] in self.responses
+            datasets.append(dataset)
+        self.responses[f"{PREFIX}/datasets/"] = make_response({"datasets": datasets})
+        self.responses[f"{PREFIX}/"] = make_response({
+            "generated": self.built,
+            "pages": len(pages),
+            "endpoints": sorted(self.responses) + [f"{PREFIX}/graph/{{section}}/{{slug}}/", f"{PREFIX}/pages/{{url}}"],
+        })
+        # One cache per generation, so a reload never serves a stale page
+        self.render = lru_cache(maxsize=cache_size)(self.render_uncached)
+
+    def get(self, path: str) -> Response:
+        if not path.endswith("/") and "." not in path.rsplit("/", 1)[-1]:
+            path += "/"
+        response = self.responses.get(path)
+        if response is None and path.startswith((f"{PREFIX}/pages/", f"{PREFIX}/graph/")):
+            response = self.render(path)
+        return response or not_found(path)
+
+    def render_uncached(self, path: str) -> Optional[Response]:
+        if path.startswith(f"{PREFIX}/graph/"):
+            ego = ego_network(self.graph, path[len(f"{PREFIX}/graph/"):].strip("/"))
+            return make_response(ego) if ego else None
+        entry = self.namespace.resolve(normalize_url(path[len(f"{PREFIX}/pages"):]))
+        return make_response(self.page_metadata(entry.page)) if entry else None
+
+    def page_metadata(self, page: Page) -> dict:
+        related = [
+            {"title": item.get("title"), "url": normalize_url(item["path"]), "description": item.get("description")}
+            for item in page.extra.get("see_also") or [] if isinstance(item, dict) and isinstance(item.get("path"), str)
+        ]
+        fields = {
+            "title": page.frontmatter.get("title"),
+            "description": page.frontmatter.get("description"),
+            "date": page.frontmatter.get("date"),
+            "template": page.frontmatter.get("template"),
+            "claim_type": page.extra.get("claim_type"),
+            "category": page.extra.get("category"),
+            "core_claim_ids": page.extra.get("core_claim_ids"),
+            "same_as": page.extra.get("same_as"),
+        }
+        links = {"self": f"{PREFIX}/pages{page.url}", "related": related}
+        if is_node(page):
+            links["graph"] = f"{PREFIX}/graph/{node_id(page)}/"
+        return {
+            "id": page.key[: -len(".md")],
+            "lang": page.lang,
+            "section": page.section,
+            "url": page.url,
+            **{key: value for key, value in fields.items() if value is not None},
+            "translations": self.translations[page.key],
+            "links": links,
+        }
+
+
+def load_api(db, cache_size: int = DEFAULT_CACHE_SIZE) -> Api:
+    """Re-read the tree and build a new generation; coverage comes from the index."""
+    pages = scan(ROOT, refresh=True)
+    english = get_english_content(db)
+    return Api(pages, get_translation_coverage(english, db), cache_size)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "WheelOfHeavenLocalAPI/1"
+    # Headers and body go out as two writes; Nagle would hold the body back
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.respond(head=False)
+
+    def do_HEAD(self):
+        self.respond(head=True)
+
+    def respond(self, head: bool):
+        response = self.server.api.get(urlsplit(self.path).path)
+        gzipped = response.gzipped is not None and accepts_gzip(self.headers.get("Accept-Encoding", ""))
+        etag = response.gzip_etag if gzipped else response.etag
+        if response.status == 200 and etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(304)
+            self.send_validators(etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = response.gzipped if gzipped else response.body
+        self.send_response(response.status)
+        self.send_header("Content-Type", response.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_validators(etag)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def send_validators(self, etag: str):
+        self.send_header("ETag", etag)
+        self.send_header("Vary", "Accept-Encoding")
+        # Revalidate every time: a hot reload may have replaced the payload
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], api: Api, quiet: bool = False):
+        super().__init__(address, Handler)
+        self.api = api
+        self.quiet = quiet
+
+
+def reload_on_change(server: ApiServer, interval: float, cache_size: int, stop: threading.Event):
+    """Keep the corpus index current; swap in a new generation when it changes."""
+    db = connect()
+    try:
+        while not stop.wait(interval):
+            stats = update(db)
+            if stats["indexed"] or stats["removed"]:
+                start = time.perf_counter()
+                server.api = load_api(db, cache_size)
+                print(f"[{datetime.now():%H:%M:%S}] {stats['indexed']} re-indexed, {stats['removed']} removed;"
+                      f" reloaded in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    finally:
+        db.close()
+
+
+def measure(port: int, paths: list[str], headers: dict[str, str], expect: int) -> float:
+    """Requests per second for `paths` over one keep-alive connection."""
+    conn = http.client.HTTPConnection(DEFAULT_HOST, port)
+    start = time.perf_counter()
+    for path in paths:
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        if response.status != expect:
+            raise RuntimeError(f"{path}: expected {expect}, got {response.status}")
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return len(paths) / elapsed
+
+
+def run_bench(db, cache_size: int) -> int:
+    start = time.perf_counter()
+    api = load_api(db, cache_size)
+    print(f"generation built in {time.perf_counter() - start:.2f}s"
+          f" ({len(api.responses)} precomputed responses, {len(api.pages)} pages)")
+
+    server = ApiServer((DEFAULT_HOST, 0), api, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    gzip_headers = {"Accept-Encoding": "gzip"}
+    pages = [f"{PREFIX}/pages{page.url}" for page in api.pages if not page.error]
+    graph = f"{PREFIX}/graph/content-graph.json"
+
+    results = [
+        # First request of every page renders, hashes and gzips it
+        ("pages, cold (render + gzip)", measure(port, pages, gzip_headers, 200)),
+        ("pages, warm (LRU hit)", measure(port, pages, gzip_headers, 200)),
+        ("graph, precomputed, gzip", measure(port, [graph] * 2000, gzip_headers, 200)),
+        ("graph, precomputed, identity", measure(port, [graph] * 500, {}, 200)),
+        ("graph, If-None-Match -> 304",
+         measure(port, [graph] * 2000, {**gzip_headers, "If-None-Match": api.get(graph).gzip_etag}, 304)),
+    ]
+    server.shutdown()
+    for label, rate in results:
+        print(f"{label:32} {rate:>9.0f} req/s")
+    info = api.render.cache_info()
+    print(f"LRU: {info.hits} hits, {info.misses} misses, {info.currsize}/{info.maxsize} entries")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve the /v1/ API payloads from the local corpus")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help="Per-page responses kept in the LRU cache")
+    parser.add_argument("--reload-interval", type=float, default=DEFAULT_RELOAD_INTERVAL, metavar="SECONDS",
+                        help="How often to check the corpus index for changes")
+    parser.add_argument("--no-reload", action="store_true", help="Serve the first generation only")
+    parser.add_argument("--quiet", action="store_true", help="Do not log requests")
+    parser.add_argument("--bench", action="store_true", help="Measure requests per second and exit")
+    args = parser.parse_args()
+
+    db = connect()
+    update(db)
+    if args.bench:
+        return run_bench(db, args.cache_size)
+
+    server = ApiServer((args.host, args.port), load_api(db, args.cache_size), args.quiet)
+    db.close()
+    stop = threading.Event()
+    if not args.no_reload:
+        threading.Thread(target=reload_on_change, args=(server, args.reload_interval, args.cache_size, stop),
+                         daemon=True).start()
+    print(f"Serving http://{args.host}:{server.server_address[1]}{PREFIX}/ (Ctrl+C stops)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
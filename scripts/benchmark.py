@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""Benchmark the content scripts on synthetic trees of growing size.
+
+Generates (or reuses) deterministic synthetic corpora at the requested
+multiples of today's tree, then times every phase of validate.py,
+i18n_dashboard.py and curate_timeline_sources.py against each one in a fresh
+process, recording wall time, CPU time, throughput and peak memory.
+Comparing against a previous results file turns the run into a regression
+check.
+
+Usage:
+    python scripts/benchmark.py                           # 1× and 10×
+    python scripts/benchmark.py --scales 1,10,100         # 100× needs ~3 GB of disk
+    python scripts/benchmark.py --output bench.json       # keep the results
+    python scripts/benchmark.py --baseline bench.json     # fail on regressions
+    python scripts/benchmark.py --baseline bench.json --phase-threshold links=1.5
+    python scripts/benchmark.py --scales 1,10 --rss-budget 512     # fail above a fixed memory ceiling
+
+Corpora are cached under .cache/bench/ and only regenerated when their
+parameters change.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Callable, Optional
+
+from corpus import ROOT
+from profiling import peak_rss_mb
+from synthetic_corpus import CorpusSpec, ensure_corpus
+
+WORK_DIR = ROOT / ".cache" / "bench"
+PHASES = ["scan", "frontmatter", "links", "identifiers", "coverage", "dashboard", "curation"]
+
+# A phase regresses when it gets this much slower than the baseline...
+DEFAULT_THRESHOLD = 1.25
+# ...and at least this many seconds slower, so sub-second noise never fails a run.
+DEFAULT_MIN_SECONDS = 0.05
+DEFAULT_MEMORY_THRESHOLD = 1.25
+# Peak RSS no phase may exceed on the 1× tree; test_benchmark.py enforces it
+RSS_CEILING_MB = 96
+
+
+def phase_functions(root: Path) -> dict[str, Callable[[], object]]:
+    """Point every script at `root` and return one callable per phase."""
+    import corpus
+    import curate_timeline_sources
+    import i18n_dashboard
+    import validate
+
+    validate.CONTENT_ROOT = root
+    i18n_dashboard.CONTENT_ROOT = root
+    chapters = sorted(
+        path for path in (root / "timeline").rglob("*.md")
+        if path.stem in curate_timeline_sources.CHAPTERS
+    )
+
+    return {
+        "scan": lambda: corpus.scan(root, refresh=True),
+        "frontmatter": lambda: validate.validate_frontmatter([]),
+        "links": lambda: validate.validate_links([]),
+        "identifiers": lambda: validate.validate_identifiers([]),
+        "coverage": lambda: validate.validate_coverage([]),
+        "dashboard": lambda: i18n_dashboard.get_translation_coverage(i18n_dashboard.get_english_content()),
+        "curation": lambda: [curate_timeline_sources.curate(path) for path in chapters],
+    }
+
+
+def run_phases(root: str, phases: list[str], repeat: int, trace_memory: bool) -> dict:
+    """Time each phase on one tree; runs in a fresh worker process per tree."""
+    functions = phase_functions(Path(root))
+    if trace_memory:
+        tracemalloc.start()
+
+    results = {}
+    # Every other phase reads the cached scan, so it always runs first
+    for name in ["scan"] + [phase for phase in phases if phase != "scan"]:
+        best_wall = best_cpu = float("inf")
+        heap_peak = 0.0
+        for _ in range(repeat):
+            if trace_memory:
+                tracemalloc.reset_peak()
+            wall, cpu = time.perf_counter(), time.process_time()
+            functions[name]()
+            best_wall = min(best_wall, time.perf_counter() - wall)
+            best_cpu = min(best_cpu, time.process_time() - cpu)
+            if trace_memory:
+                heap_peak = max(heap_peak, tracemalloc.get_traced_memory()[1] / 1e6)
+        if name not in phases:
+            continue
+        peak_rss = peak_rss_mb()
+        results[name] = {
+            "wall_s": round(best_wall, 4),
+            "cpu_s": round(best_cpu, 4),
+            "peak_rss_mb": None if peak_rss is None else round(peak_rss, 1),
+        }
+        if trace_memory:
+            results[name]["heap_peak_mb"] = round(heap_peak, 1)
+    return results
+
+
+def run_scale(spec: CorpusSpec, work_dir: Path, phases: list[str], repeat: int, trace_memory: bool) -> dict:
+    root = work_dir / f"x{spec.scale}-seed{spec.seed}"
+    manifest = ensure_corpus(root, spec)
+    # A fresh interpreter per tree keeps the scan cache and peak RSS per scale
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        results = pool.submit(run_phases, str(root), phases, repeat, trace_memory).result()
+    for phase in results.values():
+        phase["mb_per_s"] = round(manifest["bytes"] / 1e6 / max(phase["wall_s"], 1e-6), 1)
+    return {
+        "scale": spec.scale,
+        "files": manifest["files"],
+        "bytes": manifest["bytes"],
+        "phases": results,
+        "total_s": round(sum(phase["wall_s"] for phase in results.values()), 4),
+    }
+
+
+def peak_of(run: dict) -> Optional[float]:
+    """Peak RSS of a run in MB, or None when the platform could not measure it."""
+    peaks = [phase["peak_rss_mb"] for phase in run["phases"].values() if phase["peak_rss_mb"] is not None]
+    return max(peaks, default=None)
+
+
+def format_peak(peak: Optional[float]) -> str:
+    return "n/a" if peak is None else f"{peak:.0f}"
+
+
+def find_regressions(results: dict, baseline: dict, thresholds: dict[str, float],
+                     default: float, min_seconds: float, memory_threshold: float) -> list[str]:
+    """Compare phase timings and memory per scale; return one line per regression."""
+    previous = {run["scale"]: run for run in baseline.get("runs", [])}
+    regressions = []
+    for run in results["runs"]:
+        base = previous.get(run["scale"])
+        if base is None:
+            continue
+        for name, phase in run["phases"].items():
+            old = base["phases"].get(name)
+            if old is None:
+                continue
+            limit = thresholds.get(name, default)
+            if phase["wall_s"] > old["wall_s"] * limit and phase["wall_s"] - old["wall_s"] > min_seconds:
+                regressions.append(
+                    f"{run['scale']}× {name}: {old['wall_s']:.3f}s -> {phase['wall_s']:.3f}s"
+                    f" ({phase['wall_s'] / old['wall_s']:.2f}×, limit {limit:.2f}×)"
+                )
+        # Peak RSS only ever grows during a run, so compare it once per tree
+        old_peak, new_peak = peak_of(base), peak_of(run)
+        if old_peak is not None and new_peak is not None and new_peak > old_peak * memory_threshold:
+            regressions.append(
+                f"{run['scale']}× peak RSS: {old_peak:.0f} MB -> {new_peak:.0f} MB (limit {memory_threshold:.2f}×)"
+            )
+    return regressions
+
+
+def find_overruns(results: dict, budget: float) -> list[str]:
+    """Scales whose peak RSS exceeds `budget` MB, whatever the size of their tree."""
+    return [
+        f"{run['scale']}× peak RSS: {peak_of(run):.0f} MB > budget {budget:.0f} MB"
+        for run in results["runs"] if (peak_of(run) or 0.0) > budget
+    ]
+
+
+def print_table(results: dict):
+    runs = results["runs"]
+    phases = list(runs[0]["phases"]) if runs else []
+    print(f"{'scale':>6} {'files':>8} {'MB':>7} " + " ".join(f"{name:>11}" for name in phases)
+          + f" {'total':>9} {'RSS MB':>7}")
+    for run in runs:
+        cells = " ".join(f"{run['phases'][name]['wall_s']:>10.3f}s" for name in phases)
+        print(f"{run['scale']:>5}× {run['files']:>8} {run['bytes'] / 1e6:>7.1f} {cells}"
+              f" {run['total_s']:>8.2f}s {format_peak(peak_of(run)):>7}")
+
+    print("\nThroughput, MB of tree per second:")
+    for run in runs:
+        cells = " ".join(f"{run['phases'][name].get('mb_per_s', 0):>11.1f}" for name in phases)
+        print(f"{run['scale']:>5}× {'':>8} {'':>7} {cells}")
+
+    # Per-file cost relative to the smallest tree; 1.0 means linear scaling
+    if len(runs) > 1:
+        first = runs[0]
+        print("\nCost per file relative to the smallest tree (1.00 = linear):")
+        for run in runs[1:]:
+            growth = run["files"] / first["files"]
+            cells = " ".join(
+                f"{run['phases'][name]['wall_s'] / growth / max(first['phases'][name]['wall_s'], 1e-6):>11.2f}"
+                for name in phases
+            )
+            print(f"{run['scale']:>5}× {'':>8} {'':>7} {cells}")
+
+
+def parse_thresholds(values: list[str]) -> dict[str, float]:
+    thresholds = {}
+    for value in values:
+        name, _, limit = value.partition("=")
+        if name not in PHASES or not limit:
+            raise SystemExit(f"--phase-threshold expects PHASE=RATIO with PHASE in {', '.join(PHASES)}")
+        thresholds[name] = float(limit)
+    return thresholds
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the content scripts on synthetic trees")
+    parser.add_argument("--scales", default="1,10", help="Comma-separated multiples of today's tree size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--broken-rate", type=float, default=CorpusSpec.broken_rate,
+                        help="Share of internal links that point nowhere")
+    parser.add_argument("--phase", action="append", choices=PHASES, help="Only time these phases")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per phase; the fastest counts")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="Also record the Python heap peak per phase (slows every phase down)")
+    parser.add_argument("--work-dir", type=Path, default=WORK_DIR, help="Where synthetic trees are cached")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Slowdown ratio that counts as a regression")
+    parser.add_argument("--phase-threshold", action="append", default=[], metavar="PHASE=RATIO",
+                        help="Per-phase slowdown ratio, e.g. links=1.5")
+    parser.add_argument("--min-seconds", type=float, default=DEFAULT_MIN_SECONDS,
+                        help="Ignore slowdowns smaller than this")
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                        help="Peak RSS growth ratio that counts as a regression")
+    parser.add_argument("--rss-budget", type=float, metavar="MB",
+                        help="Fail when the peak RSS of any scale exceeds MB")
+    args = parser.parse_args()
+
+    thresholds = parse_thresholds(args.phase_threshold)
+    phases = args.phase or PHASES
+    scales = sorted({int(scale) for scale in args.scales.split(",")})
+
+    results = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "spec": asdict(CorpusSpec(seed=args.seed, broken_rate=args.broken_rate)),
+        "repeat": args.repeat,
+        "runs": [],
+    }
+    for scale in scales:
+        spec = CorpusSpec(scale=scale, seed=args.seed, broken_rate=args.broken_rate)
+        print(f"Running {scale}×...", file=sys.stderr)
+        results["runs"].append(run_scale(spec, args.work_dir, phases, args.repeat, args.tracemalloc))
+
+    print_table(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    status = 0
+    if args.rss_budget is not None:
+        overruns = find_overruns(results, args.rss_budget)
+        if overruns:
+            print(f"\n{len(overruns)} scales over the memory budget:")
+            for line in overruns:
+                print(f"  {line}")
+            status = 1
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = find_regressions(results, baseline, thresholds, args.threshold,
+                                       args.min_seconds, args.memory_threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressions against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Join the Raëlian canon catalogue against the pages that cite it.
+
+sources/raelian-canon-references.json catalogues every text, tradition,
+figure, language and site the three canonical books reference. The
+tradition hubs list `cited_sources` and `motifs`, and wiki and timeline
+pages cite works inline with `{{ cite(id=...) }}`. Nothing tied the three
+together, so this module indexes
+
+- the catalogue, by entry id, name and the aliases both imply ("Revelation /
+  Apocalypse of John", "tanakh-genesis" -> "genesis"), and
+- the library and wiki pages, by slug, file name, title and `alternative_names`,
+
+under one key normalization, then resolves every reference in one pass over
+the pages and reports:
+
+- `cited_sources`, `motifs` and cite ids matching neither a page nor an entry
+- numeric cite ids pointing past the page's own `extra.references`
+- catalogue entries without a landing page in the library or wiki
+
+Usage:
+    python scripts/canon_references.py          # summary of what does not resolve
+    python scripts/canon_references.py --json   # the whole join as JSON
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from corpus import DEFAULT_LANGUAGE, ROOT, Page, scan
+from markdown_tokens import Token, shortcodes
+
+CATALOGUE = Path("sources") / "raelian-canon-references.json"
+CATALOGUE_PARTS = ["direct_references", "indirect_references"]
+
+# Sections whose pages can be a catalogued work's landing page
+LANDING_SECTIONS = ("library", "wiki")
+
+LEADING_ARTICLE = re.compile(r"^(?:the|a|an)-(?=.)")
+PARENTHETICAL = re.compile(r"\s*\([^)]*\)")
+
+
+def normalize_key(text: str) -> str:
+    """Lowercase ASCII slug with accents, apostrophes and a leading article removed."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r"['’]", "", text).replace("&", " and ")
+    return LEADING_ARTICLE.sub("", re.sub(r"[^a-z0-9]+", "-", text).strip("-"))
+
+
+@dataclass
+class CatalogueEntry:
+    id: str
+    name: str
+    group: str  # e.g. "direct_references/hebrew_bible"
+    keys: list[str]
+
+
+@dataclass
+class Reference:
+    page: Page
+    kind: str  # "cited_sources", "motifs" or "cite"
+    value: str
+    target: Union[Page, CatalogueEntry, None]
+    titled: bool = False  # a cite that carries its own title= argument
+
+
+@dataclass
+class CanonJoin:
+    entries: list[CatalogueEntry] = field(default_factory=list)
+    entry_keys: dict[str, CatalogueEntry] = field(default_factory=dict)
+    page_keys: dict[str, Page] = field(default_factory=dict)
+    landing: dict[str, Optional[Page]] = field(default_factory=dict)  # entry id -> page
+    references: list[Reference] = field(default_factory=list)
+    out_of_range: list[tuple[Page, str, int]] = field(default_factory=list)  # page, cite id, references
+    citing_pages: int = 0
+
+    def resolve(self, value: str) -> Union[Page, CatalogueEntry, None]:
+        key = normalize_key(value)
+        return self.page_keys.get(key) or self.entry_keys.get(key)
+
+    @property
+    def dangling(self) -> list[Reference]:
+        return [reference for reference in self.references if reference.target is None]
+
+    @property
+    def uncovered(self) -> list[CatalogueEntry]:
+        return [entry for entry in self.entries if self.landing[entry.id] is None]
+
+
+def group_prefix(ids: list[str]) -> str:
+    """The "tanakh-" of a group whose ids all share their first word."""
+    heads = {entry_id.split("-", 1)[0] for entry_id in ids}
+    if len(heads) == 1 and all("-" in entry_id for entry_id in ids):
+        return heads.pop() + "-"
+    return ""
+
+
+def entry_names(entry: dict, prefix: str) -> list[str]:
+    names = [entry["id"], entry["name"]]
+    if prefix:
+        names.append(entry["id"][len(prefix):])
+    base = PARENTHETICAL.sub("", entry["name"])
+    names.append(base)
+    names.extend(base.split(" / "))
+    return names
+
+
+def load_catalogue(path: Path) -> list[CatalogueEntry]:
+    """Catalogue entries in file order; an absent catalogue has none."""
+    try:
+        catalogue = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return []
+    entries = []
+    for part in CATALOGUE_PARTS:
+        for group, items in catalogue.get(part, {}).items():
+            prefix = group_prefix([item["id"] for item in items])
+            for item in items:
+                keys = list(dict.fromkeys(filter(None, map(normalize_key, entry_names(item, prefix)))))
+                entries.append(CatalogueEntry(item["id"], item["name"], f"{part}/{group}", keys))
+    return entries
+
+
+def page_names(page: Page) -> list[str]:
+    stem = page.key.rsplit("/", 1)[-1][: -len(".md")]
+    names = [page.slug or stem, stem]
+    title = page.frontmatter.get("title")
+    if isinstance(title, str):
+        names.append(title)
+    alternatives = page.extra.get("alternative_names")
+    if isinstance(alternatives, list):
+        names.extend(name for name in alternatives if isinstance(name, str))
+    return names
+
+
+def cites(body: str) -> Iterator[Token]:
+    """The `cite(...)` shortcode calls of a body."""
+    return shortcodes(body, "cite") if "cite(" in body else iter(())
+
+
+def page_references(page: Page):
+    """Yield (kind, value, titled) for the hub lists and inline cites of a page."""
+    for kind in ("cited_sources", "motifs"):
+        values = page.extra.get(kind)
+        if isinstance(values, list):
+            for value in values:
+                if isinstance(value, str):
+                    yield kind, value, False
+    for token in cites(page.body):
+        if isinstance(token.args.get("id"), str):
+            yield "cite", token.args["id"], "title" in token.args
+
+
+def join_canon(pages: list[Page], catalogue: Path = ROOT / CATALOGUE, memo: Optional[dict] = None) -> CanonJoin:
+    """Index the catalogue and the landing pages, then resolve every page's references once.
+
+    `memo` keeps each page's references between calls, keyed by rel and reused
+    while the page record is the same object, so re-joining after a save only
+    re-reads the saved pages.
+    """
+    memo = {} if memo is None else memo
+    join = CanonJoin(entries=load_catalogue(catalogue))
+    for entry in join.entries:
+        for key in entry.keys:
+            join.entry_keys.setdefault(key, entry)
+    for page in pages:
+        if page.lang == DEFAULT_LANGUAGE and page.section in LANDING_SECTIONS and not page.is_index:
+            for key in filter(None, map(normalize_key, page_names(page))):
+                join.page_keys.setdefault(key, page)
+    for entry in join.entries:
+        join.landing[entry.id] = next((join.page_keys[key] for key in entry.keys if key in join.page_keys), None)
+
+    for page in pages:
+        references = page.extra.get("references")
+        count = len(references) if isinstance(references, list) else 0
+        cached = memo.get(page.rel)
+        if cached is None or cached[0] is not page:
+            cached = memo[page.rel] = (page, list(page_references(page)))
+        for kind, value, titled in cached[1]:
+            if kind == "cite" and value.isdigit():
+                # Numbered cites point into the page's own reference list
+                if not 1 <= int(value) <= count:
+                    join.out_of_range.append((page, value, count))
+                continue
+            join.references.append(Reference(page, kind, value, join.resolve(value), titled))
+        join.citing_pages += bool(cached[1])
+    return join
+
+
+def describe_target(target: Union[Page, CatalogueEntry, None]) -> Optional[str]:
+    if isinstance(target, Page):
+        return target.rel
+    if isinstance(target, CatalogueEntry):
+        return f"canon:{target.id}"
+    return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Join the canon catalogue against hubs, citations and pages")
+    parser.add_argument("--json", action="store_true", help="Output the whole join as JSON")
+    args = parser.parse_args()
+
+    join = join_canon(scan())
+    if args.json:
+        result = {
+            "entries": [
+                {"id": entry.id, "name": entry.name, "group": entry.group, "keys": entry.keys,
+                 "landing_page": describe_target(join.landing[entry.id])}
+                for entry in join.entries
+            ],
+            "references": [
+                {"file": reference.page.rel, "kind": reference.kind, "value": reference.value,
+                 "target": describe_target(reference.target)}
+                for reference in join.references
+            ],
+            "out_of_range": [
+                {"file": page.rel, "id": value, "references": count} for page, value, count in join.out_of_range
+            ],
+        }
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        for reference in join.dangling:
+            if reference.kind != "cite" or not reference.titled:
+                print(f"{reference.page.rel}: {reference.kind} '{reference.value}' resolves nowhere")
+        for page, value, count in join.out_of_range:
+            print(f"{page.rel}: cite id '{value}' beyond its {count} references")
+        for entry in join.uncovered:
+            print(f"{CATALOGUE.as_posix()}: {entry.id} ({entry.name}) has no landing page")
+        resolved = len(join.references) - len(join.dangling)
+        print(f"{resolved}/{len(join.references)} references resolved;"
+              f" {len(join.entries) - len(join.uncovered)}/{len(join.entries)} canon entries have a landing page")
+
+    return 1 if any(reference.kind != "cite" for reference in join.dangling) or join.out_of_range else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
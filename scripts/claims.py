@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Claim registry index for `core_claim_ids` and `core_versions`.
+
+Pages that rest on a core claim list it in `extra.core_claim_ids` and pin
+the claim version they were written against in `extra.core_versions`;
+`{{ claim_badge(id="woh-claim-0001") }}` calls can name a claim in the body
+as well. Nothing ties these together, so this index keys every page by the
+claims it references, in one pass over the page scan, and reports:
+
+- claims pinned at different versions by pages of the same language
+- translations that pin a claim at another version than their English page,
+  and translations that carry none of its pins
+- claims listed in `core_claim_ids` but missing from `core_versions`, and
+  pins for claims the page does not list
+- unknown claims: ids no page lists in `core_claim_ids`
+
+The id and version formats themselves are checked by the frontmatter schema.
+
+Usage:
+    python scripts/claims.py            # report inconsistencies
+    python scripts/claims.py --json     # claim -> pages, versions and languages as JSON
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+from typing import Iterator, Optional
+
+from corpus import DEFAULT_LANGUAGE, Page, scan
+from markdown_tokens import shortcodes
+
+BADGE = "claim_badge"
+# claim_badge arguments that name a claim; `type=` only selects the badge style
+BADGE_ARGUMENTS = ("id", "claim", "claim_id")
+
+
+def version_key(version: str) -> tuple:
+    """Sort key for "0.2.0" style versions; malformed parts sort first."""
+    return tuple(int(part) if part.isdigit() else -1 for part in version.split("."))
+
+
+def page_claims(page: Page) -> tuple[list[str], dict[str, str]]:
+    """The listed claim ids and the pinned versions of a page, ignoring malformed entries."""
+    listed = page.extra.get("core_claim_ids")
+    listed = [claim for claim in listed if isinstance(claim, str)] if isinstance(listed, list) else []
+    pinned = page.extra.get("core_versions")
+    pinned = {
+        claim: version for claim, version in pinned.items() if isinstance(version, str)
+    } if isinstance(pinned, dict) else {}
+    return listed, pinned
+
+
+def badge_claims(page: Page) -> list[str]:
+    """The claims named by the page's `claim_badge` calls."""
+    if BADGE not in page.body:
+        return []
+    return [
+        value for token in shortcodes(page.body, BADGE)
+        for name, value in (token.args or {}).items()
+        if name in BADGE_ARGUMENTS and isinstance(value, str)
+    ]
+
+
+class ClaimIndex:
+    """Claim id -> pages, pinned versions and languages."""
+
+    def __init__(self):
+        self.pages: dict[str, list[Page]] = defaultdict(list)
+        self.pins: dict[tuple[str, str], dict[str, list[Page]]] = defaultdict(lambda: defaultdict(list))
+        self.listed: set[str] = set()
+        self.by_page: dict[tuple[str, str], tuple[Page, dict[str, str]]] = {}
+        self.unpinned: list[tuple[Page, str]] = []
+        self.unlisted: list[tuple[Page, str]] = []
+        self.badges: list[tuple[Page, str]] = []
+
+    def add(self, page: Page):
+        listed, pinned = page_claims(page)
+        badges = badge_claims(page)
+        self.by_page[page.lang, page.key] = (page, pinned)
+        if not (listed or pinned or badges):
+            return
+        self.listed.update(listed)
+        for claim in dict.fromkeys(listed + list(pinned) + badges):
+            self.pages[claim].append(page)
+        for claim, version in pinned.items():
+            self.pins[page.lang, claim][version].append(page)
+        self.unpinned += [(page, claim) for claim in listed if claim not in pinned]
+        self.unlisted += [(page, claim) for claim in pinned if claim not in listed]
+        self.badges += [(page, claim) for claim in badges]
+
+    def version_skew(self) -> Iterator[tuple[str, str, dict[str, list[Page]]]]:
+        """Yield (language, claim, version -> pages), newest version first, for
+        claims the pages of one language pin at several versions."""
+        for (lang, claim), versions in sorted(self.pins.items(), key=lambda item: item[0]):
+            if len(versions) > 1:
+                yield lang, claim, dict(sorted(versions.items(), key=lambda item: version_key(item[0]), reverse=True))
+
+    def translation_skew(self) -> Iterator[tuple[Page, str, Optional[str], Optional[str]]]:
+        """Yield (translation, claim, English version, translated version) where
+        they differ; translations that pin nothing are left to `not_carried_over`."""
+        for (lang, key), (page, pinned) in self.by_page.items():
+            if lang == DEFAULT_LANGUAGE or not pinned:
+                continue
+            source = self.by_page.get((DEFAULT_LANGUAGE, key))
+            if source is None:
+                continue
+            for claim in dict.fromkeys(list(source[1]) + list(pinned)):
+                if source[1].get(claim) != pinned.get(claim):
+                    yield page, claim, source[1].get(claim), pinned.get(claim)
+
+    def not_carried_over(self) -> Iterator[tuple[Page, dict[str, str]]]:
+        """Yield (translation, English pins) for translations without any pins of their own."""
+        for (lang, key), (page, pinned) in self.by_page.items():
+            source = self.by_page.get((DEFAULT_LANGUAGE, key))
+            if lang != DEFAULT_LANGUAGE and not pinned and source is not None and source[1]:
+                yield page, source[1]
+
+    def unknown(self) -> Iterator[tuple[Page, str]]:
+        """Yield (page, claim) for pins and badges naming a claim no page lists."""
+        for page, claim in self.unlisted + self.badges:
+            if claim not in self.listed:
+                yield page, claim
+
+    def reverse_map(self) -> dict:
+        """Claim -> the pages referencing it, their languages and pinned versions."""
+        result = {}
+        for claim in sorted(self.pages):
+            pages = self.pages[claim]
+            versions: dict[str, list[str]] = defaultdict(list)
+            for page in pages:
+                version = self.by_page[page.lang, page.key][1].get(claim)
+                if version is not None:
+                    versions[version].append(page.rel)
+            result[claim] = {
+                "pages": [page.rel for page in pages],
+                "languages": sorted({page.lang for page in pages}),
+                "versions": dict(sorted(versions.items(), key=lambda item: version_key(item[0]), reverse=True)),
+                "known": claim in self.listed,
+            }
+        return result
+
+
+def build_claim_index(pages: list[Page]) -> ClaimIndex:
+    """Index the claim references of all pages in one pass."""
+    index = ClaimIndex()
+    for page in pages:
+        if not page.error:
+            index.add(page)
+    return index
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check core claim ids and versions for consistency")
+    parser.add_argument("--json", action="store_true", help="Output claim -> pages as JSON")
+    args = parser.parse_args()
+
+    index = build_claim_index(scan())
+    skew = list(index.version_skew())
+    drift = list(index.translation_skew())
+    unknown = list(index.unknown())
+
+    if args.json:
+        result = {
+            "claims": index.reverse_map(),
+            "version_skew": [
+                {"lang": lang, "claim": claim,
+                 "versions": {version: [page.rel for page in pages] for version, pages in versions.items()}}
+                for lang, claim, versions in skew
+            ],
+            "translation_skew": [
+                {"file": page.rel, "claim": claim, "english": english, "translation": translated}
+                for page, claim, english, translated in drift
+            ],
+            "not_carried_over": [page.rel for page, _ in index.not_carried_over()],
+            "unpinned": [{"file": page.rel, "claim": claim} for page, claim in index.unpinned],
+            "unlisted": [{"file": page.rel, "claim": claim} for page, claim in index.unlisted],
+            "unknown": [{"file": page.rel, "claim": claim} for page, claim in unknown],
+        }
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        for lang, claim, versions in skew:
+            pinned = "; ".join(f"{version}: {', '.join(page.rel for page in pages)}" for version, pages in versions.items())
+            print(f"{claim} ({lang}) pinned at several versions: {pinned}")
+        for page, claim, english, translated in drift:
+            print(f"{page.rel}: {claim} pinned at {translated or 'nothing'}, English at {english or 'nothing'}")
+        for page, claim in index.unpinned:
+            print(f"{page.rel}: {claim} is listed but has no core_versions pin")
+        for page, claim in index.unlisted:
+            print(f"{page.rel}: {claim} is pinned but not listed in core_claim_ids")
+        for page, claim in unknown:
+            print(f"{page.rel}: unknown claim {claim}")
+        pages = {page.rel for claim_pages in index.pages.values() for page in claim_pages}
+        print(f"{len(index.pages)} claims on {len(pages)} pages, {len(skew)} with version skew,"
+              f" {len(drift)} translation mismatches, {len(unknown)} unknown")
+
+    return 1 if skew or drift or index.unpinned or unknown else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""The content graph: English entries as nodes, curated and in-text links as edges.
+
+Nodes are the wiki entries, articles, Timeline ages and news dispatches of
+the English corpus. Edges are directed and typed:
+
+    see_also   a curated `extra.see_also` entry
+    in_body    a Markdown link in the body to another node
+
+The build also returns the QA block datasets/content-graph.md promises:
+orphan nodes, `see_also` pairs that are not reciprocated, and links that
+resolve to no page at all.
+
+Usage:
+    python scripts/content_graph.py              # stats and QA counts
+    python scripts/content_graph.py --json       # the graph as JSON
+    python scripts/content_graph.py --graphml    # the graph as GraphML
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+from typing import Iterator
+from xml.sax.saxutils import escape, quoteattr
+
+from corpus import DEFAULT_LANGUAGE, Page, normalize_url, scan
+from corpus_db import link_target
+from markdown_tokens import links
+from namespace import build_namespace
+
+# Section -> node kind
+KINDS = {"wiki": "entry", "articles": "article", "timeline": "age", "news": "dispatch"}
+EDGE_TYPES = ("see_also", "in_body")
+
+
+def is_node(page: Page) -> bool:
+    return page.lang == DEFAULT_LANGUAGE and page.section in KINDS and not page.is_index and not page.error
+
+
+def node_id(page: Page) -> str:
+    return f"{page.section}/{page.url.rstrip('/').rsplit('/', 1)[-1]}"
+
+
+def build_graph(pages: list[Page]) -> dict:
+    """Nodes, typed edges, stats and QA for the English corpus, in page order."""
+    namespace = build_namespace(pages)
+    members = [page for page in pages if is_node(page)]
+    ids = {page.rel: node_id(page) for page in members}
+
+    edges: dict[tuple[str, str, str], None] = {}
+    dangling = []
+    see_also = set()
+    for page in members:
+        source = ids[page.rel]
+        for item in page.extra.get("see_also") or []:
+            path = item.get("path") if isinstance(item, dict) else None
+            if not isinstance(path, str):
+                continue
+            entry = namespace.resolve(normalize_url(path))
+            if entry is None:
+                dangling.append({"source": source, "target": normalize_url(path), "type": "see_also"})
+            elif entry.page.rel in ids and entry.page.rel != page.rel:
+                edges[source, ids[entry.page.rel], "see_also"] = None
+                see_also.add((source, ids[entry.page.rel]))
+        for link in links(page.body):
+            target = link_target(page, link.url)
+            if target is None:
+                continue
+            entry = namespace.resolve(target)
+            if entry is None:
+                dangling.append({"source": source, "target": target, "type": "in_body"})
+            elif entry.page.rel in ids and entry.page.rel != page.rel:
+                edges[source, ids[entry.page.rel], "in_body"] = None
+
+    degree: dict[str, int] = defaultdict(int)
+    for source, target, _ in edges:
+        degree[source] += 1
+        degree[target] += 1
+
+    nodes = []
+    for page in members:
+        node = {
+            "id": ids[page.rel],
+            "title": page.frontmatter.get("title", ""),
+            "kind": KINDS[page.section],
+            "claim_type": page.extra.get("claim_type"),
+            "category": page.extra.get("category"),
+            "degree": degree[ids[page.rel]],
+            "url": page.url,
+        }
+        nodes.append({key: value for key, value in node.items() if value is not None})
+
+    edge_list = [{"source": source, "target": target, "type": kind} for source, target, kind in edges]
+    return {
+        "nodes": nodes,
+        "edges": edge_list,
+        "stats": {
+            "nodes": len(nodes),
+            "edges": len(edge_list),
+            "edge_types": {kind: sum(edge["type"] == kind for edge in edge_list) for kind in EDGE_TYPES},
+        },
+        "qa": {
+            "orphans": [node["id"] for node in nodes if not node["degree"]],
+            "asymmetric_see_also": [
+                {"source": source, "target": target} for source, target in sorted(see_also)
+                if (target, source) not in see_also
+            ],
+            "dangling": dangling,
+        },
+    }
+
+
+def ego_network(graph: dict, center: str) -> dict:
+    """A node with its direct neighbours and the edges touching it, or {} if unknown."""
+    incident = [edge for edge in graph["edges"] if center in (edge["source"], edge["target"])]
+    neighbours = {center} | {edge["source"] for edge in incident} | {edge["target"] for edge in incident}
+    nodes = [node for node in graph["nodes"] if node["id"] in neighbours]
+    if not any(node["id"] == center for node in nodes):
+        return {}
+    return {"center": center, "nodes": nodes, "edges": incident}
+
+
+def graphml_lines(graph: dict) -> Iterator[str]:
+    """GraphML, one newline-terminated line at a time, with the node fields as
+    string attributes and the edge type."""
+    fields = ["title", "kind", "claim_type", "category", "url"]
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+    for field in fields:
+        yield f'  <key id="{field}" for="node" attr.name="{field}" attr.type="string"/>\n'
+    yield '  <key id="degree" for="node" attr.name="degree" attr.type="int"/>\n'
+    yield '  <key id="type" for="edge" attr.name="type" attr.type="string"/>\n'
+    yield '  <graph id="content-graph" edgedefault="directed">\n'
+    for node in graph["nodes"]:
+        yield f"    <node id={quoteattr(node['id'])}>\n"
+        for field in fields + ["degree"]:
+            if field in node:
+                yield f'      <data key="{field}">{escape(str(node[field]))}</data>\n'
+        yield "    </node>\n"
+    for edge in graph["edges"]:
+        yield (f"    <edge source={quoteattr(edge['source'])} target={quoteattr(edge['target'])}>"
+               f'<data key="type">{edge["type"]}</data></edge>\n')
+    yield "  </graph>\n"
+    yield "</graphml>\n"
+
+
+def to_graphml(graph: dict) -> str:
+    return "".join(graphml_lines(graph))
+
+
+def json_lines(graph: dict) -> Iterator[str]:
+    """The graph as compact JSON, one node or edge per line."""
+    yield "{"
+    for part in ("nodes", "edges"):
+        yield f'"{part}":['
+        for index, item in enumerate(graph[part]):
+            yield ("," if index else "") + "\n" + json.dumps(item, ensure_ascii=False)
+        yield "\n],"
+    yield f'"stats":{json.dumps(graph["stats"])},\n"qa":{json.dumps(graph["qa"], ensure_ascii=False)}}}\n'
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the content graph of the English corpus")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--json", action="store_true", help="Print the graph as JSON")
+    output.add_argument("--graphml", action="store_true", help="Print the graph as GraphML")
+    args = parser.parse_args()
+
+    graph = build_graph(scan())
+    if args.json:
+        print(json.dumps(graph, indent=2, ensure_ascii=False))
+    elif args.graphml:
+        sys.stdout.write(to_graphml(graph))
+    else:
+        stats, qa = graph["stats"], graph["qa"]
+        types = ", ".join(f"{kind} {count}" for kind, count in stats["edge_types"].items())
+        print(f"{stats['nodes']} nodes, {stats['edges']} edges ({types})")
+        print(f"{len(qa['orphans'])} orphans, {len(qa['asymmetric_see_also'])} asymmetric see_also pairs,"
+              f" {len(qa['dangling'])} dangling links")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""Shared corpus scan for the content scripts.
+
+Walks the content tree once, parses every page's TOML frontmatter and keeps the
+result as a list of page records, so the validators, indexes and dashboards can
+share one read of the ~2,800 Markdown files instead of each re-walking them.
+Reader threads fetch the next files in walk order while a page is parsed,
+within a byte budget, so a cold cache or a network mount costs little more
+than the parse itself. Every file is read and decoded once per scan: the
+records keep their bodies for as long as the scan is cached, and a refresh
+drops the old records before reading the tree again.
+
+Usage (as a library):
+    from corpus import scan
+
+    for page in scan():
+        print(page.lang, page.url, page.frontmatter.get("title"))
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import tomllib
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from profiling import PROFILE
+
+# Content root
+ROOT = Path(__file__).resolve().parent.parent
+
+# Default language lives at the root; every other language has its own tree.
+DEFAULT_LANGUAGE = "en"
+LANGUAGES = ["en", "de", "es", "fr", "he", "ja", "ko", "ru", "zh", "zh-Hant"]
+TRANSLATIONS = frozenset(LANGUAGES[1:])
+
+# Files that are repository documentation rather than site content
+IGNORED_FILES = {"README.md"}
+
+FRONTMATTER_OPEN = re.compile(r"\A\ufeff?\s*\+\+\+[ \t]*\r?\n")
+FRONTMATTER_CLOSE = re.compile(r"^\+\+\+[ \t]*\r?$", re.MULTILINE)
+
+# Read-ahead of the scan: reader threads, and the bytes read but not yet parsed
+# at which they pause. Reads release the GIL, so on a cold cache or a network
+# mount the parse of one file overlaps the reads of the next ones.
+READ_AHEAD_WORKERS = 4
+READ_AHEAD_BATCH = 16
+READ_AHEAD_BYTES = 16 * 2**20
+
+# Zola shortcode arguments, e.g. {{ cite(id="x", title="...") }}; calls are found by markdown_tokens
+SHORTCODE_ARG = re.compile(r"(\w+)\s*=\s*(\"(?:[^\"\\]|\\.)*\"|'[^']*'|[^,\s]+)")
+
+
+@dataclass(eq=False, slots=True)
+class Page:
+    """One Markdown file of the content tree.
+
+    Records are slotted and their path strings interned, so the languages of
+    a page share one `key` and every page of a tree shares its `root`; the
+    absolute `path` is only built when asked for.
+    """
+
+    root: Path
+    rel: str  # POSIX path relative to the content root, e.g. "de/wiki/elohim.md"
+    lang: str
+    key: str  # language-independent path, e.g. "wiki/elohim.md"
+    frontmatter: dict = field(default_factory=dict)
+    body: str = ""
+    error: Optional[str] = None  # frontmatter parse error, if any
+    size: int = 0  # bytes on disk
+
+    @property
+    def path(self) -> Path:
+        return self.root / self.rel
+
+    @property
+    def is_index(self) -> bool:
+        return self.key == "_index.md" or self.key.endswith("/_index.md")
+
+    @property
+    def section(self) -> Optional[str]:
+        """First directory below the language root ("wiki", "library", ...)."""
+        parts = self.key.split("/")
+        return parts[0] if len(parts) > 1 else None
+
+    @property
+    def extra(self) -> dict:
+        extra = self.frontmatter.get("extra")
+        return extra if isinstance(extra, dict) else {}
+
+    @property
+    def slug(self) -> Optional[str]:
+        slug = self.frontmatter.get("slug")
+        return slug if isinstance(slug, str) and slug else None
+
+    @property
+    def aliases(self) -> list[str]:
+        aliases = self.frontmatter.get("aliases")
+        return [a for a in aliases if isinstance(a, str)] if isinstance(aliases, list) else []
+
+    @property
+    def file_url(self) -> str:
+        """URL derived from the file path alone, ignoring `slug`."""
+        stem = self.rel[: -len(".md")]
+        if self.is_index:
+            stem = stem[: -len("_index")]
+        return normalize_url("/" + stem)
+
+    @property
+    def url(self) -> str:
+        """Canonical URL Zola serves the page at (`slug` replaces the file stem)."""
+        if self.is_index or not self.slug:
+            return self.file_url
+        parent = self.rel.rsplit("/", 1)[0] + "/" if "/" in self.rel else ""
+        return normalize_url(f"/{parent}{self.slug}")
+
+
+def normalize_url(url: str) -> str:
+    """Lower-case a site path, drop query/fragment and force a trailing slash."""
+    url = url.split("#", 1)[0].split("?", 1)[0].lower()
+    if not url.startswith("/"):
+        url = "/" + url
+    if not url.endswith("/"):
+        url += "/"
+    return url
+
+
+def parse_shortcode_args(args: str) -> dict:
+    """Parse `key="value", n=3, flag=true` shortcode arguments into a dict."""
+    parsed = {}
+    for key, value in SHORTCODE_ARG.findall(args):
+        if value[0] in "\"'":
+            value = value[1:-1]
+            if "\\" in value:
+                value = value.replace('\\"', '"').replace("\\\\", "\\")
+        elif value in ("true", "false"):
+            value = value == "true"
+        elif value.lstrip("-").isdigit():
+            value = int(value)
+        parsed[key] = value
+    return parsed
+
+
+def language_of(rel: str) -> tuple[str, str]:
+    """Split a content-relative path into (language, language-independent key)."""
+    head, _, tail = rel.partition("/")
+    if tail and head in TRANSLATIONS:
+        return head, tail
+    return DEFAULT_LANGUAGE, rel
+
+
+def decode_utf8(data: bytes) -> tuple[str, Optional[str]]:
+    """Decode a file's bytes, replacing invalid UTF-8 with U+FFFD.
+
+    The error names the first invalid sequence by its byte offset and line,
+    which is where an editor or `xxd` finds it; character offsets would not.
+    """
+    PROFILE.count("files decoded")
+    PROFILE.count("bytes decoded", len(data))
+    try:
+        return data.decode("utf-8"), None
+    except UnicodeDecodeError as e:
+        line = data.count(b"\n", 0, e.start) + 1
+        column = e.start - data.rfind(b"\n", 0, e.start)
+        return data.decode("utf-8", "replace"), (
+            f"Invalid UTF-8 at byte {e.start} (line {line}, byte {column}): {e.reason}"
+        )
+
+
+def parse_frontmatter(content: str) -> tuple[dict, str, Optional[str]]:
+    """Split a page into (frontmatter, body, error) using the TOML parser."""
+    opening = FRONTMATTER_OPEN.match(content)
+    if not opening:
+        return {}, content, None
+    closing = FRONTMATTER_CLOSE.search(content, opening.end())
+    if not closing:
+        return {}, content, "Unterminated frontmatter"
+
+    body = content[closing.end():].lstrip("\r\n")
+    try:
+        frontmatter = tomllib.loads(content[opening.end():closing.start()])
+    except tomllib.TOMLDecodeError as e:
+        return {}, body, f"Invalid TOML frontmatter: {e}"
+    return frontmatter, body, None
+
+
+def frontmatter_span(content: str) -> Optional[tuple[int, int]]:
+    """Return the (start, end) offsets of the raw TOML between the `+++` lines."""
+    opening = FRONTMATTER_OPEN.match(content)
+    if not opening:
+        return None
+    closing = FRONTMATTER_CLOSE.search(content, opening.end())
+    if not closing:
+        return None
+    return opening.end(), closing.start()
+
+
+def atomic_write(path: Path, content: str):
+    """Write a file via a temporary sibling and rename, so readers never see half a file."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as handle:
+            handle.write(content)
+        os.chmod(tmp, path.stat().st_mode & 0o7777 if path.exists() else 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def iter_markdown(root: Path = ROOT):
+    """Yield content Markdown files in a stable order, skipping hidden directories."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in sorted(filenames):
+            if name.endswith(".md") and name not in IGNORED_FILES:
+                yield Path(dirpath) / name
+
+
+def read_ahead(paths: Iterable[Path], workers: int = READ_AHEAD_WORKERS,
+               limit: int = READ_AHEAD_BYTES) -> Iterator[tuple[Path, bytes]]:
+    """Yield (path, contents) in the order of `paths` while threads read the next files.
+
+    Files are read in batches of READ_AHEAD_BATCH, at most four batches per
+    worker are queued, and a batch reserves its files' sizes when it is
+    queued, until its contents are consumed. No batch is queued while the
+    reserved bytes exceed `limit`, so a slow consumer holds at most `limit`
+    plus one batch in memory (for files that do not grow while queued).
+    With the profiler on, each file's read is timed in its thread and
+    reported, with that thread, when the file is yielded.
+    """
+    paths = iter(paths)
+    pending: deque = deque()
+    reserved = 0
+
+    def read(batch: list[Path]) -> tuple[list[bytes], list[tuple[float, float]], Optional[threading.Thread]]:
+        if not PROFILE.enabled:
+            return [path.read_bytes() for path in batch], [], None
+        contents, timings = [], []
+        for path in batch:
+            started = time.perf_counter()
+            contents.append(path.read_bytes())
+            timings.append((started, time.perf_counter() - started))
+        return contents, timings, threading.current_thread()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="read-ahead") as pool:
+        while True:
+            while len(pending) < 4 * workers and reserved < limit:
+                batch = list(islice(paths, READ_AHEAD_BATCH))
+                if not batch:
+                    break
+                size = sum(path.stat().st_size for path in batch)
+                reserved += size
+                pending.append((batch, size, pool.submit(read, batch)))
+            if not pending:
+                return
+            batch, size, future = pending.popleft()
+            contents, timings, thread = future.result()
+            for path, data, (started, seconds) in zip(batch, contents, timings):
+                PROFILE.add_time("read", seconds)
+                PROFILE.file(str(path), len(data), started, seconds, thread)
+            yield from zip(batch, contents)
+            reserved -= size
+
+
+def load_page(path: Path, root: Path = ROOT, data: Optional[bytes] = None) -> Page:
+    """Parse a single Markdown file into a page record, reading it unless `data` is given."""
+    rel = path.relative_to(root).as_posix()
+    lang, key = language_of(rel)
+    if data is None:
+        if PROFILE.enabled:
+            started = time.perf_counter()
+            data = path.read_bytes()
+            seconds = time.perf_counter() - started
+            PROFILE.add_time("read", seconds)
+            PROFILE.file(str(path), len(data), started, seconds)
+        else:
+            data = path.read_bytes()
+    parsed = time.perf_counter() if PROFILE.enabled else 0.0
+    content, invalid = decode_utf8(data)
+    frontmatter, body, error = parse_frontmatter(content)
+    error = "; ".join(filter(None, (invalid, error))) or None
+    if PROFILE.enabled:
+        PROFILE.add_time("decode + TOML parse", time.perf_counter() - parsed)
+    return Page(
+        root=root,
+        rel=sys.intern(rel),
+        lang=sys.intern(lang),
+        key=sys.intern(key),
+        frontmatter=frontmatter,
+        body=body,
+        error=error,
+        size=len(data),
+    )
+
+
+_SCANS: dict[Path, list[Page]] = {}
+
+
+def scan(root: Path = ROOT, refresh: bool = False) -> list[Page]:
+    """Return the page records of the tree, reading it only once per process."""
+    root = root.resolve()
+    if refresh or root not in _SCANS:
+        # Let the previous records and their bodies go before reading the tree again
+        _SCANS.pop(root, None)
+        with PROFILE.span("walk"):
+            paths = list(iter_markdown(root))
+        with PROFILE.span("read + parse"):
+            _SCANS[root] = [load_page(path, root, data) for path, data in read_ahead(paths)]
+    return _SCANS[root]
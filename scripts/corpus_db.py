@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""SQLite index of the content tree for ad-hoc queries.
+
+Loads page records, flattened frontmatter fields, links, shortcodes and an
+FTS5 full-text index of titles, descriptions and bodies into one SQLite file.
+Updates are incremental: files whose size and mtime are unchanged are not
+read, and files whose content hash is unchanged are not re-indexed.
+
+Usage:
+    python scripts/corpus_db.py                        # build or update the index
+    python scripts/corpus_db.py --rebuild              # start from scratch
+    python scripts/corpus_db.py --search "Enuma Elish" # full-text search
+    python scripts/corpus_db.py --query "SELECT ..."   # ad-hoc SQL
+
+Example — German wiki pages with claim_type = "framework" that link to
+/wiki/yahweh/ but have no description:
+
+    SELECT p.rel FROM pages p
+    JOIN fields f ON f.page_id = p.id AND f.name = 'extra.claim_type' AND f.value = 'framework'
+    JOIN links l ON l.page_id = p.id AND l.target IN ('/wiki/yahweh/', '/de/wiki/yahweh/')
+    WHERE p.lang = 'de' AND p.section = 'wiki' AND p.description IS NULL
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import posixpath
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from corpus import DEFAULT_LANGUAGE, ROOT, Page, iter_markdown, load_page, normalize_url
+from markdown_tokens import LINK, SHORTCODE, count_words, tokenize
+
+DB_PATH = ROOT / ".cache" / "corpus.sqlite"
+# Bump when what gets extracted from a page changes; older rows are re-indexed
+INDEX_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    rel TEXT UNIQUE NOT NULL,
+    lang TEXT NOT NULL,
+    key TEXT NOT NULL,
+    section TEXT,
+    url TEXT NOT NULL,
+    title TEXT,
+    description TEXT,
+    template TEXT,
+    words INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS pages_lang_key ON pages (lang, key);
+CREATE INDEX IF NOT EXISTS pages_section ON pages (section, lang);
+
+CREATE TABLE IF NOT EXISTS fields (
+    page_id INTEGER NOT NULL REFERENCES pages (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value
+);
+CREATE INDEX IF NOT EXISTS fields_name_value ON fields (name, value);
+CREATE INDEX IF NOT EXISTS fields_page ON fields (page_id);
+
+CREATE TABLE IF NOT EXISTS links (
+    page_id INTEGER NOT NULL REFERENCES pages (id) ON DELETE CASCADE,
+    text TEXT NOT NULL,
+    url TEXT NOT NULL,
+    target TEXT,
+    external INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS links_target ON links (target);
+CREATE INDEX IF NOT EXISTS links_page ON links (page_id);
+
+CREATE TABLE IF NOT EXISTS shortcodes (
+    page_id INTEGER NOT NULL REFERENCES pages (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    args TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS shortcodes_name ON shortcodes (name);
+CREATE INDEX IF NOT EXISTS shortcodes_page ON shortcodes (page_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5 (
+    title, description, body, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def connect(path: Path = DB_PATH) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executescript(SCHEMA)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+        with conn:
+            conn.execute("UPDATE pages SET mtime_ns = 0, hash = ''")
+            conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+    return conn
+
+
+def flatten(value, prefix: str):
+    """Yield (dotted name, scalar) pairs; list items become one row each."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from flatten(item, f"{prefix}.{key}" if prefix else key)
+    elif isinstance(value, list):
+        for item in value:
+            yield from flatten(item, prefix)
+    elif isinstance(value, (str, int, float, bool)) or value is None:
+        yield prefix, value
+    else:
+        yield prefix, str(value)  # dates and times
+
+
+def link_target(page: Page, url: str) -> Optional[str]:
+    """Resolve a link to a normalized site path, or None for external links."""
+    if url.startswith(("http://", "https://", "mailto:")):
+        return None
+    if url.startswith("#"):
+        return page.url
+    if url.startswith("/"):
+        return normalize_url(url)
+    return normalize_url(posixpath.normpath(posixpath.join(page.url, url.split("#")[0])))
+
+
+def text_field(page: Page, name: str) -> Optional[str]:
+    value = page.frontmatter.get(name)
+    return value if isinstance(value, str) and value else None
+
+
+def index_page(conn: sqlite3.Connection, page: Page, mtime_ns: int, digest: str):
+    tokens = list(tokenize(page.body))
+    words = count_words(page.body, tokens)
+    conn.execute("DELETE FROM pages WHERE rel = ?", (page.rel,))
+    cursor = conn.execute(
+        "INSERT INTO pages (rel, lang, key, section, url, title, description, template,"
+        " words, size, mtime_ns, hash, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (page.rel, page.lang, page.key, page.section, page.url, text_field(page, "title"),
+         text_field(page, "description"), text_field(page, "template"), words, page.size,
+         mtime_ns, digest, page.error),
+    )
+    page_id = cursor.lastrowid
+    conn.executemany(
+        "INSERT INTO fields (page_id, name, value) VALUES (?, ?, ?)",
+        ((page_id, name, value) for name, value in flatten(page.frontmatter, "")),
+    )
+    conn.executemany(
+        "INSERT INTO links (page_id, text, url, target, external) VALUES (?, ?, ?, ?, ?)",
+        (
+            (page_id, token.text, token.url, target, target is None)
+            for token in tokens if token.kind == LINK
+            for target in [link_target(page, token.url)]
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO shortcodes (page_id, name, args) VALUES (?, ?, ?)",
+        (
+            (page_id, token.text, json.dumps(token.args, ensure_ascii=False))
+            for token in tokens if token.kind == SHORTCODE
+        ),
+    )
+    conn.execute(
+        "INSERT INTO pages_fts (rowid, title, description, body) VALUES (?, ?, ?, ?)",
+        (page_id, text_field(page, "title"), text_field(page, "description"), page.body),
+    )
+
+
+def update(conn: sqlite3.Connection, root: Path = ROOT) -> dict[str, int]:
+    """Bring the index in line with the tree; return counts of what changed."""
+    known = {
+        rel: (size, mtime_ns, digest)
+        for rel, size, mtime_ns, digest in conn.execute("SELECT rel, size, mtime_ns, hash FROM pages")
+    }
+    stats = {"unchanged": 0, "touched": 0, "indexed": 0, "removed": 0}
+    seen = set()
+
+    with conn:
+        for path in iter_markdown(root):
+            rel = path.relative_to(root).as_posix()
+            seen.add(rel)
+            stat = path.stat()
+            previous = known.get(rel)
+            if previous and previous[:2] == (stat.st_size, stat.st_mtime_ns):
+                stats["unchanged"] += 1
+                continue
+
+            data = path.read_bytes()
+            digest = hashlib.sha1(data).hexdigest()
+            if previous and previous[2] == digest:
+                conn.execute("UPDATE pages SET mtime_ns = ? WHERE rel = ?", (stat.st_mtime_ns, rel))
+                stats["touched"] += 1
+                continue
+
+            page = load_page(path, root, data)
+            if previous:
+                conn.execute(
+                    "DELETE FROM pages_fts WHERE rowid = (SELECT id FROM pages WHERE rel = ?)", (rel,)
+                )
+            index_page(conn, page, stat.st_mtime_ns, digest)
+            stats["indexed"] += 1
+
+        for rel in known.keys() - seen:
+            conn.execute("DELETE FROM pages_fts WHERE rowid = (SELECT id FROM pages WHERE rel = ?)", (rel,))
+            conn.execute("DELETE FROM pages WHERE rel = ?", (rel,))
+            stats["removed"] += 1
+
+    return stats
+
+
+def open_index(path: Path = DB_PATH, root: Path = ROOT) -> sqlite3.Connection:
+    """Connect to the index and bring it up to date with the tree."""
+    conn = connect(path)
+    update(conn, root)
+    return conn
+
+
+def coverage_rows(conn: sqlite3.Connection, sections: list[str]):
+    """Yield (lang, section, key, English title, id, title, description, words,
+    translation_status, editorial_pass) rows.
+
+    One row per English page in `sections` and translation language; the
+    columns from `id` on describe the translation and are NULL when it is
+    missing.
+    """
+    placeholders = ", ".join("?" for _ in sections)
+    langs = [row[0] for row in conn.execute(
+        "SELECT DISTINCT lang FROM pages WHERE lang != ? ORDER BY lang", (DEFAULT_LANGUAGE,)
+    )]
+    query = f"""
+        SELECT l.lang, en.section, en.key, en.title, t.id, t.title, t.description, t.words,
+               (SELECT value FROM fields WHERE page_id = t.id AND name = 'extra.translation_status'),
+               (SELECT value FROM fields WHERE page_id = t.id AND name = 'extra.editorial_pass')
+        FROM pages en
+        CROSS JOIN (SELECT value AS lang FROM json_each(?)) l
+        LEFT JOIN pages t ON t.lang = l.lang AND t.key = en.key
+        WHERE en.lang = ? AND en.section IN ({placeholders})
+        ORDER BY l.lang, en.section, en.key
+    """
+    yield from conn.execute(query, (json.dumps(langs), DEFAULT_LANGUAGE, *sections))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build and query the SQLite corpus index")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="Index file (default: .cache/corpus.sqlite)")
+    parser.add_argument("--rebuild", action="store_true", help="Drop the index and build it from scratch")
+    parser.add_argument("--query", help="Run an SQL query and print the rows as JSON lines")
+    parser.add_argument("--search", help="Full-text search over titles, descriptions and bodies")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum search results")
+    args = parser.parse_args()
+
+    if args.rebuild and args.db.exists():
+        args.db.unlink()
+
+    start = time.perf_counter()
+    conn = connect(args.db)
+    stats = update(conn)
+    elapsed = time.perf_counter() - start
+    print(", ".join(f"{key}={value}" for key, value in stats.items()) + f" ({elapsed:.2f}s)",
+          file=sys.stderr)
+
+    if args.query:
+        cursor = conn.execute(args.query)
+        columns = [column[0] for column in cursor.description or []]
+        for row in cursor:
+            print(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+    elif args.search:
+        rows = conn.execute(
+            "SELECT p.rel, snippet(pages_fts, 2, '[', ']', '…', 12) FROM pages_fts"
+            " JOIN pages p ON p.id = pages_fts.rowid WHERE pages_fts MATCH ? ORDER BY rank LIMIT ?",
+            (args.search, args.limit),
+        )
+        for rel, snippet in rows:
+            print(f"{rel}: {snippet}")
+
+    conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,23 +4,33 @@
 The Timeline is reused by the website, EPUB, and print pipelines. Keep links as
 ordinary Markdown so their labels remain useful outside Zola, and keep external
 sources in frontmatter so the website can aggregate them into /sources/.
+Scripture citations link to every book the library hosts (see scripture.py).
 
 Usage:
     python scripts/curate_timeline_sources.py          # report pending changes
     python scripts/curate_timeline_sources.py --write  # apply the curation pass
+    python scripts/curate_timeline_sources.py --profile  # with timings and match counts
 """
 
 from __future__ import annotations
 
 import argparse
+import bisect
 import json
 import re
 from pathlib import Path
 
+from corpus import DEFAULT_LANGUAGE, decode_utf8
+from markdown_tokens import END, OPAQUE, SHORTCODE, tokenize
+from profiling import PROFILE, add_profile_arguments, finish_profile, format_report, read_bytes, start_profile
+from scripture import CitationRecognizer, build_catalogue
 
 ROOT = Path(__file__).resolve().parent.parent
 TIMELINE = ROOT / "timeline"
 
+# Scripture citations link to the hosted library books; see scripture.py
+RECOGNIZERS: dict[str, CitationRecognizer] = {}
+
 CHAPTERS = [
     "preamble",
     "in-the-beginning",
@@ -39,35 +49,6 @@ CHAPTERS = [
     "the-wheel-keeps-turning",
 ]
 
-# Hosted paragraph identifiers use c<chapter>p<paragraph>, matching the library
-# JSON schema. Only books currently hosted in data-library belong here.
-HOSTED_BOOKS = {
-    "Genesis": "genesis",
-    "Exodus": "exodus",
-    "Numbers": "numbers",
-    "Deuteronomy": "deuteronomy",
-    "Joshua": "joshua",
-    "Judges": "judges",
-    "1 Samuel": "1-samuel",
-    "2 Samuel": "2-samuel",
-    "1 Kings": "1-kings",
-    "2 Kings": "2-kings",
-    "Job": "job",
-    "Psalms": "psalms",
-    "Psalm": "psalms",
-    "Isaiah": "isaiah",
-    "Jeremiah": "jeremiah",
-    "Ezekiel": "ezekiel",
-    "Daniel": "daniel",
-    "Joel": "joel",
-    "Matthew": "matthew",
-    "Mark": "mark",
-    "Luke": "luke",
-    "John": "john",
-    "Acts": "acts",
-    "Revelation": "revelation",
-}
-
 WIKI_LINKS = {
     "preamble": [
         ("Elohim", "elohim"),
@@ -438,19 +419,38 @@ EXTERNAL_REFERENCES = {
 }
 
 
-def split_frontmatter(text: str) -> tuple[str, str]:
-    if not text.startswith("+++\n"):
+# Body shortcodes whose body is rendered as the text of a link
+LINK_SHORTCODES = {"wiki", "libref", "library", "scripture"}
+
+
+def split_frontmatter(text: str) -> tuple[str, str, str]:
+    """The whitespace before the opening `+++`, the frontmatter and the body."""
+    stripped = text.lstrip()
+    if not stripped.startswith("+++\n"):
         raise ValueError("missing TOML frontmatter")
-    _, frontmatter, body = text.split("+++", 2)
-    return frontmatter, body
+    _, frontmatter, body = stripped.split("+++", 2)
+    return text[: len(text) - len(stripped)], frontmatter, body
 
 
 def linked_spans(text: str) -> list[tuple[int, int]]:
-    return [match.span() for match in re.finditer(r"\[[^\]]+\]\([^)]+\)", text)]
+    """Sorted spans no link may go into: links, code, shortcode calls and link shortcode bodies."""
+    spans = []
+    opened = None
+    for token in tokenize(text):
+        if token.kind == SHORTCODE and token.text in LINK_SHORTCODES and text.startswith("{%", token.start):
+            opened = token.start
+        elif token.kind == END and opened is not None:
+            spans.append((opened, token.end))
+            opened = None
+        elif token.kind in OPAQUE and opened is None:
+            spans.append((token.start, token.end))
+    PROFILE.count("tokenizer: protected spans", len(spans))
+    return spans
 
 
 def is_linked(position: int, spans: list[tuple[int, int]]) -> bool:
-    return any(start <= position < end for start, end in spans)
+    index = bisect.bisect_right(spans, (position, float("inf"))) - 1
+    return index >= 0 and position < spans[index][1]
 
 
 def link_first(text: str, label: str, target: str) -> tuple[str, int]:
@@ -459,27 +459,34 @@ def link_first(text: str, label: str, target: str) -> tuple[str, int]:
     pattern = re.compile(rf"(?<![\w-]){re.escape(label)}(?![\w-])", re.IGNORECASE)
     spans = linked_spans(text)
     for match in pattern.finditer(text):
+        PROFILE.count("regex: label matches")
         if not is_linked(match.start(), spans):
             replacement = f"[{match.group(0)}]({target})"
             return text[: match.start()] + replacement + text[match.end() :], 1
     return text, 0
 
 
-def link_hosted_citations(text: str) -> tuple[str, int]:
-    names = "|".join(re.escape(name) for name in sorted(HOSTED_BOOKS, key=len, reverse=True))
-    pattern = re.compile(rf"(?<![\w-])({names})\s+(\d+):(\d+)(?:[-–]\d+)?", re.IGNORECASE)
+def citation_recognizer(lang: str = DEFAULT_LANGUAGE) -> CitationRecognizer:
+    """The recognizer of the hosted library books, built once per language."""
+    if lang not in RECOGNIZERS:
+        RECOGNIZERS[lang] = CitationRecognizer(build_catalogue(ROOT), lang)
+    return RECOGNIZERS[lang]
+
+
+def link_hosted_citations(text: str, lang: str = DEFAULT_LANGUAGE) -> tuple[str, int]:
     count = 0
     offset = 0
-    spans = linked_spans(text)
+    spans = None
     parts: list[str] = []
-    for match in pattern.finditer(text):
-        if is_linked(match.start(), spans):
+    for citation in citation_recognizer(lang).finditer(text):
+        PROFILE.count("trie: scripture citations")
+        if spans is None:
+            spans = linked_spans(text)
+        if is_linked(citation.start, spans):
             continue
-        book, chapter, paragraph = match.group(1), match.group(2), match.group(3)
-        slug = HOSTED_BOOKS[next(name for name in HOSTED_BOOKS if name.lower() == book.lower())]
-        parts.append(text[offset : match.start()])
-        parts.append(f"[{match.group(0)}](/library/{slug}/#c{chapter}p{paragraph})")
-        offset = match.end()
+        parts.append(text[offset : citation.start])
+        parts.append(f"[{text[citation.start : citation.end]}]({citation.url})")
+        offset = citation.end
         count += 1
     if not count:
         return text, 0
@@ -506,7 +513,10 @@ def add_references(frontmatter: str, references: list[dict[str, str]]) -> tuple[
 
 
 def curate(path: Path) -> tuple[str, dict[str, int], list[str]]:
-    frontmatter, body = split_frontmatter(path.read_text(encoding="utf-8"))
+    text, invalid = decode_utf8(read_bytes(path))
+    if invalid:
+        raise ValueError(f"{path.name}: {invalid}")
+    lead, frontmatter, body = split_frontmatter(text)
     stats = {"citations": 0, "library_titles": 0, "wiki": 0, "references": 0}
     misses: list[str] = []
 
@@ -523,20 +533,23 @@ def curate(path: Path) -> tuple[str, dict[str, int], list[str]]:
             misses.append(f"wiki: {label}")
 
     frontmatter, stats["references"] = add_references(frontmatter, EXTERNAL_REFERENCES.get(path.stem, []))
-    return f"+++{frontmatter}+++{body}", stats, misses
+    return f"{lead}+++{frontmatter}+++{body}", stats, misses
 
 
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--write", action="store_true", help="write curated Markdown files")
+    add_profile_arguments(parser)
     args = parser.parse_args()
+    start_profile(args)
 
     totals = {"citations": 0, "library_titles": 0, "wiki": 0, "references": 0}
     pending = 0
     for chapter in CHAPTERS:
         path = TIMELINE / f"{chapter}.md"
-        curated, stats, misses = curate(path)
-        changed = curated != path.read_text(encoding="utf-8")
+        with PROFILE.span(chapter):
+            curated, stats, misses = curate(path)
+        changed = curated.encode("utf-8") != path.read_bytes()
         pending += changed
         if args.write and changed:
             path.write_text(curated, encoding="utf-8")
@@ -549,6 +562,9 @@ def main() -> int:
 
     print("totals: " + ", ".join(f"{key}={value}" for key, value in totals.items()))
     print(f"files with pending changes: {pending}")
+    profile = finish_profile(args)
+    if profile:
+        print(format_report(profile))
     return 0
 
 
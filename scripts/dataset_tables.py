@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Row tables behind the `datasets/*.md` downloads that the corpus itself holds.
+
+Each dataset page advertises CSV and JSON downloads. A table generator turns
+the pages it is built from into columns and rows. Datasets whose rows are
+not part of this repository have no generator rather than invented data.
+
+    world-ages   one row per precessional age, from the Timeline frontmatter
+
+Rows are produced lazily, so the CSV and JSON writers stream them to any
+file-like object instead of holding a rendered copy. Each table also names
+the `stats` labels of its dataset page that are counts of its rows or
+fields, for export_datasets.py to keep in step.
+
+The content-graph dataset is a graph rather than a table; content_graph.py
+builds it.
+
+Usage:
+    python scripts/dataset_tables.py                  # list datasets and their generators
+    python scripts/dataset_tables.py world-ages       # print one table as CSV
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import sys
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional, TextIO
+
+from corpus import DEFAULT_LANGUAGE, Page, scan
+
+API_BASE = "https://api.wheelofheaven.world"
+GRAPH_DATASET = "content-graph"
+
+# Dataset page `stats` labels any table can fill: label -> count
+STAT_COUNTS = {"Rows": "rows", "Fields": "fields"}
+
+
+@dataclass
+class Table:
+    name: str
+    columns: list[str]
+    rows: Callable[[], Iterator[list]]  # called once per rendering
+    inputs: list[Page] = field(default_factory=list)  # the pages the rows come from
+    stats: dict[str, str] = field(default_factory=dict)  # table-specific labels, as STAT_COUNTS
+
+    def write_json(self, out: TextIO) -> int:
+        """Stream the self-describing JSON download (columns plus rows); return the row count."""
+        out.write(f'{{"dataset":{json.dumps(self.name)},"columns":{json.dumps(self.columns, ensure_ascii=False)},"rows":[')
+        count = 0
+        for row in self.rows():
+            out.write(("," if count else "") + "\n" + json.dumps(row, ensure_ascii=False, default=str))
+            count += 1
+        out.write("\n]}\n")
+        return count
+
+    def write_csv(self, out: TextIO) -> int:
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(self.columns)
+        count = 0
+        for row in self.rows():
+            writer.writerow(row)
+            count += 1
+        return count
+
+    def to_json(self) -> str:
+        out = io.StringIO()
+        self.write_json(out)
+        return out.getvalue()
+
+    def to_csv(self) -> str:
+        out = io.StringIO()
+        self.write_csv(out)
+        return out.getvalue()
+
+
+def year(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def world_ages(pages: list[Page]) -> Table:
+    ages = [
+        page for page in pages
+        if page.lang == DEFAULT_LANGUAGE and page.section == "timeline"
+        and page.key.startswith("timeline/age-of-") and year(page.extra.get("start_year")) is not None
+    ]
+    ages.sort(key=lambda page: year(page.extra["start_year"]))
+    columns = ["age", "zodiac", "symbol", "start_year", "end_year", "genesis_day", "summary", "url"]
+
+    def rows() -> Iterator[list]:
+        for page in ages:
+            yield [
+                page.frontmatter.get("title", ""),
+                page.frontmatter.get("title", "").removeprefix("Age of "),
+                page.extra.get("symbol", ""),
+                year(page.extra["start_year"]),
+                year(page.extra.get("end_year")),
+                page.extra.get("genesis_day"),
+                page.frontmatter.get("description", ""),
+                page.url,
+            ]
+
+    return Table("world-ages", columns, rows, inputs=ages, stats={"Ages": "rows"})
+
+
+# Dataset page stem -> table generator
+TABLES: dict[str, Callable[[list[Page]], Table]] = {
+    "world-ages": world_ages,
+}
+
+
+def dataset_pages(pages: list[Page]) -> list[Page]:
+    """The English `datasets/*.md` pages, in scan order."""
+    return [
+        page for page in pages
+        if page.lang == DEFAULT_LANGUAGE and page.section == "datasets" and not page.is_index and not page.error
+    ]
+
+
+def dataset_name(page: Page) -> str:
+    return page.key.rsplit("/", 1)[-1][: -len(".md")]
+
+
+def describe(page: Page) -> dict:
+    """A dataset page's metadata, with its downloads' API paths."""
+    downloads = []
+    for download in page.extra.get("downloads") or []:
+        if isinstance(download, dict) and isinstance(download.get("url"), str):
+            url = download["url"]
+            downloads.append({**download, "path": url[len(API_BASE):] if url.startswith(API_BASE) else None})
+    return {
+        "name": dataset_name(page),
+        "title": page.frontmatter.get("title", ""),
+        "dataset_name": page.extra.get("dataset_name"),
+        "description": page.frontmatter.get("description", ""),
+        "license": page.extra.get("license"),
+        "updated": page.extra.get("updated"),
+        "url": page.url,
+        "stats": page.extra.get("stats") or [],
+        "downloads": downloads,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the dataset tables the corpus holds")
+    parser.add_argument("name", nargs="?", choices=sorted(TABLES), help="Print this table as CSV")
+    args = parser.parse_args()
+
+    pages = scan()
+    if args.name:
+        TABLES[args.name](pages).write_csv(sys.stdout)
+        return 0
+    for page in dataset_pages(pages):
+        name = dataset_name(page)
+        if name in TABLES:
+            status = f"{sum(1 for _ in TABLES[name](pages).rows())} rows"
+        elif name == GRAPH_DATASET:
+            status = "nodes and edges, built by content_graph.py"
+        else:
+            status = "no generator (rows not in the repository)"
+        print(f"{name:28} {status}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""Export the datasets the corpus holds as content-hashed, precompressed files.
+
+Every `datasets/*.md` page advertises downloads and a `stats` block. For
+each dataset with a generator (dataset_tables.py, plus the content graph),
+this renders every advertised format by streaming rows into the file, names
+the result after its content hash, and writes a byte-identical gzip sibling
+next to it:
+
+    build/datasets/world-ages.3f2a9c81d0e4.csv
+    build/datasets/world-ages.3f2a9c81d0e4.csv.gz
+    build/datasets/manifest.json    download name -> hashed file, counts, input hash
+
+A dataset is only rendered again when the hash of its input pages changed,
+and the whole run ends before parsing anything when no Markdown file's size
+or mtime did, so re-publishing an unchanged tree is a no-op. Files a
+dataset no longer references are removed once the manifest is written.
+
+The row, field, node and edge counts are then written back into the
+matching `stats` values of the dataset page ("Ages", "Rows", "Fields",
+"Nodes (pages)", "Typed edges"); labels that are not counts are left alone.
+
+Usage:
+    python scripts/export_datasets.py              # export and update stats
+    python scripts/export_datasets.py --dry-run    # export, only report stale stats
+    python scripts/export_datasets.py --full       # ignore the manifest
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Iterable, TextIO
+
+from content_graph import build_graph, graphml_lines, is_node, json_lines
+from corpus import FRONTMATTER_CLOSE, FRONTMATTER_OPEN, ROOT, Page, atomic_write, iter_markdown, scan
+from dataset_tables import GRAPH_DATASET, STAT_COUNTS, TABLES, dataset_name, dataset_pages
+from search_index import encode, write_if_changed
+
+OUT_DIR = ROOT / "build" / "datasets"
+MANIFEST = "manifest.json"
+EXPORT_VERSION = 1
+HASH_LENGTH = 12
+
+GRAPH_STATS = {"Nodes (pages)": "nodes", "Typed edges": "edges"}
+STAT_VALUE = re.compile(r'(\{\s*label\s*=\s*"(?P<label>[^"]*)"\s*,\s*value\s*=\s*")(?P<value>[^"]*)(")')
+
+Writer = Callable[[TextIO], None]
+
+
+class HashingSink:
+    """A text sink that encodes once and feeds the file, its gzip twin and a digest."""
+
+    def __init__(self, *files):
+        self.files = files
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, text: str):
+        data = text.encode("utf-8")
+        self.digest.update(data)
+        self.size += len(data)
+        for handle in self.files:
+            handle.write(data)
+
+
+def write_artifact(out: Path, stem: str, suffix: str, write: Writer) -> dict:
+    """Stream one download into `stem.<hash><suffix>` and its `.gz` sibling."""
+    tmp = out / f".{stem}{suffix}.tmp"
+    tmp_gz = out / f".{stem}{suffix}.gz.tmp"
+    try:
+        with open(tmp, "wb") as raw, open(tmp_gz, "wb") as raw_gz:
+            # No file name and a zero mtime, so equal content gives equal bytes
+            with gzip.GzipFile(filename="", mode="wb", fileobj=raw_gz, compresslevel=9, mtime=0) as compressed:
+                sink = HashingSink(raw, compressed)
+                write(sink)
+        digest = sink.digest.hexdigest()
+        name = f"{stem}.{digest[:HASH_LENGTH]}{suffix}"
+        artifact = {"file": name, "bytes": sink.size, "sha256": digest,
+                    "gzip": f"{name}.gz", "gzip_bytes": tmp_gz.stat().st_size}
+        for source, target in ((tmp, out / name), (tmp_gz, out / f"{name}.gz")):
+            if target.exists():
+                source.unlink()  # same content, keep the published file untouched
+            else:
+                os.replace(source, target)
+        return artifact
+    except BaseException:
+        for path in (tmp, tmp_gz):
+            path.unlink(missing_ok=True)
+        raise
+
+
+def page_digest(page: Page, full: bool = True) -> str:
+    """Hash of what a generator reads from a page; `full=False` covers only its address."""
+    parts = [page.rel, page.url, page.aliases]
+    if full:
+        parts += [page.frontmatter, page.body]
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def input_hash(name: str, formats: list[str], digests: Iterable[str]) -> str:
+    digest = hashlib.sha1(f"{EXPORT_VERSION}\0{name}\0{','.join(formats)}\n".encode("utf-8"))
+    for item in digests:
+        digest.update(item.encode("ascii"))
+    return digest.hexdigest()
+
+
+def tree_signature(root: Path = ROOT) -> str:
+    """Digest of every Markdown file's path, size and mtime: the no-op check."""
+    digest = hashlib.sha1()
+    for path in iter_markdown(root):
+        info = path.stat()
+        digest.update(f"{path.relative_to(root).as_posix()}\0{info.st_size}\0{info.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def download_formats(page: Page) -> list[str]:
+    """The suffixes of the files a dataset page advertises, in page order."""
+    formats = []
+    for download in page.extra.get("downloads") or []:
+        url = download.get("url") if isinstance(download, dict) else None
+        if isinstance(url, str):
+            suffix = Path(url.split("?", 1)[0]).suffix.lower()
+            if suffix and suffix not in formats:
+                formats.append(suffix)
+    return formats
+
+
+class Export:
+    """Writers, input hash and counts of one dataset, computed only when needed."""
+
+    def __init__(self, name: str, writers: dict[str, Writer], digests: Callable[[], Iterable[str]],
+                 counts: Callable[[], dict[str, int]], labels: dict[str, str]):
+        self.name = name
+        self.writers = writers
+        self.digests = digests
+        self.counts = counts
+        self.labels = labels
+
+
+def table_export(name: str, pages: list[Page]) -> Export:
+    table = TABLES[name](pages)
+    counted: dict[str, int] = {}
+
+    def counting(write: Callable[[TextIO], int]) -> Writer:
+        def writer(out: TextIO):
+            counted["rows"] = write(out)
+        return writer
+
+    return Export(
+        name,
+        {".csv": counting(table.write_csv), ".json": counting(table.write_json)},
+        lambda: (page_digest(page) for page in table.inputs),
+        lambda: {"rows": counted.get("rows", sum(1 for _ in table.rows())), "fields": len(table.columns)},
+        {**STAT_COUNTS, **table.stats},
+    )
+
+
+def graph_export(pages: list[Page]) -> Export:
+    graph: dict = {}
+
+    def built() -> dict:
+        if not graph:
+            graph.update(build_graph(pages))
+        return graph
+
+    def writer(lines: Callable[[dict], Iterable[str]]) -> Writer:
+        def write(out: TextIO):
+            for line in lines(built()):
+                out.write(line)
+        return write
+
+    return Export(
+        GRAPH_DATASET,
+        {".json": writer(json_lines), ".graphml": writer(graphml_lines)},
+        # Nodes are read whole; every other page only matters as a link target
+        lambda: (page_digest(page, full=is_node(page)) for page in pages if not page.error),
+        lambda: {"nodes": built()["stats"]["nodes"], "edges": built()["stats"]["edges"]},
+        GRAPH_STATS,
+    )
+
+
+def rewrite_stats(text: str, labels: dict[str, str], counts: dict[str, int]) -> tuple[str, list[tuple]]:
+    """Put the counts into the frontmatter's stats values; return the text and the changes."""
+    opening = FRONTMATTER_OPEN.match(text)
+    closing = FRONTMATTER_CLOSE.search(text, opening.end()) if opening else None
+    if closing is None:
+        return text, []
+    changes = []
+
+    def replace(match: re.Match) -> str:
+        count = counts.get(labels.get(match["label"], ""))
+        if count is None or match["value"] == f"{count:,}":
+            return match.group()
+        changes.append((match["label"], match["value"], f"{count:,}"))
+        return f"{match.group(1)}{count:,}{match.group(4)}"
+
+    head = STAT_VALUE.sub(replace, text[:closing.start()])
+    return head + text[closing.start():], changes
+
+
+def export(out: Path = OUT_DIR, full: bool = False, dry_run: bool = False) -> dict:
+    """Export every dataset that changed and sync its page's stats; return a report."""
+    out.mkdir(parents=True, exist_ok=True)
+    manifest_path = out / MANIFEST
+    manifest = None
+    if not full and manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest.get("version") != EXPORT_VERSION:
+            manifest = None
+    previous: dict[str, dict] = manifest["datasets"] if manifest else {}
+
+    def present(record: dict) -> bool:
+        return all((out / artifact[key]).exists() for artifact in record["files"].values() for key in ("file", "gzip"))
+
+    signature = tree_signature()
+    if manifest and manifest.get("tree") == signature and all(map(present, previous.values())):
+        return {"status": {name: "unchanged" for name in previous}, "stats": [], "written": False}
+
+    pages = scan()
+    datasets: dict[str, dict] = {}
+    status: dict[str, str] = {}
+    stale_stats = []
+    for page in dataset_pages(pages):
+        name = dataset_name(page)
+        if name in TABLES:
+            job = table_export(name, pages)
+        elif name == GRAPH_DATASET:
+            job = graph_export(pages)
+        else:
+            status[name] = "no generator (rows not in the repository)"
+            continue
+        formats = [suffix for suffix in download_formats(page) if suffix in job.writers]
+        skipped = [suffix for suffix in download_formats(page) if suffix not in job.writers]
+        digest = input_hash(name, formats, job.digests())
+        record = previous.get(name)
+        if record is not None and record["input"] == digest and present(record):
+            status[name] = "unchanged"
+        else:
+            files = {suffix: write_artifact(out, name, suffix, job.writers[suffix]) for suffix in formats}
+            record = {"input": digest, "page": page.rel, "counts": job.counts(), "files": files}
+            status[name] = f"exported {', '.join(formats) or 'nothing'}"
+        if skipped:
+            status[name] += f" (no writer for {', '.join(skipped)})"
+        datasets[name] = record
+
+        text = page.path.read_text(encoding="utf-8")
+        updated, changes = rewrite_stats(text, job.labels, record["counts"])
+        if changes:
+            stale_stats.append((page.rel, changes))
+            if not dry_run:
+                atomic_write(page.path, updated)
+
+    # A dry run leaves stale stats behind, so the next run must not short-circuit
+    tree = None if dry_run and stale_stats else tree_signature()
+    written = write_if_changed(manifest_path, encode({"version": EXPORT_VERSION, "tree": tree, "datasets": datasets}))
+    keep = {MANIFEST} | {artifact[key] for record in datasets.values()
+                         for artifact in record["files"].values() for key in ("file", "gzip")}
+    for path in out.iterdir():
+        if path.is_file() and path.name not in keep and not path.name.startswith("."):
+            path.unlink()
+    return {"status": status, "stats": stale_stats, "written": written}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Export the datasets as content-hashed, precompressed files")
+    parser.add_argument("--out", type=Path, default=OUT_DIR, help="Output directory (default: build/datasets)")
+    parser.add_argument("--full", action="store_true", help="Ignore the manifest and render everything")
+    parser.add_argument("--dry-run", action="store_true", help="Report stale stats instead of rewriting them")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = export(args.out, args.full, args.dry_run)
+    elapsed = time.perf_counter() - start
+
+    for name, status in sorted(report["status"].items()):
+        print(f"{name:28} {status}")
+    for rel, changes in report["stats"]:
+        verb = "stale" if args.dry_run else "updated"
+        for label, old, new in changes:
+            print(f"{rel}: {verb} stats '{label}' {old} -> {new}")
+    print(f"manifest {'written' if report['written'] else 'unchanged'} in {elapsed:.2f}s")
+    return 1 if args.dry_run and report["stats"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,642 @@
+#!/usr/bin/env python3
+"""Assemble the fifteen Timeline chapters of each language into an EPUB.
+
+The chapters keep their links as portable Markdown (see
+curate_timeline_sources.py) so they can leave Zola. This renders them to
+XHTML with the subset of Markdown and shortcodes the Timeline uses:
+
+    links        /timeline/ chapters become in-book anchors; /wiki/, /library/
+                 and every other site path become absolute URLs
+    wiki, libref the same, from the shortcode's slug or book/chapter/verse
+    scripture    a block quotation with the Hebrew, transliteration and English
+    figure       the caption and the image's description
+    footnote     a note at the end of its chapter
+    cite         a reference mark into the book's bibliography
+
+The bibliography merges every chapter's `extra.references`, one entry per
+work as sources_dataset.py identifies it, with links back to the citing
+chapters.
+
+Each language builds in its own worker process. A chapter's rendered
+fragment is cached under .cache/epub/<lang>/ by the hash of its file, the
+library titles it can name and the renderer version, so after editing one
+chapter a rebuild renders that chapter once per language and re-zips the
+books from cache. A language whose fragments are all unchanged is skipped.
+A chapter without a translation falls back to the English text.
+
+Usage:
+    python scripts/export_epub.py                  # every language into build/epub/
+    python scripts/export_epub.py --lang de fr     # only these languages
+    python scripts/export_epub.py --jobs 2         # at most two worker processes
+    python scripts/export_epub.py --full           # ignore the fragment cache
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from html import escape, unescape
+from pathlib import Path
+from typing import Optional
+
+from corpus import DEFAULT_LANGUAGE, LANGUAGES, ROOT, Page, load_page, normalize_url
+from curate_timeline_sources import CHAPTERS
+from markdown_tokens import AUTOLINK, CODE, END, HEADING, LINK, SHORTCODE, TEXT, tokenize
+import sources_dataset
+from sources_dataset import identities, title_key
+
+OUT_DIR = ROOT / "build" / "epub"
+CACHE_DIR = ROOT / ".cache" / "epub"
+RENDER_VERSION = 1
+SITE_URL = "https://www.wheelofheaven.world"
+RTL_LANGUAGES = {"he"}
+
+# Fixed zip timestamps, so equal books are equal bytes
+ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+
+LABELS = {
+    "en": ("Contents", "Notes", "Bibliography", "Cited in"),
+    "de": ("Inhalt", "Anmerkungen", "Bibliographie", "Zitiert in"),
+    "es": ("Índice", "Notas", "Bibliografía", "Citado en"),
+    "fr": ("Sommaire", "Notes", "Bibliographie", "Cité dans"),
+    "he": ("תוכן העניינים", "הערות", "ביבליוגרפיה", "מצוטט ב"),
+    "ja": ("目次", "注", "参考文献", "引用箇所"),
+    "ko": ("목차", "주석", "참고 문헌", "인용된 곳"),
+    "ru": ("Содержание", "Примечания", "Библиография", "Цитируется в"),
+    "zh": ("目录", "注释", "参考文献", "引用于"),
+    "zh-Hant": ("目錄", "註釋", "參考文獻", "引用於"),
+}
+
+BLOCK_SHORTCODE = re.compile(r"^\{\{\s*(?:figure|scripture)\(.*\)\s*\}\}$")
+BLOCK_OPEN = re.compile(r"^\{%-?\s*scripture\(.*\)\s*-?%\}$")
+BLOCK_END = re.compile(r"\{%-?\s*end\s*-?%\}$")
+LIST_ITEM = re.compile(r"^(?:[-*+]|(?P<number>\d+)[.)])\s+")
+RULE = re.compile(r"^(?:-{3,}|\*{3,}|_{3,})\s*$")
+STRONG_EMPHASIS = re.compile(r"\*\*\*(?=\S)(.+?)(?<=\S)\*\*\*")
+STRONG = re.compile(r"\*\*(?=\S)(.+?)(?<=\S)\*\*")
+EMPHASIS = re.compile(r"(?<!\*)\*(?=[^\s*])(.+?)(?<=[^\s*])\*(?!\*)")
+TAG = re.compile(r"<[^>]+>")
+SLOT = re.compile(r"\x00(\d+)\x00")
+
+STYLE = """\
+body { font-family: serif; line-height: 1.5; }
+h1, h2, h3 { font-family: sans-serif; line-height: 1.2; }
+blockquote.scripture { margin: 1em 2em; }
+blockquote.scripture .hebrew { font-size: 1.15em; }
+blockquote.scripture footer { font-size: 0.9em; text-align: right; }
+figure { margin: 1.5em 0; font-size: 0.9em; font-style: italic; }
+sup { line-height: 0; }
+section.notes, section.bibliography li { font-size: 0.9em; }
+"""
+
+
+def chapter_file(index: int) -> str:
+    return f"chapter-{index + 1:02}.xhtml"
+
+
+def anchor_id(text: str, used: set[str]) -> str:
+    """A heading anchor as Zola derives it, made unique and a valid XML id."""
+    slug = re.sub(r"[\W_]+", "-", text.casefold()).strip("-")
+    if not slug or not (slug[0].isalpha() or slug[0] == "_"):
+        slug = f"section-{slug}".rstrip("-")
+    candidate, suffix = slug, 1
+    while candidate in used:
+        candidate, suffix = f"{slug}-{suffix}", suffix + 1
+    used.add(candidate)
+    return candidate
+
+
+def source_anchor(reference: dict) -> Optional[str]:
+    keys = identities(reference)
+    return f"src-{hashlib.sha1(keys[0].encode('utf-8')).hexdigest()[:10]}" if keys else None
+
+
+class ChapterRenderer:
+    """Markdown to XHTML for one chapter, collecting its notes and sources."""
+
+    def __init__(self, page: Page, chapters: dict[str, str], books: dict[str, str]):
+        self.page = page
+        self.chapters = chapters  # site path -> chapter file
+        self.books = books  # library slug -> title
+        self.prefix = "" if page.lang == DEFAULT_LANGUAGE else f"/{page.lang}"
+        self.references = [item for item in page.extra.get("references") or [] if isinstance(item, dict)]
+        self.footnotes = [item for item in page.extra.get("footnotes") or [] if isinstance(item, dict)]
+        self.anchors: set[str] = set()
+        self.toc: list[dict] = []
+        self.notes: list[int] = []
+        self.sources: dict[str, dict] = {}
+
+    # Links
+
+    def href(self, url: str) -> str:
+        """An in-book target for chapter links, an absolute URL for every other site path."""
+        url = url.strip()
+        if url.startswith("#") or "://" in url or url.startswith("mailto:"):
+            return url
+        path, _, fragment = url.partition("#")
+        target = self.chapters.get(normalize_url(path))
+        if target is not None:
+            return f"{target}#{fragment}" if fragment else target
+        return SITE_URL + ("/" + path.lstrip("/") if path else "/") + (f"#{fragment}" if fragment else "")
+
+    def site(self, path: str) -> str:
+        return self.href(f"{self.prefix}{path}")
+
+    def shortcode_href(self, args: dict) -> Optional[str]:
+        if isinstance(args.get("slug"), str):
+            return self.site(f"/wiki/{args['slug']}/")
+        if isinstance(args.get("book"), str):
+            fragment = f"#c{args['chapter']}p{args['verse']}" if "chapter" in args and "verse" in args else ""
+            return self.site(f"/library/{args['book']}/") + fragment
+        if isinstance(args.get("path"), str):
+            return self.site(args["path"])
+        return None
+
+    # Inline content
+
+    def inline(self, text: str) -> str:
+        """Escaped text with links, shortcodes and code in place, then emphasis."""
+        pieces: list[str] = []
+        slots: list[str] = []
+
+        def slot(markup: str):
+            pieces.append(f"\x00{len(slots)}\x00")
+            slots.append(markup)
+
+        closers: list[str] = []
+        for token in tokenize(text):
+            if token.kind == TEXT:
+                pieces.append(escape(text[token.start:token.end], quote=False))
+            elif token.kind == LINK:
+                slot(f'<a href="{escape(self.href(token.url))}">{self.inline(token.text)}</a>')
+            elif token.kind == AUTOLINK:
+                slot(f'<a href="{escape(token.url)}">{escape(token.url)}</a>')
+            elif token.kind == CODE:
+                slot(f"<code>{escape(token.text)}</code>")
+            elif token.kind == SHORTCODE:
+                if text.startswith("{%", token.start):
+                    href = self.shortcode_href(token.args)
+                    slot(f'<a href="{escape(href)}">' if href else "")
+                    closers.append("</a>" if href else "")
+                else:
+                    slot(self.inline_shortcode(token.text, token.args))
+            elif token.kind == END:
+                slot(closers.pop() if closers else "")
+        while closers:
+            slot(closers.pop())
+
+        markup = STRONG_EMPHASIS.sub(r"<strong><em>\1</em></strong>", "".join(pieces))
+        markup = STRONG.sub(r"<strong>\1</strong>", markup)
+        markup = EMPHASIS.sub(r"<em>\1</em>", markup)
+        return SLOT.sub(lambda match: slots[int(match.group(1))], markup)
+
+    def inline_shortcode(self, name: str, args: dict) -> str:
+        if name == "cite":
+            return self.cite(args)
+        if name == "footnote":
+            number = str(args.get("id", ""))
+            if number.isdigit() and 1 <= int(number) <= len(self.footnotes):
+                if int(number) not in self.notes:
+                    self.notes.append(int(number))
+                return (f'<sup><a epub:type="noteref" id="fnref-{number}" href="#fn-{number}">'
+                        f"{number}</a></sup>")
+            return ""
+        if name == "scripture":
+            return f"<q>{escape(str(args.get('english', '')))}</q>"
+        return ""
+
+    def cite(self, args: dict) -> str:
+        value = str(args.get("id", ""))
+        reference = None
+        if value.isdigit() and 1 <= int(value) <= len(self.references):
+            reference = self.references[int(value) - 1]
+        elif value:
+            reference = next((item for item in self.references if item.get("id") == value), None)
+        if reference is None and isinstance(args.get("title"), str):
+            return f"<cite>{self.inline(args['title'])}</cite>"
+        anchor = source_anchor(reference) if reference else None
+        if anchor is None:
+            return f"<sup>[{escape(value)}]</sup>"
+        self.sources.setdefault(anchor, reference)
+        return f'<sup><a href="bibliography.xhtml#{anchor}">[{escape(value)}]</a></sup>'
+
+    # Blocks
+
+    def scripture(self, args: dict, text: str = "") -> str:
+        lines = []
+        if args.get("hebrew"):
+            lines.append(f'<p class="hebrew" lang="he" dir="rtl">{escape(str(args["hebrew"]))}</p>')
+        if args.get("translit"):
+            lines.append(f'<p class="translit"><i>{escape(str(args["translit"]))}</i></p>')
+        english = text.strip() or str(args.get("english", ""))
+        if english:
+            lines.append(f"<p>{self.inline(english)}</p>")
+        book = str(args.get("book", ""))
+        label = self.books.get(book, book.removesuffix("-woh").replace("-", " ").title())
+        if "chapter" in args:
+            label += f" {args['chapter']}" + (f":{args['verse']}" if "verse" in args else "")
+        href = self.shortcode_href(args)
+        source = f'<a href="{escape(href)}">{escape(label)}</a>' if href else escape(label)
+        return f'<blockquote class="scripture">\n{"".join(lines)}\n<footer>{source}</footer>\n</blockquote>'
+
+    def figure(self, args: dict) -> str:
+        parts = []
+        if args.get("alt"):
+            parts.append(f'<p class="description">{escape(str(args["alt"]))}</p>')
+        if args.get("caption"):
+            parts.append(f"<figcaption>{self.inline(str(args['caption']))}</figcaption>")
+        return f"<figure>{''.join(parts)}</figure>" if parts else ""
+
+    def block_shortcode(self, line: str, body: str = "") -> str:
+        token = next(token for token in tokenize(line) if token.kind == SHORTCODE)
+        if token.text == "figure":
+            return self.figure(token.args)
+        return self.scripture(token.args, body)
+
+    def heading(self, level: int, text: str) -> str:
+        markup = self.inline(text)
+        plain = unescape(TAG.sub("", markup))
+        anchor = anchor_id(plain, self.anchors)
+        if level == 2:
+            self.toc.append({"id": anchor, "title": plain})
+        return f'<h{level} id="{anchor}">{markup}</h{level}>'
+
+    def render(self) -> str:
+        """The chapter's body XHTML: title, blocks and its notes."""
+        out = [f'<h1 id="top">{escape(self.page.frontmatter.get("title", ""))}</h1>']
+        paragraph: list[str] = []
+        items: list[str] = []
+        ordered = False
+        lines = self.page.body.split("\n")
+
+        def flush():
+            nonlocal items
+            if paragraph:
+                out.append(f"<p>{self.inline(' '.join(line.strip() for line in paragraph))}</p>")
+                paragraph.clear()
+            if items:
+                tag = "ol" if ordered else "ul"
+                out.append(f"<{tag}>" + "".join(f"<li>{self.inline(item)}</li>" for item in items) + f"</{tag}>")
+                items = []
+
+        index = 0
+        while index < len(lines):
+            line = lines[index].rstrip()
+            stripped = line.strip()
+            index += 1
+            heading = next(iter(tokenize(stripped)), None) if stripped.startswith("#") else None
+            if not stripped:
+                flush()
+            elif heading is not None and heading.kind == HEADING and heading.start == 0:
+                flush()
+                out.append(self.heading(heading.level, heading.text))
+            elif RULE.match(stripped) and not items:
+                flush()
+                out.append("<hr/>")
+            elif BLOCK_SHORTCODE.match(stripped):
+                flush()
+                out.append(self.block_shortcode(stripped))
+            elif BLOCK_OPEN.match(stripped):
+                flush()
+                body = []
+                while index < len(lines) and not BLOCK_END.search(lines[index].strip()):
+                    body.append(lines[index])
+                    index += 1
+                if index < len(lines):
+                    closing = BLOCK_END.sub("", lines[index].strip())
+                    body.append(closing)
+                    index += 1
+                out.append(self.block_shortcode(stripped, "\n".join(body)))
+            elif LIST_ITEM.match(stripped):
+                if paragraph:
+                    flush()
+                match = LIST_ITEM.match(stripped)
+                ordered = match.group("number") is not None
+                items.append(stripped[match.end():])
+            elif items and line.startswith((" ", "\t")):
+                items[-1] += " " + stripped
+            elif stripped.startswith(">"):
+                flush()
+                out.append(f"<blockquote><p>{self.inline(stripped.lstrip('> '))}</p></blockquote>")
+            else:
+                if items:
+                    flush()
+                paragraph.append(line)
+        flush()
+
+        if self.notes:
+            label = LABELS.get(self.page.lang, LABELS[DEFAULT_LANGUAGE])[1]
+            out.append('<section class="notes" epub:type="endnotes">')
+            out.append(f"<h2>{escape(label)}</h2>")
+            out.append("<ol>")
+            for number in range(1, len(self.footnotes) + 1):
+                content = self.inline(str(self.footnotes[number - 1].get("content", "")))
+                back = f' <a href="#fnref-{number}">↩</a>' if number in self.notes else ""
+                out.append(f'<li id="fn-{number}" epub:type="endnote">{content}{back}</li>')
+            out.append("</ol>")
+            out.append("</section>")
+        return "\n".join(out)
+
+
+def chapter_pages(lang: str) -> list[tuple[Page, bool]]:
+    """The chapters of a language, each with whether it fell back to English."""
+    pages = []
+    for chapter in CHAPTERS:
+        path = ROOT / (f"{lang}/" if lang != DEFAULT_LANGUAGE else "") / "timeline" / f"{chapter}.md"
+        fallback = not path.exists()
+        pages.append((load_page(ROOT / "timeline" / f"{chapter}.md" if fallback else path, ROOT), fallback))
+    return pages
+
+
+def book_titles(lang: str) -> dict[str, str]:
+    """Library slug -> title in this language, falling back to English."""
+    titles: dict[str, str] = {}
+    for root in ([ROOT / "library"] + ([ROOT / lang / "library"] if lang != DEFAULT_LANGUAGE else [])):
+        for path in sorted(root.glob("*.md")):
+            if path.name == "_index.md":
+                continue
+            page = load_page(path, ROOT)
+            title = page.frontmatter.get("title")
+            if isinstance(title, str):
+                titles[page.slug or path.stem] = title
+                titles[path.stem] = title
+    return titles
+
+
+def render_chapter(page: Page, chapters: dict[str, str], books: dict[str, str]) -> dict:
+    renderer = ChapterRenderer(page, chapters, books)
+    fragment = renderer.render()
+    return {
+        "title": page.frontmatter.get("title", ""),
+        "fragment": fragment,
+        "toc": renderer.toc,
+        "sources": renderer.sources,
+    }
+
+
+def xhtml(lang: str, title: str, body: str) -> str:
+    direction = ' dir="rtl"' if lang in RTL_LANGUAGES else ""
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n<!DOCTYPE html>\n'
+        f'<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops"'
+        f' lang="{lang}" xml:lang="{lang}"{direction}>\n'
+        f'<head><meta charset="UTF-8"/><title>{escape(title)}</title>'
+        '<link rel="stylesheet" type="text/css" href="style.css"/></head>\n'
+        f"<body>\n{body}\n</body>\n</html>\n"
+    )
+
+
+def known_sources() -> dict[str, dict]:
+    """Bibliographic fields of the sources dataset by id and title key.
+
+    Many references are an `id` alone, usually the slugged title of a work
+    another page cites in full; this is where their titles come from.
+    """
+    known: dict[str, dict] = {}
+    for source in sources_dataset.build()["dataset"]["sources"]:
+        if isinstance(source.get("title"), str):
+            fields = {key: source[key] for key in ("title", "author", "publication", "date", "medium", "url")
+                      if key in source}
+            for key in source["keys"]:
+                kind, _, value = key.partition(":")
+                if kind in ("id", "title"):
+                    known.setdefault(value, fields)
+    return known
+
+
+def lookup(reference: dict, known: dict[str, dict], books: dict[str, str]) -> dict:
+    """Complete an id-only reference from the sources dataset or the library."""
+    identifier = reference.get("id")
+    if isinstance(reference.get("title"), str) or not isinstance(identifier, str):
+        return reference
+    if identifier in known:
+        return {**known[identifier], **reference}
+    if identifier in books:
+        return {"title": books[identifier], "path": f"/library/{identifier}/", **reference}
+    # Ids are cut at 80 characters; a unique longer title key is the same work
+    matches = [key for key in known if len(identifier) >= 60 and key.startswith(identifier)]
+    if len(matches) == 1:
+        return {**known[matches[0]], **reference}
+    return {"title": identifier.replace("-", " ").capitalize(), **reference}
+
+
+def format_reference(reference: dict) -> str:
+    title = reference.get("title")
+    parts = []
+    if reference.get("author"):
+        parts.append(escape(str(reference["author"])) + ".")
+    if title:
+        parts.append(f"<i>{escape(str(title))}</i>.")
+    details = ", ".join(escape(str(reference[key])) for key in ("publication", "date") if reference.get(key))
+    if details:
+        parts.append(details + ".")
+    if reference.get("medium"):
+        parts.append(escape(str(reference["medium"])) + ".")
+    url = reference.get("url")
+    if not isinstance(url, str) and isinstance(reference.get("path"), str):
+        url = SITE_URL + normalize_url(reference["path"])
+    if isinstance(url, str):
+        parts.append(f'<a href="{escape(url)}">{escape(url)}</a>')
+    if reference.get("note"):
+        parts.append(f"— {escape(str(reference['note']))}")
+    return " ".join(parts)
+
+
+def bibliography(lang: str, rendered: list[dict], known: dict[str, dict], books: dict[str, str]) -> str:
+    entries: dict[str, dict] = {}
+    cited_in: dict[str, list[int]] = {}
+    for index, chapter in enumerate(rendered):
+        for anchor, reference in chapter["sources"].items():
+            if anchor not in entries:
+                entries[anchor] = lookup(reference, known, books)
+            cited_in.setdefault(anchor, []).append(index)
+
+    def sort_key(anchor: str):
+        reference = entries[anchor]
+        return title_key(str(reference.get("title") or reference.get("id") or "")), anchor
+
+    label = LABELS.get(lang, LABELS[DEFAULT_LANGUAGE])
+    lines = [f'<h1 id="top">{escape(label[2])}</h1>', '<ul class="bibliography">']
+    for anchor in sorted(entries, key=sort_key):
+        back = ", ".join(
+            f'<a href="{chapter_file(index)}">{escape(rendered[index]["title"])}</a>' for index in cited_in[anchor]
+        )
+        lines.append(f'<li id="{anchor}">{format_reference(entries[anchor])}'
+                     f"<br/><small>{escape(label[3])}: {back}</small></li>")
+    lines.append("</ul>")
+    return "\n".join(lines)
+
+
+def navigation(lang: str, title: str, rendered: list[dict]) -> str:
+    label = LABELS.get(lang, LABELS[DEFAULT_LANGUAGE])
+    lines = [f"<h1>{escape(title)}</h1>", '<nav epub:type="toc" id="toc">', f"<h2>{escape(label[0])}</h2>", "<ol>"]
+    for index, chapter in enumerate(rendered):
+        sections = "".join(
+            f'<li><a href="{chapter_file(index)}#{item["id"]}">{escape(item["title"])}</a></li>'
+            for item in chapter["toc"]
+        )
+        lines.append(f'<li><a href="{chapter_file(index)}">{escape(chapter["title"])}</a>'
+                     + (f"<ol>{sections}</ol>" if sections else "") + "</li>")
+    lines += ["</ol>", '<h2>—</h2>', f'<ol><li><a href="bibliography.xhtml">{escape(label[2])}</a></li></ol>', "</nav>"]
+    return "\n".join(lines)
+
+
+def package(lang: str, title: str, modified: str, count: int) -> str:
+    identifier = uuid.uuid5(uuid.NAMESPACE_URL, f"{SITE_URL}{'' if lang == DEFAULT_LANGUAGE else '/' + lang}/timeline/")
+    items = [f'<item id="chapter-{index + 1:02}" href="{chapter_file(index)}" media-type="application/xhtml+xml"/>'
+             for index in range(count)]
+    spine = [f'<itemref idref="chapter-{index + 1:02}"/>' for index in range(count)]
+    direction = ' page-progression-direction="rtl"' if lang in RTL_LANGUAGES else ""
+    return "\n".join([
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="book-id">',
+        '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">',
+        f'<dc:identifier id="book-id">urn:uuid:{identifier}</dc:identifier>',
+        f"<dc:title>{escape(title)}</dc:title>",
+        f"<dc:language>{lang}</dc:language>",
+        "<dc:publisher>Wheel of Heaven</dc:publisher>",
+        f'<meta property="dcterms:modified">{modified}</meta>',
+        "</metadata>",
+        "<manifest>",
+        '<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>',
+        '<item id="style" href="style.css" media-type="text/css"/>',
+        *items,
+        '<item id="bibliography" href="bibliography.xhtml" media-type="application/xhtml+xml"/>',
+        "</manifest>",
+        f"<spine{direction}>",
+        '<itemref idref="nav" linear="no"/>',
+        *spine,
+        '<itemref idref="bibliography"/>',
+        "</spine>",
+        "</package>",
+        "",
+    ])
+
+
+CONTAINER = """\
+<?xml version="1.0" encoding="UTF-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+<rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/></rootfiles>
+</container>
+"""
+
+
+def write_epub(target: Path, files: list[tuple[str, str]]):
+    """Zip the book with `mimetype` first and stored, as EPUB requires."""
+    tmp = target.with_name(f".{target.name}.tmp")
+    try:
+        with zipfile.ZipFile(tmp, "w") as book:
+            book.writestr(zipfile.ZipInfo("mimetype", ZIP_DATE), "application/epub+zip", zipfile.ZIP_STORED)
+            for name, content in files:
+                book.writestr(zipfile.ZipInfo(name, ZIP_DATE), content, zipfile.ZIP_DEFLATED)
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def build_language(lang: str, out: str, cache: str, full: bool, known: dict[str, dict]) -> dict:
+    """Render (or reuse) one language's chapters and write its EPUB; runs in a worker."""
+    out_dir, cache_dir = Path(out), Path(cache) / lang
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    pages = chapter_pages(lang)
+    books = book_titles(lang)
+    prefix = "" if lang == DEFAULT_LANGUAGE else f"/{lang}"
+    chapters: dict[str, str] = {}
+    for index, (page, _) in enumerate(pages):
+        # A fallback chapter is still linked under this language's path
+        for url in [page.url, *page.aliases, f"{prefix}/timeline/{CHAPTERS[index]}/"]:
+            chapters[normalize_url(url)] = chapter_file(index)
+    context = hashlib.sha1(json.dumps([RENDER_VERSION, lang, chapters, books], sort_keys=True).encode("utf-8"))
+
+    rendered, keys = [], []
+    stats = {"lang": lang, "rendered": 0, "cached": 0, "fallback": sum(fallback for _, fallback in pages)}
+    for page, _ in pages:
+        digest = context.copy()
+        digest.update(page.path.read_bytes())
+        key = digest.hexdigest()
+        entry = cache_dir / f"{key}.json"
+        if not full and entry.exists():
+            rendered.append(json.loads(entry.read_text(encoding="utf-8")))
+            stats["cached"] += 1
+        else:
+            rendered.append(render_chapter(page, chapters, books))
+            entry.write_text(json.dumps(rendered[-1], ensure_ascii=False), encoding="utf-8")
+            stats["rendered"] += 1
+        keys.append(key)
+    for stale in cache_dir.glob("*.json"):
+        if stale.stem not in keys:
+            stale.unlink()
+
+    target = out_dir / f"timeline-{lang}.epub"
+    sources = bibliography(lang, rendered, known, books)
+    book_key = hashlib.sha1(("".join(keys) + sources).encode("utf-8")).hexdigest()
+    stamp = out_dir / f".timeline-{lang}.key"
+    if not full and target.exists() and stamp.exists() and stamp.read_text() == book_key:
+        stats["written"] = False
+        return stats
+
+    index_path = ROOT / (f"{lang}/" if lang != DEFAULT_LANGUAGE else "") / "timeline" / "_index.md"
+    index = load_page(index_path if index_path.exists() else ROOT / "timeline" / "_index.md", ROOT)
+    title = index.frontmatter.get("title", "Timeline")
+    modified = os.environ.get("SOURCE_DATE_EPOCH") or max(page.path.stat().st_mtime for page, _ in pages)
+    modified = datetime.fromtimestamp(int(float(modified)), timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    files = [
+        ("META-INF/container.xml", CONTAINER),
+        ("OEBPS/content.opf", package(lang, title, modified, len(rendered))),
+        ("OEBPS/nav.xhtml", xhtml(lang, title, navigation(lang, title, rendered))),
+        ("OEBPS/style.css", STYLE),
+        *((f"OEBPS/{chapter_file(index)}", xhtml(lang, chapter["title"], chapter["fragment"]))
+          for index, chapter in enumerate(rendered)),
+        ("OEBPS/bibliography.xhtml", xhtml(lang, LABELS.get(lang, LABELS[DEFAULT_LANGUAGE])[2],
+                                           sources)),
+    ]
+    write_epub(target, files)
+    stamp.write_text(book_key)
+    stats["written"] = True
+    return stats
+
+
+def export(languages: list[str], out: Path = OUT_DIR, full: bool = False, jobs: Optional[int] = None) -> list[dict]:
+    """Build one EPUB per language across a process pool, one language per task."""
+    out.mkdir(parents=True, exist_ok=True)
+    workers = jobs or min(len(languages), os.cpu_count() or 1)
+    known = known_sources()
+    tasks = [(lang, str(out), str(CACHE_DIR), full, known) for lang in languages]
+    if workers <= 1:
+        return [build_language(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(build_language, *zip(*tasks)))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Export the Timeline chapters of each language as an EPUB")
+    parser.add_argument("--lang", nargs="+", choices=LANGUAGES, default=LANGUAGES, help="Languages to build")
+    parser.add_argument("--out", type=Path, default=OUT_DIR, help="Output directory (default: build/epub)")
+    parser.add_argument("--jobs", type=int, help="Worker processes (default: one per language, up to the CPUs)")
+    parser.add_argument("--full", action="store_true", help="Render every chapter again")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = export(args.lang, args.out, args.full, args.jobs)
+    for result in results:
+        status = "written" if result["written"] else "unchanged"
+        fallback = f", {result['fallback']} chapters in English" if result["fallback"] else ""
+        print(f"timeline-{result['lang']}.epub: {status}; {result['rendered']} rendered, "
+              f"{result['cached']} cached{fallback}")
+    print(f"{len(results)} books in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
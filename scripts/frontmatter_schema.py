@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""Declarative frontmatter schemas, compiled into validator closures.
+
+Each content section has a TOML file under scripts/schemas/ describing the
+frontmatter its pages carry. `_base.toml` holds what every page shares and
+`_root.toml` covers the pages outside any section. A file looks like:
+
+    [fields]                                # top-level keys
+    template = { type = "string", required = "source" }
+
+    [extra]                                 # keys of the [extra] table
+    claim_type = { type = "string", enum = ["direct", "inferred"] }
+
+    [templates."wiki-page.html".extra]      # pages using this template only
+    entry_type = { type = "string", enum = ["concept", "figure"] }
+
+    [templates."wiki-section.html"]         # listed, so valid in this section
+
+A field spec takes:
+
+    type                     string, integer, boolean, date, array or table
+    required                 true, or "source" for English pages only
+    enum                     the allowed values
+    pattern                  a regex the whole string must match
+    min_length, max_length   string length bounds; `hint` ends the max message
+    severity                 of enum, pattern and length findings (warning)
+    items                    spec of every array element
+    fields                   specs of a table's known keys; others are allowed
+    keys, values             specs of every key and value of a table
+
+A section's specs replace the base's field by field, and a template's the
+section's. When the schema loads, every (section, template, English or
+translation) combination is compiled into closures that run only the checks
+its specs ask for, so checking a page costs a dict lookup and an isinstance
+call or two per field present.
+
+Usage (as a library):
+    from frontmatter_schema import load_schema
+
+    schema = load_schema()
+    for message, severity, rule in schema.check(page):
+        print(page.rel, severity, message)
+"""
+
+from __future__ import annotations
+
+import re
+import tomllib
+from datetime import date
+from pathlib import Path
+from typing import Callable, Optional
+
+from corpus import DEFAULT_LANGUAGE, Page
+
+SCHEMA_DIR = Path(__file__).parent / "schemas"
+BASE = "_base"
+ROOT_SECTION = "_root"
+
+# Rules of the findings whose message head would not name them well
+WRONG_TYPE = "frontmatter/wrong-type"
+UNKNOWN_VALUE = "frontmatter/unknown-value"
+MALFORMED_VALUE = "frontmatter/malformed-value"
+
+SPEC_KEYS = {
+    "type", "required", "enum", "pattern", "min_length", "max_length", "hint",
+    "severity", "items", "fields", "keys", "values",
+}
+FILE_KEYS = {"fields", "extra", "templates"}
+TEMPLATE_KEYS = {"fields", "extra"}
+
+# TOML dates load as date objects; Zola also accepts RFC 3339 strings
+ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:\d{2})?)?")
+
+TYPE_NAMES = {
+    "string": "a string",
+    "integer": "an integer",
+    "boolean": "a boolean",
+    "date": "a date",
+    "array": "an array",
+    "table": "a table",
+}
+
+Finding = tuple[str, str, Optional[str]]  # message, severity, rule
+Report = Callable[[Finding], None]
+Check = Callable[[object, str, Report], None]
+
+
+class SchemaError(ValueError):
+    """A schema file that cannot be compiled."""
+
+
+def describe(value) -> str:
+    """TOML type name of a loaded value, for messages."""
+    if isinstance(value, bool):
+        return "a boolean"
+    if isinstance(value, int):
+        return "an integer"
+    if isinstance(value, float):
+        return "a float"
+    if isinstance(value, str):
+        return "a string"
+    if isinstance(value, date):
+        return "a date"
+    if isinstance(value, list):
+        return "an array"
+    if isinstance(value, dict):
+        return "a table"
+    return type(value).__name__
+
+
+def type_test(kind: str) -> Callable[[object], bool]:
+    if kind == "string":
+        return lambda value: isinstance(value, str)
+    if kind == "integer":
+        return lambda value: isinstance(value, int) and not isinstance(value, bool)
+    if kind == "boolean":
+        return lambda value: isinstance(value, bool)
+    if kind == "date":
+        return lambda value: isinstance(value, date) or (isinstance(value, str) and ISO_DATE.fullmatch(value) is not None)
+    if kind == "array":
+        return lambda value: isinstance(value, list)
+    return lambda value: isinstance(value, dict)
+
+
+def label(path: str) -> str:
+    return path[:1].upper() + path[1:]
+
+
+def length_step(spec: dict, severity: str) -> Check:
+    minimum = spec.get("min_length")
+    maximum = spec.get("max_length")
+    hint = f" {spec['hint']}" if "hint" in spec else ""
+
+    def step(value, path, report):
+        length = len(value)
+        if minimum is not None and length < minimum:
+            report((f"{label(path)} too short ({length} chars, min {minimum})", severity, None))
+        elif maximum is not None and length > maximum:
+            report((f"{label(path)} too long ({length} chars, max {maximum}{hint})", severity, None))
+
+    return step
+
+
+def enum_step(values: list, severity: str) -> Check:
+    allowed = frozenset(values)
+    expected = ", ".join(map(str, values))
+
+    def step(value, path, report):
+        if value not in allowed:
+            report((f"Unknown {path} '{value}' (expected one of: {expected})", severity, UNKNOWN_VALUE))
+
+    return step
+
+
+def pattern_step(pattern: str, severity: str, where: str) -> Check:
+    try:
+        regex = re.compile(pattern)
+    except re.error as e:
+        raise SchemaError(f"{where}: bad pattern {pattern!r}: {e}") from None
+
+    def step(value, path, report):
+        if not regex.fullmatch(value):
+            report((f"Malformed {path} '{value}' (must match {pattern})", severity, MALFORMED_VALUE))
+
+    return step
+
+
+def items_step(check: Check) -> Check:
+    def step(value, path, report):
+        for index, item in enumerate(value):
+            check(item, f"{path}[{index}]", report)
+
+    return step
+
+
+def fields_step(required: list[str], checks: list[tuple[str, Check]]) -> Check:
+    def step(value, path, report):
+        for name in required:
+            if name not in value:
+                report((f"Missing required field: {path}.{name}", "error", None))
+        for name, check in checks:
+            if name in value:
+                check(value[name], f"{path}.{name}", report)
+
+    return step
+
+
+def entries_step(key_check: Optional[Check], value_check: Optional[Check]) -> Check:
+    def step(value, path, report):
+        for key, item in value.items():
+            if key_check is not None:
+                key_check(key, f"{path} key", report)
+            if value_check is not None:
+                value_check(item, f"{path}.{key}", report)
+
+    return step
+
+
+def is_required(spec: dict, translation: bool) -> bool:
+    required = spec.get("required", False)
+    return required is True or (required == "source" and not translation)
+
+
+def compile_fields(specs: dict, translation: bool, where: str) -> tuple[list[str], list[tuple[str, Check]]]:
+    """(required names, (name, check) pairs) for a table of field specs."""
+    required = [name for name, spec in specs.items() if is_required(spec, translation)]
+    checks = [(name, compile_field(spec, translation, f"{where}.{name}")) for name, spec in specs.items()]
+    return required, checks
+
+
+def compile_field(spec: dict, translation: bool, where: str) -> Check:
+    """One closure checking a value against `spec`; `where` names the spec in SchemaErrors."""
+    if not isinstance(spec, dict):
+        raise SchemaError(f"{where}: expected a table, got {describe(spec)}")
+    unknown = set(spec) - SPEC_KEYS
+    if unknown:
+        raise SchemaError(f"{where}: unknown keys {', '.join(sorted(unknown))}")
+    kind = spec.get("type")
+    if kind not in TYPE_NAMES:
+        raise SchemaError(f"{where}: unknown type {kind!r}")
+    severity = spec.get("severity", "warning")
+
+    steps: list[Check] = []
+    if "enum" in spec:
+        steps.append(enum_step(spec["enum"], severity))
+    if kind == "string":
+        if "pattern" in spec:
+            steps.append(pattern_step(spec["pattern"], severity, where))
+        if "min_length" in spec or "max_length" in spec:
+            steps.append(length_step(spec, severity))
+    elif kind == "array" and "items" in spec:
+        steps.append(items_step(compile_field(spec["items"], translation, f"{where}.items")))
+    elif kind == "table":
+        if "fields" in spec:
+            steps.append(fields_step(*compile_fields(spec["fields"], translation, f"{where}.fields")))
+        if "keys" in spec or "values" in spec:
+            steps.append(entries_step(
+                compile_field({"type": "string", **spec["keys"]}, translation, f"{where}.keys") if "keys" in spec else None,
+                compile_field(spec["values"], translation, f"{where}.values") if "values" in spec else None,
+            ))
+
+    test = type_test(kind)
+    expected = TYPE_NAMES[kind]
+
+    if not steps:
+        def check(value, path, report):
+            if not test(value):
+                report((f"Field {path} should be {expected}, not {describe(value)}", "error", WRONG_TYPE))
+        return check
+
+    if len(steps) == 1:
+        only = steps[0]
+
+        def check(value, path, report):
+            if not test(value):
+                report((f"Field {path} should be {expected}, not {describe(value)}", "error", WRONG_TYPE))
+            else:
+                only(value, path, report)
+        return check
+
+    def check(value, path, report):
+        if not test(value):
+            report((f"Field {path} should be {expected}, not {describe(value)}", "error", WRONG_TYPE))
+            return
+        for step in steps:
+            step(value, path, report)
+
+    return check
+
+
+def merge(*layers: dict) -> dict:
+    """Field specs of the later layers replace those of the earlier ones."""
+    merged = {"fields": {}, "extra": {}}
+    for layer in layers:
+        for part in merged:
+            for name, spec in layer.get(part, {}).items():
+                merged[part][name] = {**merged[part].get(name, {}), **spec}
+    return merged
+
+
+def extra_spec(extra: dict) -> dict:
+    """The `extra` table as a field, required when any of its fields is."""
+    required = [spec.get("required", False) for spec in extra.values()]
+    spec = {"type": "table", "fields": extra}
+    if True in required:
+        spec["required"] = True
+    elif "source" in required:
+        spec["required"] = "source"
+    return spec
+
+
+def compile_page(spec: dict, templates: frozenset, section: Optional[str], translation: bool,
+                 where: str) -> Callable[[dict, Report], None]:
+    """The validator of one (section, template, translation) combination."""
+    fields = dict(spec["fields"])
+    if spec["extra"]:
+        fields["extra"] = extra_spec(spec["extra"])
+    required, checks = compile_fields(fields, translation, where)
+    context = f"for section '{section}'" if section else "for a top-level page"
+
+    def validate(frontmatter, report):
+        for name in required:
+            if name not in frontmatter:
+                report((f"Missing required field: {name}", "error", None))
+        template = frontmatter.get("template")
+        if templates and isinstance(template, str) and template not in templates:
+            report((f"Invalid template '{template}' {context}", "warning", None))
+        for name, check in checks:
+            if name in frontmatter:
+                check(frontmatter[name], name, report)
+
+    return validate
+
+
+def read_schema_file(path: Path, allowed: set[str]) -> dict:
+    try:
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    except tomllib.TOMLDecodeError as e:
+        raise SchemaError(f"{path.name}: {e}") from None
+    unknown = set(data) - allowed
+    if unknown:
+        raise SchemaError(f"{path.name}: unknown tables {', '.join(sorted(unknown))}")
+    for name, template in data.get("templates", {}).items():
+        if set(template) - TEMPLATE_KEYS:
+            raise SchemaError(f"{path.name}: template {name} may only have {', '.join(sorted(TEMPLATE_KEYS))}")
+    return data
+
+
+class Schema:
+    """Compiled validators for every section, template and language kind."""
+
+    def __init__(self, directory: Path = SCHEMA_DIR):
+        base = read_schema_file(directory / f"{BASE}.toml", FILE_KEYS - {"templates"})
+        self.validators: dict[tuple[Optional[str], Optional[str], bool], Callable] = {}
+        self.fallback = {
+            translation: compile_page(merge(base), frozenset(), None, translation, BASE)
+            for translation in (False, True)
+        }
+        for path in sorted(directory.glob("*.toml")):
+            if path.stem == BASE:
+                continue
+            section = None if path.stem == ROOT_SECTION else path.stem
+            data = read_schema_file(path, FILE_KEYS)
+            templates = data.get("templates", {})
+            for template in [None, *templates]:
+                spec = merge(base, data, templates.get(template, {}))
+                for translation in (False, True):
+                    self.validators[section, template, translation] = compile_page(
+                        spec, frozenset(templates), section, translation, f"{path.stem}.{template or 'fields'}"
+                    )
+
+    def validator(self, section: Optional[str], template, translation: bool) -> Callable[[dict, Report], None]:
+        if not isinstance(template, str):
+            template = None
+        return (
+            self.validators.get((section, template, translation))
+            or self.validators.get((section, None, translation))
+            or self.fallback[translation]
+        )
+
+    def check(self, page: Page) -> list[Finding]:
+        """(message, severity, rule) for everything wrong with the page's frontmatter."""
+        findings: list[Finding] = []
+        frontmatter = page.frontmatter
+        translation = page.lang != DEFAULT_LANGUAGE
+        self.validator(page.section, frontmatter.get("template"), translation)(frontmatter, findings.append)
+        return findings
+
+
+def schema_sections(directory: Path = SCHEMA_DIR) -> list[str]:
+    """Content sections, one per schema file, e.g. ["articles", ..., "wiki"]."""
+    return sorted(path.stem for path in directory.glob("*.toml") if path.stem not in (BASE, ROOT_SECTION))
+
+
+def load_schema(directory: Path = SCHEMA_DIR) -> Schema:
+    return Schema(directory)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Keep non-translatable frontmatter fields identical across language copies.
+
+Fields such as `slug`, `template` or `same_as` describe the page, not its text,
+and must mirror the English source in every translation tree. Drift is detected
+from the shared page scan; only drifted files are re-read, and only the drifted
+statements are spliced in from the English file, so the rest of each file stays
+byte for byte the same.
+
+Usage (via validate.py):
+    python scripts/validate.py --sync-frontmatter            # rewrite drifted keys
+    python scripts/validate.py --sync-frontmatter --dry-run  # only list them
+"""
+
+from __future__ import annotations
+
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
+
+from corpus import DEFAULT_LANGUAGE, Page, atomic_write, frontmatter_span
+
+# (table, key) pairs that must match the English page; "" is the root table.
+SYNC_FIELDS = [
+    ("", "slug"),
+    ("", "template"),
+    ("extra", "same_as"),
+    ("extra", "image"),
+    ("extra", "image_avif"),
+    ("extra", "core_claim_ids"),
+    ("extra", "core_versions"),
+    ("extra", "portrait_id"),
+    ("extra", "entry_type"),
+]
+
+
+def field_value(page: Page, table: str, key: str):
+    return (page.extra if table else page.frontmatter).get(key)
+
+
+def drifted_fields(source: Page, translation: Page) -> list[tuple[str, str]]:
+    """Return the synced fields whose parsed value differs from the English page."""
+    return [
+        (table, key)
+        for table, key in SYNC_FIELDS
+        if field_value(source, table, key) != field_value(translation, table, key)
+    ]
+
+
+def _statement_end(text: str, pos: int) -> int:
+    """Return the offset just past the statement starting at `pos`, newline included."""
+    depth = 0
+    i = pos
+    n = len(text)
+    while i < n:
+        char = text[i]
+        if char in "\"'":
+            triple = char * 3
+            if text.startswith(triple, i):
+                close = text.find(triple, i + 3)
+                while char == '"' and close > 0 and text[close - 1] == "\\":
+                    close = text.find(triple, close + 1)
+                i = n if close < 0 else close + 3
+                continue
+            i += 1
+            while i < n and text[i] != char and text[i] != "\n":
+                i += 2 if char == '"' and text[i] == "\\" else 1
+            i += 1
+            continue
+        if char == "#":
+            newline = text.find("\n", i)
+            i = n if newline < 0 else newline
+            continue
+        if char in "[{":
+            depth += 1
+        elif char in "]}":
+            depth -= 1
+        elif char == "\n" and depth <= 0:
+            return i + 1
+        i += 1
+    return n
+
+
+def toml_statements(text: str) -> Iterator[tuple[str, Optional[str], int, int]]:
+    """Yield (table, key, start, end) for every header and top-level statement.
+
+    Headers are yielded with key None. Statements inside `[[array.tables]]` carry
+    the table name with its brackets so they never match a plain table.
+    """
+    table = ""
+    i = 0
+    n = len(text)
+    while i < n:
+        line_end = text.find("\n", i)
+        line_end = n if line_end < 0 else line_end + 1
+        stripped = text[i:line_end].strip()
+        if not stripped or stripped.startswith("#"):
+            i = line_end
+            continue
+        if stripped.startswith("["):
+            header = stripped.split("#", 1)[0].strip()
+            table = header if header.startswith("[[") else header[1:-1].strip()
+            yield table, None, i, line_end
+            i = line_end
+            continue
+        end = _statement_end(text, i)
+        yield table, stripped.split("=", 1)[0].strip(), i, end
+        i = end
+
+
+def splice_fields(source_text: str, target_text: str, fields: list[tuple[str, str]]) -> str:
+    """Copy the given statements from the source frontmatter into the target one."""
+    source_span = frontmatter_span(source_text)
+    target_span = frontmatter_span(target_text)
+    if not source_span or not target_span:
+        return target_text
+    source = source_text[source_span[0]:source_span[1]]
+    target = target_text[target_span[0]:target_span[1]]
+    newline = "\r\n" if "\r\n" in target else "\n"
+
+    source_stmts = {(t, k): source[s:e] for t, k, s, e in toml_statements(source) if k}
+    target_stmts = {}
+    table_ends: dict[str, int] = {}
+    first_array_table = len(target)
+    for table, key, start, end in toml_statements(target):
+        if key:
+            target_stmts[table, key] = (start, end)
+        if not table.startswith("[["):
+            table_ends[table] = end
+        elif first_array_table == len(target):
+            first_array_table = start
+    table_ends.setdefault("", 0)
+
+    edits: list[tuple[int, int, str]] = []
+    inserts: dict[str, list[str]] = defaultdict(list)
+    for field in fields:
+        snippet = source_stmts.get(field, "")
+        snippet = snippet.replace("\r\n", "\n").replace("\n", newline)
+        if snippet and not snippet.endswith(newline):
+            snippet += newline
+        if field in target_stmts:
+            start, end = target_stmts[field]
+            edits.append((start, end, snippet))
+        elif snippet:
+            inserts[field[0]].append(snippet)
+
+    for table, snippets in inserts.items():
+        if table in table_ends:
+            at = table_ends[table]
+            edits.append((at, at, "".join(snippets)))
+        else:
+            at = first_array_table
+            edits.append((at, at, f"[{table}]{newline}" + "".join(snippets) + newline))
+
+    for start, end, replacement in sorted(edits, key=lambda edit: edit[0], reverse=True):
+        target = target[:start] + replacement + target[end:]
+    return target_text[:target_span[0]] + target + target_text[target_span[1]:]
+
+
+def sync_batch(batch: list[tuple[str, str, list[tuple[str, str]]]]) -> list[str]:
+    """Rewrite one language's drifted files; runs inside a worker process."""
+    written = []
+    for source_path, target_path, fields in batch:
+        target = Path(target_path)
+        original = target.read_text(encoding="utf-8")
+        updated = splice_fields(Path(source_path).read_text(encoding="utf-8"), original, fields)
+        if updated != original:
+            atomic_write(target, updated)
+            written.append(target_path)
+    return written
+
+
+def find_drift(pages: list[Page]) -> dict[str, list[tuple[Page, Page, list[tuple[str, str]]]]]:
+    """Group (source, translation, fields) by language for every drifted translation."""
+    english = {page.key: page for page in pages if page.lang == DEFAULT_LANGUAGE}
+    drift: dict[str, list] = defaultdict(list)
+    for page in pages:
+        source = english.get(page.key) if page.lang != DEFAULT_LANGUAGE else None
+        if source is None or source.error or page.error:
+            continue
+        fields = drifted_fields(source, page)
+        if fields:
+            drift[page.lang].append((source, page, fields))
+    return dict(drift)
+
+
+def sync_frontmatter(pages: list[Page], workers: Optional[int] = None) -> list[str]:
+    """Rewrite drifted fields in place, one batch per language across a process pool."""
+    drift = find_drift(pages)
+    batches = [
+        [(str(source.path), str(page.path), fields) for source, page, fields in items]
+        for _, items in sorted(drift.items())
+    ]
+    if not batches:
+        return []
+    workers = workers or min(len(batches), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [path for written in pool.map(sync_batch, batches) for path in written]
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Read the content tree of past commits straight from the git object store.
+
+Nothing is checked out. One `git log` lists the commits, and one long-lived
+`git cat-file --batch` process answers every tree lookup after that. Trees
+are content-addressed, so a directory that did not change between two
+commits has the same id in both. Its listing (the `git ls-tree -r
+--name-only` view of it) is built once per run and shared by every commit
+that contains it.
+
+Usage (via i18n_dashboard.py):
+    python scripts/i18n_dashboard.py --history
+    python scripts/i18n_dashboard.py --history --every week --since "2 years ago" --html
+"""
+
+from __future__ import annotations
+
+import subprocess
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+TREE_MODE = b"40000"
+GITLINK_MODE = b"160000"  # a submodule commit, not a file of this repo
+
+EVERY = ["commit", "day", "week"]
+
+
+@dataclass(frozen=True)
+class Commit:
+    sha: str
+    date: datetime
+    tree: str
+
+
+def run_git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], check=True, capture_output=True, text=True
+    ).stdout
+
+
+def commits(repo: Path, since: Optional[str] = None, every: str = "commit", rev: str = "HEAD") -> list[Commit]:
+    """First-parent history of `rev`, oldest first, one commit per `every` period (the latest)."""
+    args = ["log", "--first-parent", "--format=%H %ct %T"]
+    if since:
+        args.append(f"--since={since}")
+    history = []
+    seen_periods = set()
+    for line in run_git(repo, *args, rev).splitlines():  # newest first
+        sha, timestamp, tree = line.split()
+        date = datetime.fromtimestamp(int(timestamp), timezone.utc)
+        if every != "commit":
+            period = date.date() if every == "day" else date.isocalendar()[:2]
+            if period in seen_periods:
+                continue
+            seen_periods.add(period)
+        history.append(Commit(sha, date, tree))
+    return history[::-1]
+
+
+class GitObjects:
+    """A `git cat-file --batch` process with cached, parsed tree objects."""
+
+    def __init__(self, repo: Path):
+        self.repo = repo
+        self.hash_size = 32 if run_git(repo, "rev-parse", "--show-object-format").strip() == "sha256" else 20
+        self.process = subprocess.Popen(
+            ["git", "-C", str(repo), "cat-file", "--batch"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+        self.trees: dict[str, list[tuple[str, str, bool]]] = {}
+        self.listings: dict[str, tuple[str, ...]] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+
+    def read(self, sha: str) -> tuple[str, bytes]:
+        """(type, content) of one object."""
+        self.process.stdin.write(sha.encode("ascii") + b"\n")
+        self.process.stdin.flush()
+        header = self.process.stdout.readline().split()
+        if len(header) != 3:
+            raise KeyError(f"{sha}: {b' '.join(header).decode('utf-8', 'replace')}")
+        kind, size = header[1].decode("ascii"), int(header[2])
+        content = self.process.stdout.read(size + 1)[:size]  # drop the trailing newline
+        return kind, content
+
+    def tree(self, sha: str) -> list[tuple[str, str, bool]]:
+        """(name, object id, is a directory) for each entry, in git's order."""
+        entries = self.trees.get(sha)
+        if entries is None:
+            kind, data = self.read(sha)
+            if kind != "tree":
+                raise KeyError(f"{sha} is a {kind}, not a tree")
+            entries = []
+            position = 0
+            while position < len(data):
+                space = data.index(b" ", position)
+                nul = data.index(b"\0", space)
+                mode = data[position:space]
+                object_id = data[nul + 1:nul + 1 + self.hash_size].hex()
+                position = nul + 1 + self.hash_size
+                if mode != GITLINK_MODE:
+                    entries.append((data[space + 1:nul].decode("utf-8", "surrogateescape"), object_id, mode == TREE_MODE))
+            self.trees[sha] = entries
+        return entries
+
+    def subtree(self, sha: str, path: str) -> Optional[str]:
+        """Id of the directory at `path` below tree `sha`, or None."""
+        for part in filter(None, path.split("/")):
+            sha = next((child for name, child, is_dir in self.tree(sha) if is_dir and name == part), None)
+            if sha is None:
+                return None
+        return sha
+
+    def files(self, sha: str) -> tuple[str, ...]:
+        """Every file path below tree `sha`, as `git ls-tree -r --name-only` lists them."""
+        listing = self.listings.get(sha)
+        if listing is None:
+            paths = []
+            for name, child, is_dir in self.tree(sha):
+                if is_dir:
+                    paths.extend(f"{name}/{path}" for path in self.files(child))
+                else:
+                    paths.append(name)
+            listing = self.listings[sha] = tuple(paths)
+        return listing
@@ -5,34 +5,68 @@ Internationalization Dashboard for Wheel of Heaven
 Generates detailed translation coverage reports with:
 - Per-language coverage statistics
 - Per-section breakdown
-- Missing content identification
+- Missing, stale and suspicious content identification
 - Quality metrics (description length, title presence)
-- Exportable reports (JSON, HTML)
+- Exportable reports (JSON, HTML, a static multi-page dashboard)
+
+A translation is stale when its `editorial_pass` is older than the English
+source's, and suspicious when its `translation_status` says it is incomplete
+or its title or description is missing or still in English.
+
+The multi-page dashboard streams each page to disk and keeps a hash of the
+data behind every page in `.dashboard.json`, so a run only rewrites the
+pages whose numbers or file lists changed.
 
 Usage:
     python scripts/i18n_dashboard.py                    # Terminal output
     python scripts/i18n_dashboard.py --json             # JSON output
     python scripts/i18n_dashboard.py --html > report.html  # HTML report
+    python scripts/i18n_dashboard.py --html-dir         # Dashboard site in build/i18n-dashboard,
+                                                        # with a page per language and per section
+    python scripts/i18n_dashboard.py --db               # Read from the SQLite corpus index
+    python scripts/i18n_dashboard.py --profile          # Append per-phase timings
+    python scripts/i18n_dashboard.py --history --html > report.html
+                                                        # Add coverage trends over the last year
+    python scripts/i18n_dashboard.py --history --every week --since "2 years ago" --json
+    python scripts/i18n_dashboard.py --shard 1/4 --shard-output i18n-1.json
+    python scripts/i18n_dashboard.py merge-reports i18n-*.json --html > report.html
 """
 
 import argparse
+import hashlib
 import json
+import os
 import re
-from collections import defaultdict
+import subprocess
+import sys
+import tomllib
+from array import array
 from datetime import datetime
+from html import escape
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
+
+from corpus import LANGUAGES, atomic_write, frontmatter_span, normalize_url, parse_frontmatter
+from corpus_db import coverage_rows, open_index
+from frontmatter_schema import schema_sections
+from git_history import EVERY, GitObjects, commits, run_git
+from markdown_tokens import count_words
+from profiling import (
+    PROFILE, add_profile_arguments, finish_profile, format_report, read_text, start_profile,
+)
+from search_index import write_if_changed
+from sharding import add_shard_arguments, assign_shards, load_shards, tree_fingerprint, write_shard
 
 # Content root
 CONTENT_ROOT = Path(__file__).parent.parent
 
-# Supported languages
-LANGUAGES = ["en", "de", "es", "fr", "ja", "ko", "ru", "zh", "zh-Hant"]
+# Display names of corpus.LANGUAGES
 LANGUAGE_NAMES = {
     "en": "English",
     "de": "Deutsch",
     "es": "Español",
     "fr": "Français",
+    "he": "עברית",
     "ja": "日本語",
     "ko": "한국어",
     "ru": "Русский",
@@ -40,73 +74,311 @@ LANGUAGE_NAMES = {
     "zh-Hant": "繁體中文"
 }
 
-# Sections to track
-SECTIONS = ["wiki", "timeline", "resources", "essentials", "explainers"]
-
-
-def parse_frontmatter(content: str) -> dict:
-    """Extract TOML frontmatter from markdown content."""
-    if not content.startswith("+++"):
-        return {}
+# Sections to track: those with a schema in scripts/schemas/
+SECTIONS = schema_sections()
+
+# Frontmatter keys the dashboard reads: top-level ones and those of [extra]
+ROOT_FIELDS = ("title", "description", "slug")
+EXTRA_FIELDS = ("translation_status", "editorial_pass")
+
+# Table headers, which say whose keys follow, and the lines of those keys
+FIELD_LINE = re.compile(rf"""
+    ^[ \t]*(?:
+        (?P<array>\[)?\[[ \t]*(?P<table>[\w.-]+)[ \t]*\]\]?[ \t]*(?:\#.*)?$
+      | (?P<field>(?:{"|".join(ROOT_FIELDS + EXTRA_FIELDS)})[ \t]*=.*)$
+    )""", re.MULTILINE | re.VERBOSE)
+
+# What makes an existing translation suspicious
+INCOMPLETE_STATUSES = {"en_only", "metadata_only", "partial", "planned"}
+
+# Coverage counts of past commits, keyed by commit id
+HISTORY_CACHE = CONTENT_ROOT / ".cache" / "i18n-history.json"
+HISTORY_CACHE_VERSION = 1
+DEFAULT_HISTORY_SINCE = "1 year ago"
+
+# Line colors of the trend charts
+TREND_COLORS = {
+    "de": "#f9c74f",
+    "es": "#f8961e",
+    "fr": "#90be6d",
+    "ja": "#f94144",
+    "ko": "#43aa8b",
+    "ru": "#4d908e",
+    "zh": "#577590",
+    "zh-Hant": "#c77dff",
+}
 
-    parts = content.split("+++", 2)
-    if len(parts) < 3:
-        return {}
 
-    frontmatter_str = parts[1].strip()
-    frontmatter = {}
+def frontmatter_fields(content: str) -> tuple[dict, str]:
+    """The frontmatter fields the dashboard reads, and the body.
+
+    Values are parsed with tomllib like the corpus index parses them, so --db
+    reports the same: `title`, `description` and `slug` are top-level strings
+    and `translation_status` and `editorial_pass` come from `[extra]`. Only
+    the lines of those keys are parsed, as parsing whole frontmatter takes
+    four times as long. A frontmatter with multi-line strings, whose lines
+    could pass for keys, or whose key lines do not parse alone, is parsed whole.
+    """
+    span = frontmatter_span(content)
+    if span is None:
+        return dict.fromkeys(ROOT_FIELDS + EXTRA_FIELDS, ""), content
+    toml = content[span[0]:span[1]]
+    end = content.find("\n", span[1])
+    body = content[end + 1:] if end >= 0 else ""
+
+    frontmatter = None
+    if '"""' not in toml and "'''" not in toml:
+        lines = {"": [], "extra": []}
+        table = ""
+        for match in FIELD_LINE.finditer(toml):
+            if match["table"]:
+                table = None if match["array"] else match["table"]
+            elif table in lines:
+                lines[table].append(match["field"])
+        try:
+            frontmatter = tomllib.loads("\n".join(lines[""] + ["[extra]"] + lines["extra"]))
+        except tomllib.TOMLDecodeError:
+            pass
+    if frontmatter is None:
+        frontmatter = parse_frontmatter(content)[0]
+
+    extra = frontmatter.get("extra")
+    if not isinstance(extra, dict):
+        extra = {}
+    fields = {name: frontmatter.get(name) for name in ROOT_FIELDS}
+    fields.update((name, extra.get(name)) for name in EXTRA_FIELDS)
+    return {name: value if isinstance(value, str) else "" for name, value in fields.items()}, body
+
+
+def english_sources() -> dict[str, list[Path]]:
+    """English source files per existing section, in path order."""
+    sources = {}
+    for section in SECTIONS:
+        section_path = CONTENT_ROOT / section
+        if section_path.exists():
+            sources[section] = sorted(
+                (path for path in section_path.rglob("*.md") if path.name != "README.md"), key=Path.as_posix
+            )
+    return sources
 
-    for line in frontmatter_str.split("\n"):
-        line = line.strip()
-        if not line or line.startswith("#") or line.startswith("["):
-            continue
-        if "=" in line:
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip().strip('"').strip("'")
-            frontmatter[key] = value
 
-    return frontmatter
+def source_url(section: str, rel_path: str, slug: str = "") -> str:
+    """Site path of an English source, derived like corpus.Page.url."""
+    parent, _, name = f"{section}/{rel_path}".rpartition("/")
+    stem = name[: -len(".md")]
+    if stem == "_index":
+        return normalize_url(parent)
+    return normalize_url(f"{parent}/{slug or stem}")
 
 
-def get_english_content() -> dict:
-    """Get all English source content organized by section."""
+def get_english_content(db=None, only: Optional[set[Path]] = None) -> dict:
+    """Get all English source content organized by section (or just the files in `only`)."""
     english = {}
 
-    for section in SECTIONS:
-        section_path = CONTENT_ROOT / section
-        if not section_path.exists():
-            continue
+    # Answer from the SQLite corpus index when one is open
+    if db is not None:
+        placeholders = ", ".join("?" for _ in SECTIONS)
+        rows = db.execute(
+            f"SELECT rel, key, section, url, title, description, words,"
+            f" (SELECT value FROM fields WHERE page_id = pages.id AND name = 'extra.editorial_pass')"
+            f" FROM pages WHERE lang = 'en' AND section IN ({placeholders}) ORDER BY section, key",
+            SECTIONS,
+        )
+        for rel, key, section, url, title, description, words, editorial_pass in rows:
+            english.setdefault(section, {})[key[len(section) + 1:]] = {
+                "path": str(CONTENT_ROOT / rel),
+                "url": url,
+                "title": title or "",
+                "description": description or "",
+                "word_count": words,
+                "editorial_pass": editorial_pass or "",
+            }
+        return english
 
+    for section, files in english_sources().items():
         english[section] = {}
-        for md_file in section_path.rglob("*.md"):
-            if md_file.name == "README.md":
+        for md_file in files:
+            if only is not None and md_file not in only:
                 continue
-            rel_path = md_file.relative_to(section_path)
-            content = md_file.read_text(encoding="utf-8")
-            fm = parse_frontmatter(content)
+            rel_path = md_file.relative_to(CONTENT_ROOT / section)
+            fm, body = frontmatter_fields(read_text(md_file))
 
             english[section][str(rel_path)] = {
                 "path": str(md_file),
-                "title": fm.get("title", ""),
-                "description": fm.get("description", ""),
-                "word_count": len(content.split())
+                "url": source_url(section, str(rel_path), fm["slug"]),
+                "title": fm["title"],
+                "description": fm["description"],
+                "word_count": count_words(body),
+                "editorial_pass": fm["editorial_pass"],
             }
 
     return english
 
 
-def get_translation_coverage(english: dict) -> dict:
-    """Calculate translation coverage for each language."""
-    coverage = {}
+class TranslationFacts:
+    """Per language, the facts `assess_translation` judges each English
+    source's translation by, held as columns indexed by file id.
+
+    File ids number the "section/path" keys of `english` in order. Each
+    language has a flag byte, a description length and two indexes into one
+    table of the status and editorial pass strings per file, so a tree of
+    many thousand sources costs a few bytes per file and language instead of
+    a dict each.
+    """
+
+    PRESENT = 1
+    TITLE = 2
+    SAME_DESCRIPTION = 4
+
+    def __init__(self, english: dict):
+        self.keys = [sys.intern(f"{section}/{rel_path}") for section, files in english.items() for rel_path in files]
+        self.ids = {key: file_id for file_id, key in enumerate(self.keys)}
+        self.strings = [""]
+        self.string_ids = {"": 0}
+        count = len(self.keys)
+        self.flags = {lang: bytearray(count) for lang in LANGUAGES[1:]}
+        self.description_len = {lang: array("I", [0]) * count for lang in LANGUAGES[1:]}
+        self.status = {lang: array("I", [0]) * count for lang in LANGUAGES[1:]}
+        self.editorial_pass = {lang: array("I", [0]) * count for lang in LANGUAGES[1:]}
+
+    def string_id(self, value: str) -> int:
+        string_id = self.string_ids.get(value)
+        if string_id is None:
+            string_id = self.string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+    def set(self, lang: str, key: str, fact: Optional[dict]):
+        """Record the facts of one translation; None leaves it missing."""
+        if fact is None:
+            return
+        file_id = self.ids[key]
+        self.flags[lang][file_id] = (
+            self.PRESENT | (self.TITLE if fact["title"] else 0)
+            | (self.SAME_DESCRIPTION if fact["description_same"] else 0)
+        )
+        self.description_len[lang][file_id] = fact["description_len"]
+        self.status[lang][file_id] = self.string_id(fact["translation_status"])
+        self.editorial_pass[lang][file_id] = self.string_id(fact["editorial_pass"])
+
+    def get(self, lang: str, file_id: int) -> Optional[dict]:
+        """The facts of one translation in `translation_facts` form, None when missing."""
+        flags = self.flags[lang][file_id]
+        if not flags & self.PRESENT:
+            return None
+        return {
+            "title": bool(flags & self.TITLE),
+            "description_len": self.description_len[lang][file_id],
+            "description_same": bool(flags & self.SAME_DESCRIPTION),
+            "translation_status": self.strings[self.status[lang][file_id]],
+            "editorial_pass": self.strings[self.editorial_pass[lang][file_id]],
+        }
 
+    def to_json(self) -> dict:
+        """Language -> "section/path" -> facts, the shard document form."""
+        return {
+            lang: {key: self.get(lang, file_id) for file_id, key in enumerate(self.keys)}
+            for lang in LANGUAGES[1:]
+        }
+
+
+def translation_facts(english: dict) -> TranslationFacts:
+    """Per language, whether each English source is translated, and the facts
+    `assess_translation` judges it by."""
+    facts = TranslationFacts(english)
     for lang in LANGUAGES[1:]:  # Skip English
         lang_path = CONTENT_ROOT / lang
-        coverage[lang] = {
-            "total_files": 0,
+        for section, files in english.items():
+            for rel_path in files:
+                trans_path = lang_path / section / rel_path
+                if not trans_path.exists():
+                    continue
+                fm, _ = frontmatter_fields(read_text(trans_path))
+                description = fm["description"]
+                facts.set(lang, f"{section}/{rel_path}", {
+                    "title": bool(fm["title"]),
+                    "description_len": len(description),
+                    "description_same": bool(description) and description == files[rel_path]["description"],
+                    "translation_status": fm["translation_status"],
+                    "editorial_pass": fm["editorial_pass"],
+                })
+    return facts
+
+
+def get_translation_coverage(english: dict, db=None) -> dict:
+    """Calculate translation coverage for each language."""
+    if db is not None:
+        return summarize_coverage(english, translation_facts_db(english, db))
+    return summarize_coverage(english, translation_facts(english))
+
+
+def assess_translation(en_data: dict, translation: dict) -> tuple[bool, list[str]]:
+    """Whether a translation predates its source's latest editorial pass, and
+    the reasons it looks incomplete (none for a sound translation)."""
+    source_pass = en_data.get("editorial_pass") or ""
+    stale = bool(source_pass) and (translation["editorial_pass"] or "") < source_pass
+    reasons = []
+    status = translation["translation_status"]
+    if status in INCOMPLETE_STATUSES:
+        reasons.append(f"status {status}")
+    if not translation["title"]:
+        reasons.append("no title")
+    if not translation["description_len"]:
+        reasons.append("no description")
+    elif translation["description_same"]:
+        reasons.append("description in English")
+    return stale, reasons
+
+
+def record_translation(data: dict, section: str, rel_path: str, key: str, en_data: dict, translation: dict):
+    """Count an existing translation into a language's coverage and flag its issues."""
+    section_stats = data["sections"][section]
+    section_stats["translated"] += 1
+    data["translated_files"] += 1
+    if translation["title"]:
+        data["quality"]["with_title"] += 1
+    if translation["description_len"]:
+        data["quality"]["with_description"] += 1
+
+    stale, reasons = assess_translation(en_data, translation)
+    if stale:
+        section_stats["stale"].append({
+            "path": rel_path,
+            "title": en_data["title"],
+            "source_pass": en_data["editorial_pass"],
+            "translation_pass": translation["editorial_pass"],
+        })
+        data["stale"].append(key)
+    if reasons:
+        section_stats["suspicious"].append({"path": rel_path, "title": en_data["title"], "reasons": reasons})
+        data["suspicious"].append(key)
+
+
+def summarize_coverage(english: dict, facts: TranslationFacts) -> dict:
+    """Coverage statistics from `translation_facts`, in the order of `english`.
+
+    The "section/path" keys and the entries of missing sources are shared by
+    every language's lists rather than built once per language.
+    """
+    sources = []
+    for section, files in english.items():
+        for rel_path, en_data in files.items():
+            rel_path = str(rel_path)
+            missing = {"path": rel_path, "title": en_data["title"]}
+            sources.append((facts.ids[f"{section}/{rel_path}"], section, rel_path, en_data, missing))
+
+    coverage = {}
+    for lang in LANGUAGES[1:]:  # Skip English
+        data = coverage[lang] = {
+            "total_files": len(sources),
             "translated_files": 0,
-            "sections": {},
+            "sections": {
+                section: {"total": len(files), "translated": 0, "missing": [], "stale": [], "suspicious": []}
+                for section, files in english.items()
+            },
             "missing": [],
+            "stale": [],
+            "suspicious": [],
             "quality": {
                 "with_title": 0,
                 "with_description": 0,
@@ -114,48 +386,115 @@ def get_translation_coverage(english: dict) -> dict:
             }
         }
 
-        desc_lengths = []
-
-        for section, files in english.items():
-            section_stats = {
-                "total": len(files),
-                "translated": 0,
-                "missing": []
-            }
-
-            for rel_path, en_data in files.items():
-                coverage[lang]["total_files"] += 1
-                trans_path = lang_path / section / rel_path
-
-                if trans_path.exists():
-                    section_stats["translated"] += 1
-                    coverage[lang]["translated_files"] += 1
-
-                    # Check quality
-                    content = trans_path.read_text(encoding="utf-8")
-                    fm = parse_frontmatter(content)
-
-                    if fm.get("title"):
-                        coverage[lang]["quality"]["with_title"] += 1
-                    if fm.get("description"):
-                        coverage[lang]["quality"]["with_description"] += 1
-                        desc_lengths.append(len(fm["description"]))
-                else:
-                    section_stats["missing"].append({
-                        "path": str(rel_path),
-                        "title": en_data["title"]
-                    })
-                    coverage[lang]["missing"].append(f"{section}/{rel_path}")
-
-            coverage[lang]["sections"][section] = section_stats
+        for file_id, section, rel_path, en_data, missing in sources:
+            translation = facts.get(lang, file_id)
+            if translation is not None:
+                record_translation(data, section, rel_path, facts.keys[file_id], en_data, translation)
+            else:
+                data["sections"][section]["missing"].append(missing)
+                data["missing"].append(facts.keys[file_id])
 
-        if desc_lengths:
-            coverage[lang]["quality"]["avg_description_len"] = sum(desc_lengths) / len(desc_lengths)
+        lengths = [length for length in facts.description_len[lang] if length]
+        if lengths:
+            data["quality"]["avg_description_len"] = sum(lengths) / len(lengths)
 
     return coverage
 
 
-def print_terminal_report(english: dict, coverage: dict):
+def translation_facts_db(english: dict, db) -> TranslationFacts:
+    """`translation_facts` from the SQLite corpus index."""
+    facts = TranslationFacts(english)
+    for lang, section, key, _, translation_id, title, description, _, status, editorial_pass \
+            in coverage_rows(db, list(english)):
+        if translation_id is None or lang not in facts.flags:
+            continue
+        facts.set(lang, key, {
+            "title": bool(title),
+            "description_len": len(description or ""),
+            "description_same": bool(description) and description == english[section][key[len(section) + 1:]]["description"],
+            "translation_status": status or "",
+            "editorial_pass": editorial_pass or "",
+        })
+    return facts
+
+
+def history_counts(objects: GitObjects, root: Optional[str], memo: dict) -> dict:
+    """English sources per section and translations per language and section, in one commit's tree.
+
+    `memo` maps (English tree, translation tree) ids to counts, so directories
+    unchanged since an earlier commit are never compared twice.
+    """
+    counts = {"sources": {}, "translated": {lang: {} for lang in LANGUAGES[1:]}}
+    for section in SECTIONS:
+        source_tree = objects.subtree(root, section) if root else None
+        if source_tree is None:
+            continue
+        sources = [path for path in objects.files(source_tree)
+                   if path.endswith(".md") and path.rpartition("/")[2] != "README.md"]
+        counts["sources"][section] = len(sources)
+        for lang in LANGUAGES[1:]:
+            lang_tree = objects.subtree(root, f"{lang}/{section}")
+            key = (source_tree, lang_tree)
+            if key not in memo:
+                present = set(objects.files(lang_tree)) if lang_tree else set()
+                memo[key] = sum(path in present for path in sources)
+            counts["translated"][lang][section] = memo[key]
+    return counts
+
+
+def load_history_cache() -> dict:
+    """Per-commit counts from earlier runs, unless they were computed for other sections or languages."""
+    try:
+        cache = json.loads(HISTORY_CACHE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != HISTORY_CACHE_VERSION or cache.get("sections") != SECTIONS \
+            or cache.get("languages") != LANGUAGES:
+        return {}
+    return cache.get("commits", {})
+
+
+def get_history(since: Optional[str], every: str) -> list[dict]:
+    """Coverage counts at each sampled commit, oldest first, computing only commits not cached yet."""
+    with PROFILE.span("history: commits"):
+        history = commits(CONTENT_ROOT, since, every)
+        prefix = run_git(CONTENT_ROOT, "rev-parse", "--show-prefix").strip()
+    cached = load_history_cache()
+    missing = [commit for commit in history if commit.sha not in cached]
+    PROFILE.count("history: cached commits", len(history) - len(missing))
+    PROFILE.count("history: computed commits", len(missing))
+
+    if missing:
+        with PROFILE.span("history: trees"), GitObjects(CONTENT_ROOT) as objects:
+            memo = {}
+            for commit in missing:
+                root = objects.subtree(commit.tree, prefix)
+                cached[commit.sha] = history_counts(objects, root, memo)
+        HISTORY_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(HISTORY_CACHE, json.dumps({
+            "version": HISTORY_CACHE_VERSION,
+            "sections": SECTIONS,
+            "languages": LANGUAGES,
+            "commits": cached,
+        }))
+
+    points = []
+    for commit in history:
+        counts = cached[commit.sha]
+        total = sum(counts["sources"].values())
+        points.append({
+            "commit": commit.sha,
+            "date": commit.date.isoformat(),
+            **counts,
+            "coverage": {
+                lang: round(sum(sections.values()) / total * 100, 2) if total else 0
+                for lang, sections in counts["translated"].items()
+            },
+        })
+    return points
+
+
+def print_terminal_report(english: dict, coverage: dict, history: Optional[list[dict]] = None):
     """Print colored terminal report."""
     print("\n" + "=" * 70)
     print("  WHEEL OF HEAVEN - TRANSLATION COVERAGE DASHBOARD")
@@ -216,27 +555,85 @@ def print_terminal_report(english: dict, coverage: dict):
     print("\n  PRIORITY TRANSLATIONS (most needed):")
     print("  " + "-" * 66)
 
-    for lang in ["ko", "zh-Hant"]:  # Languages with lowest coverage
-        if lang in coverage:
-            print(f"\n  {LANGUAGE_NAMES[lang]} - Top 5 missing:")
-            for item in coverage[lang]["missing"][:5]:
-                print(f"    - {item}")
+    lowest = sorted(coverage, key=lambda lang: coverage[lang]["translated_files"] / max(coverage[lang]["total_files"], 1))
+    for lang in lowest[:2]:  # Languages with lowest coverage
+        print(f"\n  {LANGUAGE_NAMES[lang]} - Top 5 missing:")
+        for item in coverage[lang]["missing"][:5]:
+            print(f"    - {item}")
+
+    if history:
+        print(f"\n  COVERAGE OVER TIME ({len(history)} commits):")
+        print("  " + "-" * 66)
+        print(f"  {'Date':<11}{'Commit':<8}" + "".join(f"{lang:>7}" for lang in LANGUAGES[1:]))
+        for point in history:
+            row = "".join(f"{point['coverage'][lang]:>6.1f}%" for lang in LANGUAGES[1:])
+            print(f"  {point['date'][:10]:<11}{point['commit'][:7]:<8}{row}")
 
     print("\n" + "=" * 70 + "\n")
 
 
-def generate_html_report(english: dict, coverage: dict) -> str:
-    """Generate HTML dashboard report."""
-    total_en = sum(len(files) for files in english.values())
+def section_coverage(point: dict, lang: str, section: Optional[str] = None) -> float:
+    """Percent of English sources translated at one history point, overall or for one section."""
+    if section is None:
+        return point["coverage"][lang]
+    total = point["sources"].get(section, 0)
+    return point["translated"][lang].get(section, 0) / total * 100 if total else 0
 
-    html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Translation Coverage Dashboard - Wheel of Heaven</title>
-    <style>
-        :root {{
+
+def trend_chart(history: list[dict], section: Optional[str] = None) -> str:
+    """SVG line chart of coverage per language over the history points."""
+    width, height, pad = 800, 220, 36
+    times = [datetime.fromisoformat(point["date"]).timestamp() for point in history]
+    span = times[-1] - times[0]
+
+    def x(t: float) -> float:
+        return pad + (t - times[0]) / span * (width - 2 * pad) if span else width / 2
+
+    def y(pct: float) -> float:
+        return height - pad - pct / 100 * (height - 2 * pad)
+
+    svg = f'<svg viewBox="0 0 {width} {height}" class="trend" role="img">'
+    for pct in (0, 50, 100):
+        svg += (f'<line x1="{pad}" x2="{width - pad}" y1="{y(pct):.1f}" y2="{y(pct):.1f}" stroke="#333"/>'
+                f'<text x="{pad - 6}" y="{y(pct) + 4:.1f}" text-anchor="end">{pct}%</text>')
+    first, last = history[0]["date"][:10], history[-1]["date"][:10]
+    svg += f'<text x="{pad}" y="{height - 8}">{first}</text>'
+    if last != first:
+        svg += f'<text x="{width - pad}" y="{height - 8}" text-anchor="end">{last}</text>'
+
+    for lang in LANGUAGES[1:]:
+        coords = [(x(t), y(section_coverage(point, lang, section))) for t, point in zip(times, history)]
+        color = TREND_COLORS[lang]
+        if len(coords) > 1:
+            path = " ".join(f"{cx:.1f},{cy:.1f}" for cx, cy in coords)
+            svg += f'<polyline points="{path}" fill="none" stroke="{color}" stroke-width="2"><title>{lang}</title></polyline>'
+        else:
+            svg += f'<circle cx="{coords[0][0]:.1f}" cy="{coords[0][1]:.1f}" r="4" fill="{color}"><title>{lang}</title></circle>'
+    return svg + "</svg>"
+
+
+def trend_lines(history: list[dict]) -> Iterator[str]:
+    """The "Coverage over Time" part of the dashboard index."""
+    legend = "".join(
+        f'<span><i style="background: {TREND_COLORS[lang]};"></i>{LANGUAGE_NAMES[lang]}</span>'
+        for lang in LANGUAGES[1:]
+    )
+    yield f"""
+    <h2>Coverage over Time</h2>
+    <p class="muted">{len(history)} commits, {history[0]["date"][:10]} to {history[-1]["date"][:10]}</p>
+    <div class="legend">{legend}</div>
+    {trend_chart(history)}
+"""
+    for section in SECTIONS:
+        if any(section in point["sources"] for point in history):
+            yield f"""
+    <h3>{section}</h3>
+    {trend_chart(history, section)}
+"""
+
+
+STYLE = """
+        :root {
             --bg: #1a1a2e;
             --surface: #16213e;
             --text: #e4e4e4;
@@ -245,41 +642,43 @@ def generate_html_report(english: dict, coverage: dict) -> str:
             --success: #4ade80;
             --warning: #fbbf24;
             --error: #f87171;
-        }}
-        body {{
+        }
+        body {
             font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
             background: var(--bg);
             color: var(--text);
             padding: 2rem;
             max-width: 1200px;
             margin: 0 auto;
-        }}
-        h1, h2 {{ color: var(--accent); }}
-        .stats-grid {{
+        }
+        h1, h2 { color: var(--accent); }
+        a { color: inherit; }
+        .muted { color: var(--muted); }
+        .stats-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 1rem;
             margin: 2rem 0;
-        }}
-        .stat-card {{
+        }
+        .stat-card {
             background: var(--surface);
             padding: 1.5rem;
             border-radius: 12px;
-        }}
-        .stat-card h3 {{ margin: 0 0 0.5rem; font-size: 0.9rem; color: var(--muted); }}
-        .stat-card .value {{ font-size: 2rem; font-weight: bold; }}
-        .progress-bar {{
+        }
+        .stat-card h3 { margin: 0 0 0.5rem; font-size: 0.9rem; color: var(--muted); }
+        .stat-card .value { font-size: 2rem; font-weight: bold; }
+        .progress-bar {
             background: #333;
             border-radius: 8px;
             overflow: hidden;
             height: 24px;
             margin: 0.5rem 0;
-        }}
-        .progress-fill {{
+        }
+        .progress-fill {
             height: 100%;
             transition: width 0.3s;
-        }}
-        .lang-row {{
+        }
+        .lang-row {
             background: var(--surface);
             padding: 1rem;
             margin: 0.5rem 0;
@@ -287,34 +686,103 @@ def generate_html_report(english: dict, coverage: dict) -> str:
             display: flex;
             align-items: center;
             gap: 1rem;
-        }}
-        .lang-name {{ width: 150px; font-weight: bold; }}
-        .lang-progress {{ flex: 1; }}
-        .lang-stats {{ width: 100px; text-align: right; color: var(--muted); }}
-        table {{
+        }
+        .lang-name { width: 150px; font-weight: bold; }
+        .lang-progress { flex: 1; }
+        .lang-stats { width: 100px; text-align: right; color: var(--muted); }
+        .lang-issues { width: 220px; text-align: right; color: var(--muted); font-size: 0.9rem; }
+        table {
             width: 100%;
             border-collapse: collapse;
             margin: 1rem 0;
-        }}
-        th, td {{
+        }
+        th, td {
             padding: 0.75rem;
             text-align: left;
             border-bottom: 1px solid #333;
-        }}
-        th {{ color: var(--muted); font-weight: normal; }}
-        .high {{ color: var(--success); }}
-        .medium {{ color: var(--warning); }}
-        .low {{ color: var(--error); }}
-    </style>
+        }
+        th { color: var(--muted); font-weight: normal; }
+        .high { color: var(--success); }
+        .medium { color: var(--warning); }
+        .low { color: var(--error); }
+        .trend { width: 100%; background: var(--surface); border-radius: 8px; }
+        .trend text { fill: var(--muted); font-size: 11px; }
+        .legend { display: flex; flex-wrap: wrap; gap: 1rem; margin: 0.5rem 0; color: var(--muted); }
+        .legend i { display: inline-block; width: 12px; height: 12px; border-radius: 2px; margin-right: 0.4rem; }
+"""
+
+# Bump when the templates change, so every page of a dashboard site is rewritten
+TEMPLATE_VERSION = 1
+DASHBOARD_MANIFEST = ".dashboard.json"
+DEFAULT_HTML_DIR = CONTENT_ROOT / "build" / "i18n-dashboard"
+SITE_URL = "https://www.wheelofheaven.world"
+
+ISSUES = ("missing", "stale", "suspicious")
+
+
+def percent(done: int, total: int) -> float:
+    return done / total * 100 if total > 0 else 0
+
+
+LEVEL_COLORS = {"high": "var(--success)", "medium": "var(--warning)", "low": "var(--error)"}
+
+
+def level(pct: float) -> str:
+    if pct >= 80:
+        return "high"
+    if pct >= 50:
+        return "medium"
+    return "low"
+
+
+def page_template(title: str, body: Iterable[str], root: str = "") -> Iterator[str]:
+    """A dashboard page around the chunks of `body`; `root` leads back to the index."""
+    yield f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{escape(title)} - Wheel of Heaven</title>
+    <style>{STYLE}    </style>
 </head>
 <body>
-    <h1>Translation Coverage Dashboard</h1>
-    <p style="color: var(--muted);">Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
+"""
+    if root:
+        yield f'    <p class="muted"><a href="{root}index.html">Translation Coverage Dashboard</a></p>\n'
+    yield f"    <h1>{escape(title)}</h1>\n"
+    yield from body
+    yield "</body>\n</html>\n"
+
+
+def index_data(english: dict, coverage: dict, history: Optional[list[dict]] = None) -> dict:
+    """Everything the dashboard index shows."""
+    return {
+        "source_files": sum(len(files) for files in english.values()),
+        "sections": [section for section in SECTIONS if section in english],
+        "languages": {
+            lang: {
+                "translated": coverage[lang]["translated_files"],
+                "total": coverage[lang]["total_files"],
+                **{issue: len(coverage[lang][issue]) for issue in ISSUES},
+                "sections": {
+                    section: [stats["translated"], stats["total"]]
+                    for section, stats in coverage[lang]["sections"].items()
+                },
+            }
+            for lang in LANGUAGES[1:]
+        },
+        "history": history or [],
+    }
 
+
+def index_body(data: dict, linked: bool = True) -> Iterator[str]:
+    """The index: totals, a bar per language and the section matrix, linking
+    to the drill-down pages when `linked`."""
+    yield f"""
     <div class="stats-grid">
         <div class="stat-card">
             <h3>Source Files</h3>
-            <div class="value">{total_en}</div>
+            <div class="value">{data["source_files"]}</div>
         </div>
         <div class="stat-card">
             <h3>Languages</h3>
@@ -322,92 +790,325 @@ def generate_html_report(english: dict, coverage: dict) -> str:
         </div>
         <div class="stat-card">
             <h3>Sections</h3>
-            <div class="value">{len(english)}</div>
+            <div class="value">{len(data["sections"])}</div>
         </div>
     </div>
 
     <h2>Coverage by Language</h2>
 """
-
-    for lang in LANGUAGES[1:]:
-        data = coverage[lang]
-        pct = (data["translated_files"] / data["total_files"] * 100) if data["total_files"] > 0 else 0
-
-        if pct >= 80:
-            color = "var(--success)"
-            status = "high"
-        elif pct >= 50:
-            color = "var(--warning)"
-            status = "medium"
-        else:
-            color = "var(--error)"
-            status = "low"
-
-        html += f"""
+    for lang, stats in data["languages"].items():
+        pct = percent(stats["translated"], stats["total"])
+        status = level(pct)
+        name = LANGUAGE_NAMES[lang]
+        if linked:
+            name = f'<a href="languages/{lang}.html">{name}</a>'
+        issues = ", ".join(f"{stats[issue]} {issue}" for issue in ISSUES)
+        yield f"""
     <div class="lang-row">
-        <div class="lang-name">{LANGUAGE_NAMES[lang]}</div>
+        <div class="lang-name">{name}</div>
         <div class="lang-progress">
             <div class="progress-bar">
-                <div class="progress-fill" style="width: {pct}%; background: {color};"></div>
+                <div class="progress-fill" style="width: {pct}%; background: {LEVEL_COLORS[status]};"></div>
             </div>
         </div>
-        <div class="lang-stats {status}">{data['translated_files']}/{data['total_files']} ({pct:.1f}%)</div>
+        <div class="lang-stats {status}">{stats["translated"]}/{stats["total"]} ({pct:.1f}%)</div>
+        <div class="lang-issues">{issues}</div>
     </div>
 """
 
-    html += """
+    if data["history"]:
+        yield from trend_lines(data["history"])
+
+    yield """
     <h2>Coverage by Section</h2>
     <table>
-        <tr>
-            <th>Section</th>
+        <tr><th>Section</th>"""
+    yield "".join(f"<th>{lang}</th>" for lang in data["languages"])
+    yield "</tr>\n"
+    for section in data["sections"]:
+        name = f'<a href="sections/{section}.html">{section}</a>' if linked else section
+        yield f"        <tr><td><strong>{name}</strong></td>"
+        for stats in data["languages"].values():
+            if section in stats["sections"]:
+                pct = percent(*stats["sections"][section])
+                yield f'<td class="{level(pct)}">{pct:.0f}%</td>'
+            else:
+                yield "<td>-</td>"
+        yield "</tr>\n"
+    yield "    </table>\n"
+
+
+def source_link(url: str, title: str, lang: str = "") -> str:
+    """A link to the published page of an English source, or of its `lang` translation."""
+    prefix = f"/{lang}" if lang else ""
+    return f'<a href="{escape(SITE_URL + prefix + url)}">{escape(title or url)}</a>'
+
+
+def language_data(lang: str, english: dict, coverage: dict) -> dict:
+    """A language's quality metrics and, per section, its files with issues."""
+    data = coverage[lang]
+    sections = {}
+    for section, stats in data["sections"].items():
+        sections[section] = {
+            "translated": stats["translated"],
+            "total": stats["total"],
+            **{
+                issue: [{**item, "url": english[section][item["path"]]["url"]} for item in stats[issue]]
+                for issue in ISSUES
+            },
+        }
+    return {
+        "lang": lang,
+        "translated": data["translated_files"],
+        "total": data["total_files"],
+        "quality": data["quality"],
+        "sections": sections,
+    }
+
+
+def language_body(data: dict) -> Iterator[str]:
+    lang = data["lang"]
+    quality = data["quality"]
+    pct = percent(data["translated"], data["total"])
+    yield f"""
+    <div class="stats-grid">
+        <div class="stat-card">
+            <h3>Translated</h3>
+            <div class="value {level(pct)}">{data["translated"]}/{data["total"]}</div>
+        </div>
+        <div class="stat-card">
+            <h3>With Title</h3>
+            <div class="value">{quality["with_title"]}</div>
+        </div>
+        <div class="stat-card">
+            <h3>With Description</h3>
+            <div class="value">{quality["with_description"]}</div>
+        </div>
+        <div class="stat-card">
+            <h3>Average Description</h3>
+            <div class="value">{quality["avg_description_len"]:.0f} chars</div>
+        </div>
+    </div>
 """
-
+    for section, stats in data["sections"].items():
+        yield (f'\n    <h2><a href="../sections/{section}.html">{section}</a></h2>\n'
+               f'    <p class="muted">{stats["translated"]}/{stats["total"]} translated, '
+               + ", ".join(f"{len(stats[issue])} {issue}" for issue in ISSUES) + "</p>\n")
+        if stats["missing"]:
+            yield "    <h3>Missing</h3>\n    <table>\n"
+            for item in stats["missing"]:
+                yield (f"        <tr><td>{source_link(item['url'], item['title'])}</td>"
+                       f"<td class=\"muted\">{escape(item['path'])}</td></tr>\n")
+            yield "    </table>\n"
+        if stats["stale"]:
+            yield "    <h3>Stale</h3>\n    <table>\n        <tr><th>Page</th><th>Source pass</th><th>Translation pass</th></tr>\n"
+            for item in stats["stale"]:
+                yield (f"        <tr><td>{source_link(item['url'], item['title'], lang)}</td>"
+                       f"<td>{escape(item['source_pass'])}</td><td>{escape(item['translation_pass'] or '-')}</td></tr>\n")
+            yield "    </table>\n"
+        if stats["suspicious"]:
+            yield "    <h3>Suspicious</h3>\n    <table>\n"
+            for item in stats["suspicious"]:
+                yield (f"        <tr><td>{source_link(item['url'], item['title'], lang)}</td>"
+                       f"<td>{escape(', '.join(item['reasons']))}</td></tr>\n")
+            yield "    </table>\n"
+
+
+def section_data(section: str, english: dict, coverage: dict) -> dict:
+    """A section's coverage per language and its files with issues in any language."""
+    issues: dict[str, dict[str, list[str]]] = {}
     for lang in LANGUAGES[1:]:
-        html += f"<th>{lang}</th>"
-
-    html += "</tr>"
-
-    for section in SECTIONS:
-        if section not in english:
+        stats = coverage[lang]["sections"].get(section)
+        if stats is None:
             continue
-        html += f"<tr><td><strong>{section}</strong></td>"
-
-        for lang in LANGUAGES[1:]:
-            if section in coverage[lang]["sections"]:
-                sect = coverage[lang]["sections"][section]
-                pct = (sect["translated"] / sect["total"] * 100) if sect["total"] > 0 else 0
-
-                if pct >= 80:
-                    cls = "high"
-                elif pct >= 50:
-                    cls = "medium"
-                else:
-                    cls = "low"
-
-                html += f'<td class="{cls}">{pct:.0f}%</td>'
+        for item in stats["missing"]:
+            issues.setdefault(item["path"], {}).setdefault(lang, []).append("missing")
+        for item in stats["stale"]:
+            issues.setdefault(item["path"], {}).setdefault(lang, []).append(
+                f"stale: {item['translation_pass'] or 'no pass'} < {item['source_pass']}")
+        for item in stats["suspicious"]:
+            issues.setdefault(item["path"], {}).setdefault(lang, []).append("suspicious: " + ", ".join(item["reasons"]))
+    files = english.get(section, {})
+    return {
+        "section": section,
+        "languages": {
+            lang: [coverage[lang]["sections"][section]["translated"], coverage[lang]["sections"][section]["total"]]
+            for lang in LANGUAGES[1:] if section in coverage[lang]["sections"]
+        },
+        "files": [
+            {"path": rel_path, "title": files[rel_path]["title"], "url": files[rel_path]["url"], "issues": issues[rel_path]}
+            for rel_path in files if rel_path in issues
+        ],
+    }
+
+
+def section_body(data: dict) -> Iterator[str]:
+    languages = data["languages"]
+    yield "\n    <table>\n        <tr><th></th>"
+    yield "".join(f'<th><a href="../languages/{lang}.html">{lang}</a></th>' for lang in languages)
+    yield "</tr>\n        <tr><td>Coverage</td>"
+    for translated, total in languages.values():
+        pct = percent(translated, total)
+        yield f'<td class="{level(pct)}">{pct:.0f}%</td>'
+    yield "</tr>\n    </table>\n"
+
+    yield f'\n    <h2>Files with Issues</h2>\n    <p class="muted">{len(data["files"])} files</p>\n    <table>\n'
+    yield "        <tr><th>Page</th>" + "".join(f"<th>{lang}</th>" for lang in languages) + "</tr>\n"
+    for item in data["files"]:
+        yield f"        <tr><td>{source_link(item['url'], item['title'])}</td>"
+        for lang in languages:
+            issues = item["issues"].get(lang)
+            if issues is None:
+                yield '<td class="high">✓</td>'
+            elif issues == ["missing"]:
+                yield '<td class="low">missing</td>'
             else:
-                html += "<td>-</td>"
-
-        html += "</tr>"
-
-    html += """
-    </table>
-</body>
-</html>
-"""
+                kinds = [issue.split(":", 1)[0] for issue in issues]
+                cls = "medium" if kinds == ["stale"] else "low"
+                yield (f'<td class="{cls}"><a href="{escape(SITE_URL + "/" + lang + item["url"])}"'
+                       f' title="{escape("; ".join(issues))}">{", ".join(kinds)}</a></td>')
+        yield "</tr>\n"
+    yield "    </table>\n"
+
+
+def dashboard_pages(english: dict, coverage: dict, history: Optional[list[dict]] = None) -> dict:
+    """Site path -> (title, body template, root, data) for every dashboard page."""
+    pages = {"index.html": ("Translation Coverage Dashboard", index_body, "",
+                            index_data(english, coverage, history))}
+    for lang in LANGUAGES[1:]:
+        pages[f"languages/{lang}.html"] = (f"{LANGUAGE_NAMES[lang]} ({lang})", language_body, "../",
+                                           language_data(lang, english, coverage))
+    for section in SECTIONS:
+        if section in english:
+            pages[f"sections/{section}.html"] = (f"Section: {section}", section_body, "../",
+                                                 section_data(section, english, coverage))
+    return pages
+
+
+def page_hash(title: str, data: dict) -> str:
+    payload = json.dumps([TEMPLATE_VERSION, title, data], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def write_dashboard(out: Path, pages: dict) -> tuple[list[str], list[str]]:
+    """Stream each page whose data changed since the last run into `out`; return
+    the pages written and the pages removed."""
+    out.mkdir(parents=True, exist_ok=True)
+    manifest_path = out / DASHBOARD_MANIFEST
+    try:
+        previous = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = {}
+
+    hashes = {}
+    written = []
+    for name, (title, body, root, data) in pages.items():
+        hashes[name] = page_hash(title, data)
+        target = out / name
+        if previous.get(name) == hashes[name] and target.exists():
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as handle:
+                for chunk in page_template(title, body(data), root):
+                    handle.write(chunk)
+            os.replace(tmp, target)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        written.append(name)
+
+    removed = [name for name in previous if name not in hashes]
+    for name in removed:
+        (out / name).unlink(missing_ok=True)
+    write_if_changed(manifest_path, json.dumps(hashes, indent=2, sort_keys=True).encode("utf-8"))
+    return written, removed
+
+
+def source_sizes(sources: dict[str, list[Path]]) -> dict[str, int]:
+    """Bytes per "section/path" unit: the English source plus its translations."""
+    sizes = {}
+    for section, files in sources.items():
+        for md_file in files:
+            rel_path = md_file.relative_to(CONTENT_ROOT / section)
+            paths = [md_file] + [CONTENT_ROOT / lang / section / rel_path for lang in LANGUAGES[1:]]
+            sizes[f"{section}/{rel_path}"] = sum(path.stat().st_size for path in paths if path.exists())
+    return sizes
+
+
+def run_shard(index: int, count: int, target: str):
+    """Read one shard's English sources and translations and write what merge-reports needs."""
+    sources = english_sources()
+    sizes = source_sizes(sources)
+    assignment = assign_shards(sizes, count)
+    order = {name: position for position, name in enumerate(sizes) if assignment[name] == index - 1}
+    only = {
+        md_file for section, files in sources.items() for md_file in files
+        if f"{section}/{md_file.relative_to(CONTENT_ROOT / section)}" in order
+    }
+
+    with PROFILE.span("english sources"):
+        english = get_english_content(only=only)
+    with PROFILE.span("translations"):
+        facts = translation_facts(english)
+    write_shard({
+        "kind": "i18n",
+        "shard": [index, count],
+        "tree": tree_fingerprint(sizes),
+        "order": order,
+        "english": english,
+        "translations": facts.to_json(),
+    }, target)
+
+
+def merge_shards(documents: list[dict]) -> tuple[dict, dict]:
+    """Rebuild the English sources, in path order, and the coverage of the whole tree."""
+    order = {name: position for document in documents for name, position in document["order"].items()}
+    entries = sorted(
+        (order[f"{section}/{rel_path}"], section, rel_path, data)
+        for document in documents
+        for section, files in document["english"].items()
+        for rel_path, data in files.items()
+    )
+    english = {section: {} for section in SECTIONS if any(section in document["english"] for document in documents)}
+    for _, section, rel_path, data in entries:
+        english[section][rel_path] = data
+
+    facts = TranslationFacts(english)
+    for document in documents:
+        for lang, translations in document["translations"].items():
+            for key, fact in translations.items():
+                facts.set(lang, key, fact)
+    return english, summarize_coverage(english, facts)
+
+
+def run_merge(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="i18n_dashboard.py merge-reports",
+                                     description="Combine --shard outputs into one dashboard")
+    parser.add_argument("shards", nargs="+", type=Path, help="Shard documents, one per shard")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--html", action="store_true", help="Output as HTML")
+    add_html_dir_argument(parser)
+    args = parser.parse_args(argv)
+    try:
+        documents = load_shards(args.shards, "i18n")
+    except ValueError as e:
+        parser.error(str(e))
 
-    return html
+    english, coverage = merge_shards(documents)
+    print_report(args, english, coverage)
+    return 0
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Translation coverage dashboard")
-    parser.add_argument("--json", action="store_true", help="Output as JSON")
-    parser.add_argument("--html", action="store_true", help="Output as HTML")
-    args = parser.parse_args()
+def add_html_dir_argument(parser: argparse.ArgumentParser):
+    parser.add_argument("--html-dir", type=Path, nargs="?", const=DEFAULT_HTML_DIR, metavar="DIR",
+                        help="Write the multi-page dashboard, rewriting only pages whose data changed"
+                             " (default: build/i18n-dashboard)")
 
-    english = get_english_content()
-    coverage = get_translation_coverage(english)
 
+def print_report(args: argparse.Namespace, english: dict, coverage: dict, profile: Optional[dict] = None,
+                 history: Optional[list[dict]] = None):
     if args.json:
         result = {
             "generated": datetime.now().isoformat(),
@@ -415,11 +1116,78 @@ def main():
             "languages": LANGUAGE_NAMES,
             "coverage": coverage
         }
+        if history is not None:
+            result["history"] = history
+        if profile:
+            result["profile"] = profile
         print(json.dumps(result, indent=2))
+    elif args.html_dir:
+        written, removed = write_dashboard(args.html_dir, dashboard_pages(english, coverage, history))
+        print(f"{args.html_dir}: {len(written)} pages written, {len(removed)} removed")
+        for name in written:
+            print(f"  {name}")
+        if profile:
+            print(format_report(profile))
     elif args.html:
-        print(generate_html_report(english, coverage))
+        title, body, root, data = dashboard_pages(english, coverage, history)["index.html"]
+        for chunk in page_template(title, body(data, linked=False), root):
+            sys.stdout.write(chunk)
+        if profile:
+            print(format_report(profile), file=sys.stderr)
     else:
-        print_terminal_report(english, coverage)
+        print_terminal_report(english, coverage, history)
+        if profile:
+            print(format_report(profile))
+
+
+def main():
+    if sys.argv[1:2] == ["merge-reports"]:
+        sys.exit(run_merge(sys.argv[2:]))
+
+    parser = argparse.ArgumentParser(description="Translation coverage dashboard",
+                                     epilog="Run 'i18n_dashboard.py merge-reports SHARD...' to combine --shard outputs.")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--html", action="store_true", help="Output as HTML")
+    add_html_dir_argument(parser)
+    parser.add_argument("--db", action="store_true", help="Read from the SQLite corpus index")
+    history = parser.add_argument_group("history")
+    history.add_argument("--history", action="store_true",
+                         help="Add coverage per commit, read from git without checking anything out")
+    history.add_argument("--since", default=DEFAULT_HISTORY_SINCE, metavar="DATE",
+                         help=f"Oldest commit date for --history, in any git date format (default: {DEFAULT_HISTORY_SINCE})")
+    history.add_argument("--every", choices=EVERY, default="commit",
+                         help="Sample one commit per period for --history (default: every commit)")
+    add_shard_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    if args.shard and args.db:
+        parser.error("--shard reads the files themselves and cannot be combined with --db")
+    if args.shard and args.history:
+        parser.error("--history covers the whole tree and cannot be combined with --shard")
+    start_profile(args)
+
+    if args.shard:
+        run_shard(*args.shard, args.shard_output)
+        profile = finish_profile(args)
+        if profile:
+            print(format_report(profile), file=sys.stderr)
+        return
+
+    db = None
+    if args.db:
+        with PROFILE.span("index update"):
+            db = open_index()
+    with PROFILE.span("english sources"):
+        english = get_english_content(db)
+    with PROFILE.span("coverage"):
+        coverage = get_translation_coverage(english, db)
+    history = None
+    if args.history:
+        try:
+            history = get_history(args.since, args.every)
+        except (OSError, subprocess.CalledProcessError) as e:
+            parser.error(f"--history needs git and a git checkout: {getattr(e, 'stderr', None) or e}")
+    print_report(args, english, coverage, finish_profile(args), history)
 
 
 if __name__ == "__main__":
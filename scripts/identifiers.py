@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""External identifier index for `same_as` links.
+
+Wiki and library pages declare their Wikidata, VIAF and Wikipedia counterparts
+in `extra.same_as`. The structured-data output and the content graph emit one
+entity per page, so two pages claiming the same identifier become duplicate
+entities. This index keys every page by its normalized identifiers and reports:
+
+- identifiers claimed by more than one page of the same language
+- translations whose identifiers differ from their English source
+
+Usage:
+    python scripts/identifiers.py            # report conflicts
+    python scripts/identifiers.py --json     # identifier -> pages as JSON
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from collections import defaultdict
+from typing import Optional
+from urllib.parse import unquote, urlsplit
+
+from corpus import DEFAULT_LANGUAGE, Page, scan
+
+WIKIDATA_ID = re.compile(r"^/(?:wiki|entity)/(?:Special:EntityPage/)?(Q\d+)$", re.IGNORECASE)
+VIAF_ID = re.compile(r"^/viaf/(\d+)")
+
+
+def normalize_identifier(value: str) -> Optional[str]:
+    """Reduce a `same_as` URL to a canonical key such as "wikidata:Q868915"."""
+    value = value.strip()
+    if re.fullmatch(r"Q\d+", value, re.IGNORECASE):
+        return f"wikidata:{value.upper()}"
+
+    parts = urlsplit(value)
+    host = parts.netloc.lower().removeprefix("www.").removeprefix("m.")
+    path = parts.path.rstrip("/")
+    if not host:
+        return None
+
+    if host == "wikidata.org":
+        match = WIKIDATA_ID.match(path)
+        return f"wikidata:{match.group(1).upper()}" if match else None
+    if host == "viaf.org":
+        match = VIAF_ID.match(path)
+        return f"viaf:{match.group(1)}" if match else None
+    if host.endswith(".wikipedia.org") and path.startswith("/wiki/"):
+        lang = host.split(".")[0]
+        title = unquote(path[len("/wiki/"):]).replace("_", " ").strip()
+        if not title:
+            return None
+        # MediaWiki titles are case-insensitive in their first character only
+        return f"wikipedia:{lang}:{title[0].upper()}{title[1:]}"
+    return f"url:{host}{path.lower()}"
+
+
+def page_identifiers(page: Page) -> set[str]:
+    same_as = page.extra.get("same_as")
+    if not isinstance(same_as, list):
+        return set()
+    return {key for key in map(normalize_identifier, filter(None, same_as)) if key}
+
+
+class IdentifierIndex:
+    """Normalized identifier -> pages, per language."""
+
+    def __init__(self):
+        self.owners: dict[tuple[str, str], list[Page]] = defaultdict(list)
+        self.by_page: dict[tuple[str, str], tuple[Page, set[str]]] = {}
+
+    def add(self, page: Page):
+        identifiers = page_identifiers(page)
+        self.by_page[page.lang, page.key] = (page, identifiers)
+        for identifier in identifiers:
+            self.owners[page.lang, identifier].append(page)
+
+    def conflicts(self):
+        """Yield (language, identifier, pages) for identifiers with several owners."""
+        for (lang, identifier), pages in sorted(self.owners.items(), key=lambda item: item[0]):
+            if len(pages) > 1:
+                yield lang, identifier, pages
+
+    def translation_drift(self):
+        """Yield (page, missing, extra) for translations that differ from English."""
+        for (lang, key), (page, identifiers) in self.by_page.items():
+            if lang == DEFAULT_LANGUAGE:
+                continue
+            source = self.by_page.get((DEFAULT_LANGUAGE, key))
+            if source is None or source[1] == identifiers:
+                continue
+            yield page, sorted(source[1] - identifiers), sorted(identifiers - source[1])
+
+
+def build_identifier_index(pages: list[Page]) -> IdentifierIndex:
+    """Index the `same_as` identifiers of all pages in one pass."""
+    index = IdentifierIndex()
+    for page in pages:
+        index.add(page)
+    return index
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check same_as identifiers for duplicates")
+    parser.add_argument("--json", action="store_true", help="Output identifier -> pages as JSON")
+    args = parser.parse_args()
+
+    index = build_identifier_index(scan())
+    conflicts = list(index.conflicts())
+
+    if args.json:
+        result = {
+            "identifiers": {
+                f"{lang}/{identifier}": [page.rel for page in pages]
+                for (lang, identifier), pages in sorted(index.owners.items())
+            },
+            "conflicts": [
+                {"lang": lang, "identifier": identifier, "files": [page.rel for page in pages]}
+                for lang, identifier, pages in conflicts
+            ],
+            "translation_drift": [
+                {"file": page.rel, "missing": missing, "extra": extra}
+                for page, missing, extra in index.translation_drift()
+            ],
+        }
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        for lang, identifier, pages in conflicts:
+            print(f"{identifier} ({lang}): " + ", ".join(page.rel for page in pages))
+        print(f"{len(index.owners)} identifiers, {len(conflicts)} claimed by several pages")
+
+    return 1 if conflicts else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Suggest and apply fixes for broken internal links.
+
+Every URL in the namespace index (canonical paths, slug paths and aliases) is
+split into its last path segment and indexed by character trigrams, one index
+per language. A broken link only scores the pages of a compatible length that
+share one of the rarest trigrams of its own last segment, so suggestions never
+scan the whole namespace.
+
+A fix is applied only when the best target is similar enough on its own (the
+same-directory bonus only ranks), clearly ahead of the runner-up and in the
+broken link's section; a target in another section stays a suggestion. Links
+are rewritten by their token spans, never inside code or shortcode arguments.
+
+Usage (via validate.py):
+    python scripts/validate.py --fix --dry-run    # show the diff
+    python scripts/validate.py --fix              # rewrite unambiguous links
+"""
+
+from __future__ import annotations
+
+import difflib
+import heapq
+import math
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional
+
+from corpus import TRANSLATIONS, Page, atomic_write, frontmatter_span
+from markdown_tokens import links, url_span
+from namespace import Namespace
+
+# A suggestion is applied only when it is this similar to the broken target...
+MIN_SCORE = 0.75
+# ...and clearly better than the runner-up.
+MIN_MARGIN = 0.1
+# Trigrams shared by more than this share of an index carry no signal.
+STOP_GRAM_RATIO = 0.25
+# Language directories as they appear in normalized URLs
+LANGUAGE_PREFIXES = frozenset(lang.lower() for lang in TRANSLATIONS)
+# Ranking bonus of a target in the broken link's own directory
+SAME_PARENT_BONUS = 0.05
+# Nothing below this can be suggested or be the runner-up of a suggestion
+SEARCH_FLOOR = MIN_SCORE - MIN_MARGIN - SAME_PARENT_BONUS
+
+
+def trigrams(term: str) -> set[str]:
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def last_segment(url: str) -> str:
+    return url.rstrip("/").rsplit("/", 1)[-1]
+
+
+def parent_of(url: str) -> str:
+    return url.rstrip("/").rsplit("/", 1)[0] + "/"
+
+
+def section_of(url: str) -> str:
+    """First path segment below the language prefix, e.g. "wiki" for "/de/wiki/x/"."""
+    parts = url.strip("/").split("/")
+    if len(parts) > 1 and parts[0] in LANGUAGE_PREFIXES:
+        parts = parts[1:]
+    return parts[0] if len(parts) > 1 else ""
+
+
+class TrigramIndex:
+    """Inverted index of character trigrams -> term ids, scored by Dice overlap.
+
+    A search only reads the postings it must: with a score floor, a term of
+    the wrong size can never reach it, and a term that reaches it shares at
+    least one of the query's rarest trigrams. Postings are kept sorted by
+    term size, so both filters cut the candidates before any is scored, and
+    each term keeps its trigrams as a tuple of small gram ids to score them.
+    """
+
+    def __init__(self):
+        self.terms: list[str] = []
+        self.values: list = []
+        self.sizes: list[int] = []
+        self.grams: list[tuple[int, ...]] = []
+        self.gram_ids: dict[str, int] = {}
+        self.postings: dict[str, list[int]] = defaultdict(list)
+        self.unsorted = False
+
+    def add(self, term: str, value):
+        term_id = len(self.terms)
+        grams = trigrams(term)
+        self.terms.append(term)
+        self.values.append(value)
+        self.sizes.append(len(grams))
+        self.grams.append(tuple(self.gram_ids.setdefault(gram, len(self.gram_ids)) for gram in grams))
+        for gram in grams:
+            self.postings[gram].append(term_id)
+        self.unsorted = True
+
+    def search(self, term: str, limit: int = 5, floor: float = 0.0) -> list[tuple[float, str, object]]:
+        """Return up to `limit` (score, term, value) hits scoring at least `floor`, best first."""
+        if self.unsorted:
+            for posting in self.postings.values():
+                posting.sort(key=self.sizes.__getitem__)
+            self.unsorted = False
+        grams = trigrams(term)
+        size = len(grams)
+        # Dice = 2 * shared / (size + other) >= floor bounds the other size and the shared count
+        floor = max(floor, 1e-9)
+        smallest = math.ceil(floor * size / (2 - floor))
+        largest = math.floor((2 - floor) * size / floor)
+        needed = max(1, math.ceil(floor * (size + smallest) / 2))
+        # A term sharing `needed` grams shares one of any `size - needed + 1` of them: read the rarest
+        stop = max(8, int(len(self.terms) * STOP_GRAM_RATIO))
+        rarest = sorted(grams, key=lambda gram: len(self.postings.get(gram, ())))[: size - needed + 1]
+        candidates: set[int] = set()
+        for gram in rarest:
+            posting = self.postings.get(gram)
+            if not posting or len(posting) > stop:
+                continue
+            low = bisect_left(posting, smallest, key=self.sizes.__getitem__)
+            high = bisect_right(posting, largest, key=self.sizes.__getitem__)
+            candidates.update(posting[low:high])
+        known = {self.gram_ids[gram] for gram in grams if gram in self.gram_ids}
+        hits = []
+        for term_id in candidates:
+            score = 2 * len(known.intersection(self.grams[term_id])) / (size + self.sizes[term_id])
+            if score >= floor:
+                hits.append((score, self.terms[term_id], self.values[term_id]))
+        return heapq.nsmallest(limit, hits, key=lambda hit: (-hit[0], hit[1]))
+
+
+@dataclass
+class Suggestion:
+    url: str
+    score: float
+    unambiguous: bool
+
+
+class LinkSuggester:
+    """Nearest valid target for broken links, one trigram index per language."""
+
+    def __init__(self, namespace: Namespace):
+        self.indexes: dict[str, TrigramIndex] = defaultdict(TrigramIndex)
+        for url, entry in namespace.entries.items():
+            self.indexes[entry.lang].add(last_segment(url), (url, entry.page.url))
+        self.cache: dict[tuple[str, str], Optional[Suggestion]] = {}
+
+    def suggest(self, lang: str, target: str) -> Optional[Suggestion]:
+        key = (lang, target)
+        if key not in self.cache:
+            self.cache[key] = self._suggest(lang, target)
+        return self.cache[key]
+
+    def _suggest(self, lang: str, target: str) -> Optional[Suggestion]:
+        index = self.indexes.get(lang)
+        if index is None:
+            return None
+        # Several URLs (alias, slug path) can lead to one page; keep its best (rank, score)
+        best: dict[str, tuple[float, float]] = {}
+        for score, _, (url, canonical) in index.search(last_segment(target), limit=20, floor=SEARCH_FLOOR):
+            rank = score + (SAME_PARENT_BONUS if parent_of(url) == parent_of(target) else 0.0)
+            best[canonical] = max((rank, score), best.get(canonical, (0.0, 0.0)))
+        if not best:
+            return None
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], item[0]))
+        url, (rank, score) = ranked[0]
+        runner_up = ranked[1][1][0] if len(ranked) > 1 else 0.0
+        # Another section is a different page however alike the names: suggest it, never apply it
+        unambiguous = score >= MIN_SCORE and rank - runner_up >= MIN_MARGIN and section_of(url) == section_of(target)
+        return Suggestion(url, score, unambiguous)
+
+
+def plan_fixes(broken, suggester: LinkSuggester) -> dict[Page, dict[str, str]]:
+    """Map each page to {old link: new link} for the unambiguous suggestions."""
+    fixes: dict[Page, dict[str, str]] = defaultdict(dict)
+    for page, kind, link_url, target in broken:
+        if target is None:
+            continue
+        suggestion = suggester.suggest(page.lang, target)
+        if suggestion and suggestion.unambiguous:
+            _, hash_sign, fragment = link_url.partition("#")
+            fixes[page][link_url] = suggestion.url + hash_sign + fragment
+    return fixes
+
+
+def rewrite_links(content: str, replacements: dict[str, str]) -> str:
+    """Replace the targets of the body's `[text](old)` links, leaving the
+    frontmatter, code and shortcode arguments alone."""
+    span = frontmatter_span(content)
+    start = span[1] if span else 0
+    head, body = content[:start], content[start:]
+    parts = []
+    position = 0
+    for link in links(body):
+        new = replacements.get(link.url)
+        if new is None:
+            continue
+        url_start, url_end = url_span(body, link)
+        parts += [body[position:url_start], new]
+        position = url_end
+    return head + "".join(parts) + body[position:]
+
+
+def apply_fixes(fixes: dict[Page, dict[str, str]], dry_run: bool = False) -> list[str]:
+    """Rewrite each page once; return a unified diff of all changes."""
+    diff: list[str] = []
+    for page in sorted(fixes, key=lambda page: page.rel):
+        original = page.path.read_text(encoding="utf-8")
+        updated = rewrite_links(original, fixes[page])
+        if updated == original:
+            continue
+        diff.extend(difflib.unified_diff(
+            original.splitlines(keepends=True), updated.splitlines(keepends=True),
+            f"a/{page.rel}", f"b/{page.rel}",
+        ))
+        if not dry_run:
+            atomic_write(page.path, updated)
+    return diff
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Single-pass Markdown tokenizer for the content scripts.
+
+The checks used to run their own regexes over raw page bodies, so a link
+pattern also matched inside fenced code, inline code and shortcode argument
+strings such as `{{ cite(title="*[Le Livre](...)*") }}`. `tokenize` walks a
+body once, left to right, and yields typed tokens instead:
+
+    heading    a `#` heading line; its inline tokens follow it
+    link       `[text](url)` or `[text](url "title")`, including images
+    autolink   `<https://...>`
+    shortcode  a Zola `{{ name(...) }}` or `{% name(...) %}` call, args parsed
+    end        the `{% end %}` closing a body shortcode
+    code       a fenced block or an inline code span
+    text       everything in between, as offsets only
+
+One compiled alternation drives the scan. Code and shortcode calls are
+consumed whole, so nothing inside them is seen by the other alternatives.
+An alternative that fails must not rescan the rest of the body, or an
+unbalanced `[`, `](` or `{{ x(` repeated through a page makes the pass
+quadratic. So each one stops at its closing delimiter or the next opening
+one: link text may wrap lines and nest one pair of brackets, a link target
+nests one pair of parentheses and holds no whitespace or brackets, quoted
+shortcode arguments hold no braces, and an inline code span closes within
+1,000 characters of its opening run. Their repetitions are
+possessive, so a failed alternative is never retried with a shorter run.
+Text tokens carry offsets rather than copies, so a 100 KB page allocates one
+small tuple per token.
+
+Usage (as a library):
+    from markdown_tokens import LINK, tokenize
+
+    for token in tokenize(page.body):
+        if token.kind == LINK:
+            print(token.start, token.url)
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+from typing import Iterator, NamedTuple, Optional
+
+from corpus import parse_shortcode_args
+
+HEADING = "heading"
+LINK = "link"
+AUTOLINK = "autolink"
+SHORTCODE = "shortcode"
+END = "end"
+CODE = "code"
+TEXT = "text"
+
+# Tokens whose contents are not prose: markup must never be inserted into them
+OPAQUE = frozenset({LINK, AUTOLINK, SHORTCODE, END, CODE})
+
+# Every alternative starts with a literal character, which lets the regex
+# engine skip straight to the next candidate; line-start alternatives check
+# the preceding character with a lookbehind instead of a leading `^`.
+TOKEN = re.compile(
+    r"""
+    # Fenced block at the start of a line, up to its closing fence or the end
+      `(?<![^\n]`)(?P<backticks>`{2,})(?=[^`\n]*$)[^\n]*
+        (?:\n(?s:.*?)^[ ]{0,3}`(?P=backticks)`*[ \t]*$|(?s:.*)\Z)
+    | ~(?<![^\n]~)(?P<tildes>~{2,})[^\n]*
+        (?:\n(?s:.*?)^[ ]{0,3}~(?P=tildes)~*[ \t]*$|(?s:.*)\Z)
+    # Heading marker; the heading text is tokenized like any other line
+    | \#(?<![^\n]\#)(?P<hashes>\#{0,5})[ \t]+
+    # Inline code span of up to 1,000 characters on one line, opened by a whole backtick run
+    | `(?<!``)(?P<ticks>`*+)(?P<code>[^\n]{1,1000}?)(?<!`)`(?P=ticks)(?!`)
+    # Shortcode call; quoted arguments may contain any Markdown but braces
+    | \{[{%]-?\s*(?P<name>\w+)\((?P<args>(?:"(?:[^"\\{}]|\\[^{}])*+"|'[^'{}]*+'|[^)"'{}])*+)\)\s*-?[}%]\}
+    | \{%-?\s*end\s*-?%(?P<end>\})
+    # Link, with an optional title; the innermost unbalanced bracket wins, as
+    # in `[See [Forerunners](../forerunners/)`, and images nest, as in `[![a](i.png)](url)`
+    | \[(?P<label>(?:[^\[\]]++|\[[^\[\]]*+\])++)\]
+      \((?P<url>(?:[^()\s\[\]]++|\([^()\s\[\]]*+\))++)(?:[ \t]++(?:"[^"\n]*+"|'[^'\n]*+'))?\)
+    | <(?P<autolink>(?:https?|mailto):[^\s<>]+)>
+    """,
+    re.MULTILINE | re.VERBOSE,
+)
+
+
+class Token(NamedTuple):
+    kind: str
+    start: int
+    end: int
+    text: str = ""  # heading text, link text, shortcode name or code
+    url: str = ""  # link and autolink target
+    level: int = 0  # heading level
+    args: Optional[dict] = None  # shortcode arguments
+
+
+def tokenize(body: str) -> Iterator[Token]:
+    """Yield the tokens of `body` in order, with text tokens filling the gaps."""
+    position = 0
+    for match in TOKEN.finditer(body):
+        start, end = match.span()
+        if start > position:
+            yield Token(TEXT, position, start)
+        kind = match.lastgroup
+        if kind == "url":
+            yield Token(LINK, start, end, match.group("label"), match.group("url"))
+        elif kind == "args":
+            yield Token(SHORTCODE, start, end, match.group("name"), args=parse_shortcode_args(match.group("args")))
+        elif kind == "end":
+            yield Token(END, start, end)
+        elif kind == "autolink":
+            yield Token(AUTOLINK, start, end, match.group("autolink"), match.group("autolink"))
+        elif kind == "code":
+            yield Token(CODE, start, end, match.group("code"))
+        elif kind == "hashes":
+            line_end = body.find("\n", end)
+            line_end = len(body) if line_end < 0 else line_end
+            text = body[end:line_end].rstrip().rstrip("#").rstrip()
+            yield Token(HEADING, start, line_end, text, level=len(match.group("hashes")) + 1)
+        else:
+            yield Token(CODE, start, end, body[start:end])
+        position = end
+    if position < len(body):
+        yield Token(TEXT, position, len(body))
+
+
+def links(body: str) -> Iterator[Token]:
+    """The `[text](url)` links of `body`, outside code and shortcode calls."""
+    if "](" not in body:
+        return
+    # Filters the raw matches so the hot checks never build the other tokens
+    for match in TOKEN.finditer(body):
+        if match.lastgroup == "url":
+            yield Token(LINK, match.start(), match.end(), match.group("label"), match.group("url"))
+
+
+def url_span(body: str, link: Token) -> tuple[int, int]:
+    """Offsets of a link token's target in `body`, without the title."""
+    return TOKEN.match(body, link.start).span("url")
+
+
+def shortcodes(body: str, name: str) -> Iterator[Token]:
+    """The `{{ name(...) }}` calls of `body`, outside code, with their arguments."""
+    for match in TOKEN.finditer(body):
+        if match.lastgroup == "args" and match.group("name") == name:
+            yield Token(SHORTCODE, match.start(), match.end(), name, args=parse_shortcode_args(match.group("args")))
+
+
+def count_words(body: str, tokens: Optional[list[Token]] = None) -> int:
+    """Whitespace-separated words of the prose and link texts, without code or markup.
+
+    Pass the page's `tokens` when the caller has already tokenized it.
+    """
+    words = 0
+    for token in tokenize(body) if tokens is None else tokens:
+        if token.kind == TEXT:
+            words += len(body[token.start:token.end].split())
+        elif token.kind == LINK:
+            words += len(token.text.split())
+    return words
+
+
+def main() -> int:
+    """Print the tokens of the given files, one per line."""
+    for name in sys.argv[1:]:
+        with open(name, encoding="utf-8") as handle:
+            body = handle.read()
+        for token in tokenize(body):
+            detail = token.url or token.text if token.kind != TEXT else body[token.start:token.end][:40]
+            print(f"{name}:{token.start}-{token.end} {token.kind} {detail!r}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
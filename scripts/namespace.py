@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""URL namespace index for the content tree.
+
+Maps every URL a page can be reached at — its canonical path (with `slug`
+applied), its file-derived path and each of its `aliases` — to the page that
+owns it, across all languages. Zola lets a later page silently shadow an
+earlier one at the same URL; the index records those clashes instead.
+
+Usage:
+    python scripts/namespace.py              # list URL collisions
+    python scripts/namespace.py --json       # full index as JSON
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+from corpus import Page, normalize_url, scan
+
+# Kinds of URL a page claims. "path" and "alias" are served by Zola; "file" is
+# the slug-less path, only used to resolve links when nothing is served there.
+SERVED_KINDS = ("path", "alias")
+
+
+@dataclass
+class Entry:
+    url: str
+    page: Page
+    kind: str
+
+    @property
+    def lang(self) -> str:
+        return self.page.lang
+
+
+class Namespace:
+    """Hash index of URL -> owning page, with collision tracking."""
+
+    def __init__(self):
+        self.entries: dict[str, Entry] = {}
+        self.collisions: list[tuple[Entry, Entry]] = []
+
+    def add(self, entry: Entry):
+        current = self.entries.get(entry.url)
+        if current is None or current.kind == "file" and entry.kind in SERVED_KINDS:
+            self.entries[entry.url] = entry
+        elif current.page is not entry.page and entry.kind in SERVED_KINDS:
+            self.collisions.append((current, entry))
+
+    def resolve(self, url: str) -> Optional[Entry]:
+        return self.entries.get(normalize_url(url))
+
+    def __contains__(self, url: str) -> bool:
+        return self.resolve(url) is not None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def build_namespace(pages: list[Page]) -> Namespace:
+    """Index every canonical, file-derived and alias URL of the given pages."""
+    namespace = Namespace()
+    for page in pages:
+        namespace.add(Entry(page.url, page, "path"))
+        for alias in page.aliases:
+            namespace.add(Entry(normalize_url(alias), page, "alias"))
+        if page.file_url != page.url:
+            namespace.add(Entry(page.file_url, page, "file"))
+    return namespace
+
+
+def describe_collision(first: Entry, second: Entry) -> str:
+    return (
+        f"URL {second.url} ({second.kind}) is already claimed by "
+        f"{first.page.rel} ({first.kind})"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check the URL namespace for collisions")
+    parser.add_argument("--json", action="store_true", help="Output the full index as JSON")
+    args = parser.parse_args()
+
+    namespace = build_namespace(scan())
+
+    if args.json:
+        result = {
+            "entries": {
+                url: {"file": entry.page.rel, "kind": entry.kind, "lang": entry.lang}
+                for url, entry in sorted(namespace.entries.items())
+            },
+            "collisions": [
+                {"url": second.url, "files": [first.page.rel, second.page.rel],
+                 "kinds": [first.kind, second.kind]}
+                for first, second in namespace.collisions
+            ],
+        }
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        for first, second in namespace.collisions:
+            print(f"{second.page.rel}: {describe_collision(first, second)}")
+        print(f"{len(namespace)} URLs, {len(namespace.collisions)} collisions")
+
+    return 1 if namespace.collisions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""Opt-in profiling shared by validate.py, i18n_dashboard.py and the curation pass.
+
+Scripts wrap their phases in `PROFILE.span(name)` and report file reads and
+regex matches to the module-level `PROFILE`. It is disabled unless the script
+was started with `--profile`; a disabled span is a shared no-op context
+manager and every other hook returns on its first line, so normal runs pay
+one attribute check per call site.
+
+A profiled run reports:
+- wall and CPU time per span, nested as the phases and checkers ran
+- the files read, the bytes read and the slowest files
+- time spent in reads versus parsing, and regex match counts
+- peak RSS where the `resource` module exists (not on Windows), plus the
+  tracemalloc heap peak per span with --profile-memory
+
+The report is appended to the text output and added to `--json` output under
+"profile". `--profile-trace` writes a Chrome trace-event file for
+chrome://tracing or Perfetto, and `--cprofile` dumps cProfile statistics.
+
+Usage:
+    python scripts/validate.py --profile
+    python scripts/validate.py --profile --profile-memory --profile-trace trace.json
+    python scripts/i18n_dashboard.py --json --profile
+    python scripts/curate_timeline_sources.py --cprofile curate.pstats
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import heapq
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_TOP = 10
+
+_DISABLED_SPAN = nullcontext()
+
+
+@dataclass
+class SpanRecord:
+    name: str
+    depth: int
+    start: float  # seconds since profiling started
+    wall: float = 0.0
+    cpu: float = 0.0
+    heap_peak: int = 0  # bytes, only with tracemalloc
+
+
+@dataclass
+class FileRecord:
+    name: str
+    size: int
+    start: float  # seconds since profiling started
+    seconds: float
+    thread: int  # native id of the thread that read the file
+
+
+class _Span:
+    """Times one `with PROFILE.span(...)` block."""
+
+    def __init__(self, profiler: Profiler, name: str):
+        self.profiler = profiler
+        self.record = SpanRecord(name, len(profiler.stack), 0.0)
+
+    def __enter__(self) -> SpanRecord:
+        profiler = self.profiler
+        if profiler.memory:
+            # Fold the heap peak so far into the enclosing span before resetting it
+            profiler.fold_heap_peak()
+        profiler.stack.append(self.record)
+        profiler.spans.append(self.record)
+        self.cpu = time.process_time()
+        self.record.start = time.perf_counter() - profiler.origin
+        return self.record
+
+    def __exit__(self, *exc):
+        profiler = self.profiler
+        record = self.record
+        record.wall = time.perf_counter() - profiler.origin - record.start
+        record.cpu = time.process_time() - self.cpu
+        if profiler.memory:
+            profiler.fold_heap_peak()
+        profiler.stack.pop()
+        if profiler.stack:
+            parent = profiler.stack[-1]
+            parent.heap_peak = max(parent.heap_peak, record.heap_peak)
+        return False
+
+
+class Profiler:
+    """Collects spans, file reads and counters for one run."""
+
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.origin = 0.0
+        self.cpu_origin = 0.0
+        self.spans: list[SpanRecord] = []
+        self.stack: list[SpanRecord] = []
+        self.files: list[FileRecord] = []
+        self.threads: dict[int, str] = {}
+        self.counters: Counter[str] = Counter()
+        self.timers: dict[str, float] = defaultdict(float)
+        self.heap_peak = 0
+
+    def enable(self, memory: bool = False):
+        self.enabled = True
+        self.memory = memory
+        self.origin = time.perf_counter()
+        self.cpu_origin = time.process_time()
+        if memory:
+            tracemalloc.start()
+
+    def span(self, name: str):
+        if not self.enabled:
+            return _DISABLED_SPAN
+        return _Span(self, name)
+
+    def fold_heap_peak(self):
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        self.heap_peak = max(self.heap_peak, peak)
+        if self.stack:
+            self.stack[-1].heap_peak = max(self.stack[-1].heap_peak, peak)
+
+    def file(self, name: str, size: int, started: float, seconds: Optional[float] = None,
+             thread: Optional[threading.Thread] = None):
+        """Record a file read that began at perf_counter() value `started`
+        and took `seconds`, or lasted until now, in `thread` or this one."""
+        if not self.enabled:
+            return
+        if seconds is None:
+            seconds = time.perf_counter() - started
+        if thread is None:
+            thread = threading.current_thread()
+        self.threads.setdefault(thread.native_id, thread.name)
+        self.files.append(FileRecord(name, size, started - self.origin, seconds, thread.native_id))
+
+    def count(self, name: str, n: int = 1):
+        if self.enabled:
+            self.counters[name] += n
+
+    def add_time(self, name: str, seconds: float):
+        if self.enabled:
+            self.timers[name] += seconds
+
+    def summary(self, top: int = DEFAULT_TOP) -> dict:
+        if self.memory:
+            self.fold_heap_peak()
+        slowest = heapq.nlargest(top, self.files, key=lambda record: record.seconds)
+        peak_rss = peak_rss_mb()
+        result = {
+            "wall_s": round(time.perf_counter() - self.origin, 4),
+            "cpu_s": round(time.process_time() - self.cpu_origin, 4),
+            "peak_rss_mb": None if peak_rss is None else round(peak_rss, 1),
+            "spans": [
+                {
+                    "name": span.name,
+                    "depth": span.depth,
+                    "wall_s": round(span.wall, 4),
+                    "cpu_s": round(span.cpu, 4),
+                    **({"heap_peak_mb": round(span.heap_peak / 1e6, 1)} if self.memory else {}),
+                }
+                for span in self.spans
+            ],
+            "files_read": len(self.files),
+            "bytes_read": sum(record.size for record in self.files),
+            "slowest_files": [
+                {"file": record.name, "bytes": record.size, "ms": round(record.seconds * 1000, 3)}
+                for record in slowest
+            ],
+            "timers": {name: round(seconds, 4) for name, seconds in sorted(self.timers.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+        if self.memory:
+            result["heap_peak_mb"] = round(self.heap_peak / 1e6, 1)
+        return result
+
+    def chrome_trace(self) -> dict:
+        """Spans and file reads as Chrome trace "complete" events (microseconds).
+
+        Spans share one track; each file read goes on the track of the thread
+        that read it, so the read-ahead workers' overlapping reads stay apart.
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name, "cat": "phase", "ph": "X", "pid": pid, "tid": 0,
+                "ts": round(span.start * 1e6, 1), "dur": round(span.wall * 1e6, 1),
+                "args": {"cpu_ms": round(span.cpu * 1000, 3)},
+            }
+            for span in self.spans
+        ]
+        events += [
+            {
+                "name": record.name, "cat": "file", "ph": "X", "pid": pid, "tid": record.thread,
+                "ts": round(record.start * 1e6, 1), "dur": round(record.seconds * 1e6, 1),
+                "args": {"bytes": record.size},
+            }
+            for record in self.files
+        ]
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "phases"}})
+        events += [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": thread, "args": {"name": f"file reads ({name})"}}
+            for thread, name in self.threads.items()
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+PROFILE = Profiler()
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, or None where it cannot be read."""
+    if resource is None:
+        return None
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def read_bytes(path: Path) -> bytes:
+    """`path.read_bytes()` that reports the read to the profiler when it is on."""
+    if not PROFILE.enabled:
+        return path.read_bytes()
+    started = time.perf_counter()
+    data = path.read_bytes()
+    PROFILE.file(str(path), len(data), started)
+    return data
+
+
+def read_text(path: Path) -> str:
+    """`path.read_text()` that reports the read to the profiler when it is on."""
+    if not PROFILE.enabled:
+        return path.read_text(encoding="utf-8")
+    started = time.perf_counter()
+    text = path.read_text(encoding="utf-8")
+    PROFILE.file(str(path), path.stat().st_size, started)
+    return text
+
+
+def format_report(summary: dict) -> str:
+    lines = ["", "⏱  Profile", "=" * 50]
+    memory = "heap_peak_mb" in summary
+    lines.append(f"{'span':<34} {'wall':>9} {'cpu':>9}" + (f" {'heap':>9}" if memory else ""))
+    for span in summary["spans"]:
+        name = "  " * span["depth"] + span["name"]
+        row = f"{name:<34} {span['wall_s']:>8.3f}s {span['cpu_s']:>8.3f}s"
+        if memory:
+            row += f" {span['heap_peak_mb']:>6.1f} MB"
+        lines.append(row)
+    lines.append(f"{'total':<34} {summary['wall_s']:>8.3f}s {summary['cpu_s']:>8.3f}s")
+
+    lines.append("")
+    lines.append(f"Files read: {summary['files_read']} ({summary['bytes_read'] / 1e6:.1f} MB)")
+    for name, seconds in summary["timers"].items():
+        lines.append(f"  {name}: {seconds:.3f}s")
+    if summary["slowest_files"]:
+        lines.append("Slowest files:")
+        for record in summary["slowest_files"]:
+            lines.append(f"  {record['ms']:>8.2f} ms {record['bytes']:>9} B  {record['file']}")
+    if summary["counters"]:
+        lines.append("Counters:")
+        for name, value in summary["counters"].items():
+            lines.append(f"  {name}: {value}")
+
+    peak_rss = summary["peak_rss_mb"]
+    memory_line = "Peak RSS: unavailable" if peak_rss is None else f"Peak RSS: {peak_rss:.0f} MB"
+    if memory:
+        memory_line += f", tracemalloc peak: {summary['heap_peak_mb']:.1f} MB (timings include its overhead)"
+    lines.append(memory_line)
+    return "\n".join(lines)
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group("profiling")
+    group.add_argument("--profile", action="store_true",
+                       help="Report per-phase timings, file reads and regex match counts")
+    group.add_argument("--profile-top", type=int, default=DEFAULT_TOP, metavar="N",
+                       help="Number of slowest files to list")
+    group.add_argument("--profile-memory", action="store_true",
+                       help="Track the peak heap per phase with tracemalloc (slows the run down)")
+    group.add_argument("--profile-trace", type=Path, metavar="PATH",
+                       help="Write a Chrome trace-event file (implies --profile)")
+    group.add_argument("--cprofile", type=Path, metavar="PATH", help="Dump cProfile statistics to PATH")
+
+
+_CPROFILE: Optional[cProfile.Profile] = None
+
+
+def start_profile(args: argparse.Namespace):
+    """Enable whatever profiling the command line asked for."""
+    global _CPROFILE
+    if args.profile or args.profile_memory or args.profile_trace:
+        PROFILE.enable(memory=args.profile_memory)
+    if args.cprofile:
+        _CPROFILE = cProfile.Profile()
+        _CPROFILE.enable()
+
+
+def finish_profile(args: argparse.Namespace) -> Optional[dict]:
+    """Stop profiling, write the trace and cProfile files, and return the summary."""
+    global _CPROFILE
+    if _CPROFILE is not None:
+        _CPROFILE.disable()
+        _CPROFILE.dump_stats(args.cprofile)
+        _CPROFILE = None
+        print(f"cProfile statistics written to {args.cprofile}", file=sys.stderr)
+    if not PROFILE.enabled:
+        return None
+    if args.profile_trace:
+        args.profile_trace.write_text(json.dumps(PROFILE.chrome_trace()), encoding="utf-8")
+        print(f"Trace written to {args.profile_trace}", file=sys.stderr)
+    return PROFILE.summary(args.profile_top)
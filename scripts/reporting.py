@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""Report sinks for validate.py findings.
+
+Checkers hand every finding to a `Reporter` as soon as it is found, and the
+reporter fans it out to any number of sinks. Several output formats can
+therefore come from one scan of the tree:
+
+    text           human-readable report, printed checker by checker
+    json           the legacy `--json` document (errors, stats, coverage)
+    ndjson         one JSON object per line, flushed as findings arrive
+    sarif          SARIF 2.1.0 for code-scanning annotations on pull requests
+    junit          JUnit XML, one test case per group of identical findings
+    coverage-json  translation coverage and stats only (the CI artifact)
+
+The same finding in several files (typically one broken target repeated in
+every language tree) shares a group key: the message with language prefixes
+removed from its URLs. The text and JUnit sinks print a group once with all
+of its files; NDJSON and SARIF keep one record per file and carry the key.
+
+Usage (via validate.py):
+    python scripts/validate.py --report text --report sarif:validate.sarif \\
+        --report coverage-json:coverage.json
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sys
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, TextIO
+from xml.etree import ElementTree
+
+from corpus import ROOT, TRANSLATIONS
+from profiling import format_report
+
+SEVERITY_ICONS = {"error": "❌", "warning": "⚠️", "info": "ℹ️"}
+SARIF_LEVELS = {"error": "error", "warning": "warning", "info": "note"}
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+# Language directories inside URLs, e.g. "/de/wiki/x/" -> "/wiki/x/"
+LANGUAGE_PREFIX = re.compile(
+    "/(?:" + "|".join(sorted((re.escape(lang.lower()) for lang in TRANSLATIONS), key=len, reverse=True)) + ")/"
+)
+# Groups list this many files before summarizing the rest
+GROUP_PREVIEW = 5
+
+
+@dataclass(slots=True)
+class Finding:
+    checker: str
+    rel: Optional[str]  # POSIX path relative to the content root
+    message: str
+    severity: str
+    explicit_rule: Optional[str] = None
+
+    @property
+    def group(self) -> str:
+        """Key shared by the same finding in different files and languages."""
+        normalized = LANGUAGE_PREFIX.sub("/", self.message)
+        digest = hashlib.sha1(f"{self.checker}\0{self.severity}\0{normalized}".encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    @property
+    def rule(self) -> str:
+        """Rule id, by default from the message head, e.g. "links/broken-internal-link"."""
+        if self.explicit_rule:
+            return self.explicit_rule
+        head = re.split(r"[:(]", re.sub(r"'[^']*'", "", self.message), maxsplit=1)[0]
+        return f"{self.checker}/" + re.sub(r"[^a-z0-9]+", "-", head.lower()).strip("-")
+
+
+def open_output(target: str) -> TextIO:
+    if target == "-":
+        return sys.stdout
+    return open(target, "w", encoding="utf-8")
+
+
+def group_findings(findings: list[Finding]) -> list[list[Finding]]:
+    """Group findings by key, errors first, keeping first-seen order otherwise."""
+    groups: dict[str, list[Finding]] = {}
+    for finding in findings:
+        groups.setdefault(finding.group, []).append(finding)
+    return sorted(groups.values(), key=lambda group: group[0].severity != "error")
+
+
+def format_coverage(coverage: dict) -> str:
+    """Translation coverage as one progress bar per language."""
+    lines = ["", "📊 Translation Coverage Report", "=" * 50]
+    for lang in sorted(coverage.keys()):
+        data = coverage[lang]
+        total = data["total"]
+        translated = data["translated"]
+        pct = (translated / total * 100) if total > 0 else 0
+
+        bar_len = 30
+        filled = int(bar_len * pct / 100)
+        bar = "█" * filled + "░" * (bar_len - filled)
+
+        lines.append(f"{lang:8} [{bar}] {pct:5.1f}% ({translated}/{total})")
+    lines.append("")
+    return "\n".join(lines)
+
+
+class Sink:
+    """Receives findings as they are found; writes its output by `finish`."""
+
+    def __init__(self, target: str = "-"):
+        self.target = target
+
+    def begin(self, checker: str, label: str):
+        pass
+
+    def finding(self, finding: Finding):
+        pass
+
+    def end(self, checker: str):
+        pass
+
+    def finish(self, summary: dict):
+        pass
+
+    def write(self, content: str):
+        stream = open_output(self.target)
+        try:
+            stream.write(content)
+            stream.flush()
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+
+
+class TextSink(Sink):
+    """The human-readable report; each checker's findings print when it finishes."""
+
+    def __init__(self, target: str = "-", group: bool = True):
+        super().__init__(target)
+        self.stream = open_output(target)
+        self.group = group
+        self.pending: list[Finding] = []
+        self.print("🔍 Validating content...\n")
+
+    def print(self, line: str = ""):
+        print(line, file=self.stream)
+
+    def begin(self, checker: str, label: str):
+        self.print(f"{label}...")
+        self.stream.flush()
+
+    def finding(self, finding: Finding):
+        if self.group:
+            self.pending.append(finding)
+        else:
+            self.print_group([finding])
+            self.stream.flush()
+
+    def print_group(self, group: list[Finding]):
+        first = group[0]
+        icon = SEVERITY_ICONS.get(first.severity, "•")
+        if len(group) == 1:
+            self.print(f"{icon} [{first.severity.upper()}] {first.rel or 'N/A'}: {first.message}")
+            return
+        files = ", ".join(finding.rel or "N/A" for finding in group[:GROUP_PREVIEW])
+        if len(group) > GROUP_PREVIEW:
+            files += f" (+{len(group) - GROUP_PREVIEW} more)"
+        self.print(f"{icon} [{first.severity.upper()}] {first.message} — {len(group)} files: {files}")
+
+    def end(self, checker: str):
+        for group in group_findings(self.pending):
+            self.print_group(group)
+        self.pending = []
+        self.stream.flush()
+
+    def finish(self, summary: dict):
+        if summary["coverage"]:
+            self.print(format_coverage(summary["coverage"]))
+        if summary.get("profile"):
+            self.print(format_report(summary["profile"]))
+        self.print("=" * 50)
+        self.print(f"Summary: {summary['errors']} errors, {summary['warnings']} warnings")
+        self.stream.flush()
+        if self.stream is not sys.stdout:
+            self.stream.close()
+
+
+class JsonSink(Sink):
+    """The document `--json` has always printed, with absolute file paths below `root`."""
+
+    def __init__(self, target: str = "-", root: Path = ROOT):
+        super().__init__(target)
+        self.root = root
+        self.findings: list[Finding] = []
+
+    def finding(self, finding: Finding):
+        self.findings.append(finding)
+
+    def finish(self, summary: dict):
+        result = {
+            "errors": [
+                {"file": str(self.root / finding.rel) if finding.rel else "None",
+                 "message": finding.message, "severity": finding.severity}
+                for finding in self.findings
+            ],
+            "stats": summary["stats"],
+            "coverage": summary["coverage"],
+        }
+        if summary.get("profile"):
+            result["profile"] = summary["profile"]
+        self.write(json.dumps(result, indent=2) + "\n")
+
+
+class NdjsonSink(Sink):
+    """One JSON object per finding, written and flushed immediately."""
+
+    def __init__(self, target: str = "-"):
+        super().__init__(target)
+        self.stream = open_output(target)
+
+    def emit(self, record: dict):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+    def finding(self, finding: Finding):
+        self.emit({
+            "type": "finding",
+            "checker": finding.checker,
+            "severity": finding.severity,
+            "file": finding.rel,
+            "message": finding.message,
+            "rule": finding.rule,
+            "group": finding.group,
+        })
+
+    def finish(self, summary: dict):
+        for lang, data in sorted(summary["coverage"].items()):
+            self.emit({"type": "coverage", "lang": lang, "total": data["total"],
+                       "translated": data["translated"], "missing": data["missing"]})
+        self.emit({"type": "summary", "errors": summary["errors"], "warnings": summary["warnings"],
+                   "stats": summary["stats"]})
+        if self.stream is not sys.stdout:
+            self.stream.close()
+
+
+class SarifSink(Sink):
+    """SARIF 2.1.0 log; findings have no line numbers and anchor at line 1."""
+
+    def __init__(self, target: str = "-"):
+        super().__init__(target)
+        self.rules: dict[str, str] = {}
+        self.results: list[dict] = []
+
+    def finding(self, finding: Finding):
+        rule = finding.rule
+        self.rules.setdefault(rule, rule.split("/", 1)[1].replace("-", " ").capitalize())
+        result = {
+            "ruleId": rule,
+            "level": SARIF_LEVELS.get(finding.severity, "note"),
+            "message": {"text": finding.message},
+            "partialFingerprints": {"findingGroup/v1": finding.group},
+        }
+        if finding.rel:
+            result["locations"] = [{
+                "physicalLocation": {
+                    "artifactLocation": {"uri": finding.rel, "uriBaseId": "%SRCROOT%"},
+                    "region": {"startLine": 1},
+                }
+            }]
+        self.results.append(result)
+
+    def finish(self, summary: dict):
+        log = {
+            "$schema": SARIF_SCHEMA,
+            "version": "2.1.0",
+            "runs": [{
+                "tool": {"driver": {
+                    "name": "validate.py",
+                    "rules": [
+                        {"id": rule, "shortDescription": {"text": text}}
+                        for rule, text in sorted(self.rules.items())
+                    ],
+                }},
+                "results": self.results,
+            }],
+        }
+        self.write(json.dumps(log, indent=2, ensure_ascii=False) + "\n")
+
+
+class JunitSink(Sink):
+    """JUnit XML: a test suite per checker, a test case per group of findings.
+
+    Errors fail their test case; warnings and infos pass and list their files
+    in system-out, unless `strict` turns them into failures too.
+    """
+
+    def __init__(self, target: str = "-", strict: bool = False):
+        super().__init__(target)
+        self.strict = strict
+        self.findings: dict[str, list[Finding]] = defaultdict(list)
+        self.checkers: list[str] = []
+
+    def begin(self, checker: str, label: str):
+        self.checkers.append(checker)
+
+    def finding(self, finding: Finding):
+        self.findings[finding.checker].append(finding)
+
+    def finish(self, summary: dict):
+        root = ElementTree.Element("testsuites", name="validate")
+        for checker in self.checkers:
+            groups = group_findings(self.findings.get(checker, []))
+            suite = ElementTree.SubElement(root, "testsuite", name=checker)
+            failures = 0
+            for group in groups:
+                first = group[0]
+                case = ElementTree.SubElement(suite, "testcase", classname=checker, name=first.message)
+                files = "\n".join(finding.rel or "N/A" for finding in group)
+                if first.severity == "error" or self.strict:
+                    failures += 1
+                    failure = ElementTree.SubElement(case, "failure", message=first.message, type=first.severity)
+                    failure.text = files
+                else:
+                    ElementTree.SubElement(case, "system-out").text = f"[{first.severity}]\n{files}"
+            if not groups:
+                ElementTree.SubElement(suite, "testcase", classname=checker, name="no findings")
+            suite.set("tests", str(max(len(groups), 1)))
+            suite.set("failures", str(failures))
+        ElementTree.indent(root)
+        self.write(ElementTree.tostring(root, encoding="unicode", xml_declaration=True) + "\n")
+
+
+class CoverageSink(Sink):
+    """Translation coverage and run statistics, the CI coverage artifact."""
+
+    def finish(self, summary: dict):
+        self.write(json.dumps({"stats": summary["stats"], "coverage": summary["coverage"]}, indent=2) + "\n")
+
+
+SINKS = {
+    "text": TextSink,
+    "json": JsonSink,
+    "ndjson": NdjsonSink,
+    "sarif": SarifSink,
+    "junit": JunitSink,
+    "coverage-json": CoverageSink,
+}
+
+
+def parse_report(spec: str) -> tuple[str, str]:
+    """Split "FORMAT[:PATH]" into (format, path); the path defaults to stdout."""
+    name, _, target = spec.partition(":")
+    if name not in SINKS:
+        raise ValueError(f"unknown report format '{name}' (choose from {', '.join(SINKS)})")
+    return name, target or "-"
+
+
+class Reporter:
+    """Fans findings out to every sink while counting them by severity.
+
+    Checkers only call `append`, so a reporter stands in for the plain list
+    of findings they used to fill.
+    """
+
+    def __init__(self, root: Path, sinks: list[Sink]):
+        self.root = root
+        self.sinks = sinks
+        self.checker = ""
+        self.counts: dict[str, int] = defaultdict(int)
+
+    @contextmanager
+    def section(self, checker: str, label: str):
+        self.checker = checker
+        for sink in self.sinks:
+            sink.begin(checker, label)
+        try:
+            yield self
+        finally:
+            for sink in self.sinks:
+                sink.end(checker)
+            self.checker = ""
+
+    def append(self, error):
+        rel = getattr(error, "rel", None)
+        if rel is None and error.file:
+            path = Path(error.file)
+            rel = path.relative_to(self.root).as_posix() if path.is_absolute() else path.as_posix()
+        finding = Finding(self.checker, rel, error.message, error.severity, getattr(error, "rule", None))
+        self.counts[error.severity] += 1
+        for sink in self.sinks:
+            sink.finding(finding)
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+
+    def finish(self, stats: dict, coverage: dict, profile: Optional[dict] = None) -> dict:
+        summary = {
+            "errors": self.counts["error"],
+            "warnings": self.counts["warning"],
+            "stats": stats,
+            "coverage": coverage,
+            "profile": profile,
+        }
+        for sink in self.sinks:
+            sink.finish(summary)
+        return summary
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Scripture citations: the hosted library books and a one-pass recognizer.
+
+The catalogue is read from `library/*.md`. A book is citable when its page
+states a reference format (`- **Reference format:** \\`GEN {chapter}:{verse}\\``),
+which is what the hosted texts' c<chapter>p<paragraph> anchors follow. Its
+names are the page title (also without a leading "The"), the abbreviation of
+the reference format, and the title of every translated library page that
+differs from the English one.
+
+The names are compiled into a trie, so a text is scanned once however many
+books there are, and a recognized name resolves to its slug in the trie node
+it ends on:
+
+    Genesis 1:26, 1 Kings 6:1-3, 1CO 15:40, psalm 82:6
+
+Names match in any case; abbreviations only in capitals, as the library
+writes them.
+
+Usage:
+    python scripts/scripture.py                # citable books and their names
+    python scripts/scripture.py --scan         # unlinked citations per language
+    python scripts/scripture.py --scan --lang de --verbose
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional
+
+from corpus import DEFAULT_LANGUAGE, LANGUAGES, ROOT, Page, load_page
+
+REFERENCE_FORMAT = re.compile(r"\*\*Reference format:\*\*\s*`([0-9A-Z]+) [^`:]*:[^`]*`")
+
+# Spellings that are no page title but appear in running text
+EXTRA_NAMES = {"Psalm": "psalms"}
+
+
+@dataclass
+class Book:
+    slug: str
+    title: str
+    abbreviation: str
+    names: dict[str, list[str]] = field(default_factory=dict)  # lang -> localized titles
+    languages: set[str] = field(default_factory=set)  # languages with a library page
+
+
+@dataclass
+class Citation:
+    start: int
+    end: int
+    slug: str
+    chapter: int
+    verse: int
+    last: Optional[int]  # end of a verse range
+    url: str
+
+
+def book_names(title: str) -> list[str]:
+    names = [title]
+    if title.lower().startswith("the "):
+        names.append(title[4:])
+    return names
+
+
+def build_catalogue(root: Path = ROOT, pages: Optional[list[Page]] = None) -> dict[str, Book]:
+    """Slug -> citable book, from the English library pages and their translations."""
+    if pages is None:
+        paths = sorted((root / "library").glob("*.md"))
+        for lang in LANGUAGES:
+            if lang != DEFAULT_LANGUAGE:
+                paths += sorted((root / lang / "library").glob("*.md"))
+        pages = [load_page(path, root) for path in paths]
+    library = [page for page in pages if page.section == "library" and not page.is_index and not page.error]
+
+    books: dict[str, Book] = {}
+    for page in library:
+        if page.lang != DEFAULT_LANGUAGE:
+            continue
+        match = REFERENCE_FORMAT.search(page.body)
+        title = page.frontmatter.get("title")
+        if match and isinstance(title, str):
+            slug = page.slug or page.key.rsplit("/", 1)[-1][: -len(".md")]
+            books[page.key] = Book(slug, title, match.group(1), languages={DEFAULT_LANGUAGE})
+    for page in library:
+        book = books.get(page.key)
+        if book is None or page.lang == DEFAULT_LANGUAGE:
+            continue
+        book.languages.add(page.lang)
+        title = page.frontmatter.get("title")
+        if isinstance(title, str) and title and title != book.title:
+            book.names.setdefault(page.lang, []).extend(book_names(title))
+    return {book.slug: book for book in books.values()}
+
+
+# Key of the slug in a terminal trie node; no name contains an empty character
+SLUG = ""
+
+# The chapter and verse a citation ends with, anchored on the whitespace before them
+ANCHOR = re.compile(r"\s(?P<chapter>\d+):(?P<verse>\d+)(?:[-–](?P<last>\d+))?")
+
+
+def reversed_trie(names: dict[str, str]) -> dict:
+    """A trie of the names spelled backwards, with the slug in each name's last node."""
+    root: dict = {}
+    for name, slug in names.items():
+        node = root
+        for char in reversed(name):
+            node = node.setdefault(char, {})
+        node.setdefault(SLUG, slug)
+    return root
+
+
+def is_boundary(text: str, index: int) -> bool:
+    """Whether a name may start at `index`: not inside a word or a hyphenated slug."""
+    return index == 0 or not (text[index - 1].isalnum() or text[index - 1] in "_-")
+
+
+class CitationRecognizer:
+    """Finds `<book> <chapter>:<verse>[-<verse>]` citations of one language's text.
+
+    One regular expression pass finds the chapter and verse numbers; from
+    each, the book name is read backwards through a trie of reversed names,
+    so only the few characters before a number are ever looked at and the
+    longest name that ends there wins.
+    """
+
+    def __init__(self, catalogue: dict[str, Book], lang: str = DEFAULT_LANGUAGE):
+        self.lang = lang
+        names: dict[str, str] = {}  # lowercased name -> slug
+        abbreviations: dict[str, str] = {}
+        for book in catalogue.values():
+            for name in book_names(book.title) + book.names.get(lang, []):
+                names.setdefault(name.lower(), book.slug)
+            abbreviations.setdefault(book.abbreviation, book.slug)
+        for name, slug in EXTRA_NAMES.items():
+            if slug in catalogue:
+                names.setdefault(name.lower(), slug)
+        self.names = reversed_trie(names)
+        self.abbreviations = reversed_trie(abbreviations)
+        self.prefixes = {
+            book.slug: "" if lang == DEFAULT_LANGUAGE or lang not in book.languages else f"/{lang}"
+            for book in catalogue.values()
+        }
+
+    def book(self, text: str, end: int) -> Optional[tuple[int, str]]:
+        """The start and slug of the longest book name ending at `end`, if any."""
+        found = None
+        for root, fold in ((self.names, True), (self.abbreviations, False)):
+            node = root
+            index = end - 1
+            while index >= 0:
+                node = node.get(text[index].lower() if fold else text[index])
+                if node is None:
+                    break
+                if SLUG in node and is_boundary(text, index):
+                    found = (index, node[SLUG])
+                index -= 1
+            if found:
+                return found
+        return None
+
+    def url(self, slug: str, chapter: int | str, verse: int | str) -> str:
+        return f"{self.prefixes[slug]}/library/{slug}/#c{chapter}p{verse}"
+
+    def finditer(self, text: str) -> Iterator[Citation]:
+        for match in ANCHOR.finditer(text):
+            end = match.start()
+            while end > 0 and text[end - 1].isspace():
+                end -= 1
+            found = self.book(text, end)
+            if found is None:
+                continue
+            start, slug = found
+            last = match.group("last")
+            yield Citation(
+                start, match.end(), slug, int(match.group("chapter")), int(match.group("verse")),
+                int(last) if last else None, self.url(slug, match.group("chapter"), match.group("verse")),
+            )
+
+
+def recognizers(catalogue: dict[str, Book]) -> dict[str, CitationRecognizer]:
+    return {lang: CitationRecognizer(catalogue, lang) for lang in LANGUAGES}
+
+
+def scan_citations(root: Path = ROOT, only: Optional[str] = None) -> Iterator[tuple[Page, Citation]]:
+    """Every unlinked citation in the bodies of the tree, in scan order."""
+    from corpus import scan
+    from curate_timeline_sources import is_linked, linked_spans
+
+    pages = scan(root)
+    by_lang = recognizers(build_catalogue(root, pages))
+    for page in pages:
+        if page.error or (only and page.lang != only):
+            continue
+        recognizer = by_lang[page.lang]
+        spans = None
+        for citation in recognizer.finditer(page.body):
+            if spans is None:
+                spans = linked_spans(page.body)
+            if not is_linked(citation.start, spans):
+                yield page, citation
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="List the citable library books, or the unlinked citations")
+    parser.add_argument("--scan", action="store_true", help="Count unlinked citations in every page body")
+    parser.add_argument("--lang", choices=LANGUAGES, help="With --scan, only this language")
+    parser.add_argument("--verbose", action="store_true", help="With --scan, list every citation")
+    args = parser.parse_args()
+
+    if not args.scan:
+        for book in build_catalogue().values():
+            localized = "; ".join(f"{lang}: {', '.join(names)}" for lang, names in sorted(book.names.items()))
+            print(f"{book.slug:36} {book.abbreviation:6} {book.title}" + (f" ({localized})" if localized else ""))
+        return 0
+
+    counts: Counter = Counter()
+    books: Counter = Counter()
+    for page, citation in scan_citations(only=args.lang):
+        counts[page.lang] += 1
+        books[citation.slug] += 1
+        if args.verbose:
+            print(f"{page.rel}: {page.body[citation.start:citation.end]} -> {citation.url}")
+    for lang in LANGUAGES:
+        if counts[lang]:
+            print(f"{lang:8} {counts[lang]:6} unlinked citations")
+    print("most cited: " + ", ".join(f"{slug} {count}" for slug, count in books.most_common(8)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""Static, sharded search index for every language of the site.
+
+Titles, descriptions, headings and bodies are tokenized per script: words for
+Latin, Cyrillic and Hebrew text, overlapping character bigrams for Han, kana
+and Hangul runs (so `ja`, `zh`, `zh-Hant` and `ko` are searchable without a
+dictionary). Postings are written as small JSON shards keyed by term prefix,
+plus a manifest that tells the browser which shard holds a term, so a query
+only fetches the shards its terms route to.
+
+Rebuilds are incremental: a state file remembers each page's content hash and
+the shards it contributed to, and only shards touched by changed pages are
+rewritten. A full rebuild deletes only the files the previous build listed in
+its manifest, so `--out` can point into a directory shared with other output.
+
+Usage:
+    python scripts/search_index.py                     # build into build/search/
+    python scripts/search_index.py --out DIR           # build elsewhere
+    python scripts/search_index.py --full              # ignore the previous state
+    python scripts/search_index.py --query de "arche noah"
+    python scripts/search_index.py --check             # enforce size and query budgets
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import heapq
+import json
+import re
+import sys
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from corpus import LANGUAGES, ROOT, Page, atomic_write, scan
+from markdown_tokens import HEADING, LINK, TEXT
+from markdown_tokens import tokenize as markdown_tokens
+
+OUT_DIR = ROOT / "build" / "search"
+STATE_FILE = ".state.json"
+FORMAT_VERSION = 2
+
+# Languages whose text is mostly unsegmented CJK script
+BIGRAM_LANGUAGES = {"ja", "ko", "zh", "zh-Hant"}
+
+# Per-field weights for the term score
+WEIGHTS = {"title": 8, "heading": 4, "description": 2, "body": 1}
+
+# Shards above SPLIT_BYTES are split by a longer prefix on full builds;
+# nothing may exceed MAX_SHARD_BYTES, and the best of QUERY_RUNS runs of a
+# reference query must stay under MAX_QUERY_MS. test_search_index.py enforces both.
+SPLIT_BYTES = 48_000
+MAX_PREFIX = 3
+MAX_SHARD_BYTES = 512_000
+MAX_QUERY_MS = 50.0
+QUERY_RUNS = 3
+
+# Han, kana, Hangul syllables and jamo
+CJK = r"\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+# Combining marks (accents, Hebrew points) that fold away
+MARKS = r"\u0300-\u036f\u0591-\u05c7\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f"
+CJK_CHAR = re.compile(f"[{CJK}]")
+CJK_RUN = re.compile(f"[{CJK}]+")
+WORD = re.compile(f"(?:[^\\W_{CJK}]|[{MARKS}])+")
+COMBINING = re.compile(f"[{MARKS}]")
+HTML_TAG = re.compile(r"<[^>]+>")
+
+
+def is_cjk(char: str) -> bool:
+    return CJK_CHAR.match(char) is not None
+
+
+@lru_cache(maxsize=65536)
+def fold(word: str) -> str:
+    """Strip combining marks (accents, niqqud) from an already case-folded word."""
+    return COMBINING.sub("", unicodedata.normalize("NFKD", word))
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into search terms: folded words, plus bigrams for CJK runs."""
+    text = text.casefold()
+    terms = [word if word.isascii() else fold(word) for word in WORD.findall(text)]
+    terms = [term for term in terms if len(term) > 1]
+    for run in CJK_RUN.findall(text):
+        if len(run) == 1:
+            terms.append(run)
+        else:
+            terms += [run[i:i + 2] for i in range(len(run) - 1)]
+    return terms
+
+
+def plain_text(body: str) -> tuple[str, str]:
+    """(headings, body) text without code, shortcode calls, link targets or HTML."""
+    headings: list[str] = []
+    prose: list[str] = []
+    heading_end = -1
+    for token in markdown_tokens(body):
+        if token.kind == HEADING:
+            heading_end = token.end
+            continue
+        if token.kind == TEXT:
+            text = body[token.start:token.end]
+            if token.start < heading_end:
+                headings.append(body[token.start:min(token.end, heading_end)])
+        elif token.kind == LINK:
+            text = token.text
+            if token.start < heading_end:
+                headings.append(text)
+        else:
+            continue
+        prose.append(text)
+    return HTML_TAG.sub(" ", " ".join(headings)), HTML_TAG.sub(" ", " ".join(prose))
+
+
+def document_terms(page: Page) -> dict[str, int]:
+    """Weighted term frequencies of a page across title, description, headings and body."""
+    scores: Counter[str] = Counter()
+    title = page.frontmatter.get("title")
+    description = page.frontmatter.get("description")
+    headings, body = plain_text(page.body)
+    fields = {
+        "title": title if isinstance(title, str) else "",
+        "description": description if isinstance(description, str) else "",
+        "heading": headings,
+        "body": body,
+    }
+    for name, text in fields.items():
+        weight = WEIGHTS[name]
+        for term, count in Counter(tokenize(text)).items():
+            scores[term] += count * weight
+    return dict(scores)
+
+
+def route(term: str, prefixes: set[str]) -> str:
+    """Name of the shard holding `term`: its longest split prefix, else its first
+    character (or, for CJK, the 128-code-point block of its first character)."""
+    for length in range(min(MAX_PREFIX, len(term)), 0, -1):
+        if term[:length] in prefixes:
+            return term[:length]
+    return f"~{ord(term[0]) >> 7:x}" if is_cjk(term[0]) else term[0]
+
+
+def is_searchable(page: Page) -> bool:
+    fm = page.frontmatter
+    return not page.error and not fm.get("draft") and fm.get("render", True) is not False
+
+
+def page_hash(page: Page) -> str:
+    return hashlib.sha1(page.body.encode("utf-8") + repr(
+        (page.url, page.frontmatter.get("title"), page.frontmatter.get("description"))
+    ).encode("utf-8")).hexdigest()
+
+
+def encode(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write(path, data.decode("utf-8"))
+    return True
+
+
+class LanguageIndex:
+    """Documents, routing prefixes and shards of one language."""
+
+    def __init__(self, lang: str, out: Path, state: Optional[dict]):
+        self.lang = lang
+        self.dir = out / lang
+        state = state or {}
+        self.docs: list = state.get("docs", [])
+        # Slots of removed documents, reused lowest first
+        self.free = [doc for doc, slot in enumerate(self.docs) if slot is None]
+        heapq.heapify(self.free)
+        self.pages: dict[str, dict] = state.get("pages", {})
+        self.prefixes: set[str] = set(state.get("prefixes", []))
+        self.shards: dict[str, dict[str, list[int]]] = {}
+        self.routes: dict[str, str] = {}
+        self.written = 0
+
+    def shard(self, name: str) -> dict[str, list[int]]:
+        if name not in self.shards:
+            path = self.dir / f"{name}.json"
+            self.shards[name] = json.loads(path.read_bytes()) if path.exists() else {}
+        return self.shards[name]
+
+    def remove(self, rel: str) -> set[str]:
+        entry = self.pages.pop(rel)
+        doc = entry["doc"]
+        self.docs[doc] = None
+        heapq.heappush(self.free, doc)
+        for name in entry["shards"]:
+            shard = self.shard(name)
+            for term in list(shard):
+                postings = shard[term]
+                kept = [x for i in range(0, len(postings), 2) if postings[i] != doc
+                        for x in postings[i:i + 2]]
+                if kept:
+                    shard[term] = kept
+                else:
+                    del shard[term]
+        return set(entry["shards"])
+
+    def add(self, page: Page, digest: str) -> set[str]:
+        record = [page.url, page.frontmatter.get("title", "")]
+        if self.free:
+            doc = heapq.heappop(self.free)
+            self.docs[doc] = record
+        else:
+            doc = len(self.docs)
+            self.docs.append(record)
+        touched = set()
+        routes = self.routes
+        for term, score in document_terms(page).items():
+            name = routes.get(term)
+            if name is None:
+                name = routes[term] = route(term, self.prefixes)
+            postings = self.shard(name).setdefault(term, [])
+            postings += (doc, score)
+            touched.add(name)
+        self.pages[page.rel] = {"hash": digest, "doc": doc, "shards": sorted(touched)}
+        return touched
+
+    def split_large_shards(self):
+        """On full builds, split oversized shards by one more prefix character."""
+        pending = list(self.shards)
+        while pending:
+            name = pending.pop()
+            terms = self.shards.get(name)
+            # CJK blocks split once, by first character; bigrams are short already
+            length = 1 if name.startswith("~") else len(name) + 1
+            if is_cjk(name[0]) and not name.startswith("~"):
+                continue
+            if not terms or length > MAX_PREFIX or len(encode(terms)) <= SPLIT_BYTES:
+                continue
+            longer = {term[:length] for term in terms if len(term) >= length}
+            if not longer or longer == {name}:
+                continue
+            self.prefixes |= longer
+            self.routes.clear()
+            del self.shards[name]
+            for term, postings in terms.items():
+                target = route(term, self.prefixes)
+                if target not in self.shards:
+                    self.shards[target] = {}
+                    pending.append(target)
+                self.shards[target][term] = postings
+        # Record each page's shards under the final routing
+        docs_shards = defaultdict(set)
+        for name, shard in self.shards.items():
+            for postings in shard.values():
+                for i in range(0, len(postings), 2):
+                    docs_shards[postings[i]].add(name)
+        for entry in self.pages.values():
+            entry["shards"] = sorted(docs_shards[entry["doc"]])
+
+    def write(self, names: set[str]) -> dict:
+        """Write the given shards and the doc table; return this language's manifest."""
+        written = 0
+        for name in sorted(names):
+            shard = self.shards.get(name, {})
+            path = self.dir / f"{name}.json"
+            if shard:
+                written += write_if_changed(path, encode(shard))
+            elif path.exists():
+                path.unlink()
+        write_if_changed(self.dir / "docs.json", encode(self.docs))
+
+        # Every shard on disk holds a posting of some page; other files are not ours
+        shards = {}
+        for name in sorted({name for entry in self.pages.values() for name in entry["shards"]}):
+            data = (self.dir / f"{name}.json").read_bytes()
+            shards[name] = {"bytes": len(data), "hash": hashlib.sha1(data).hexdigest()[:12]}
+        self.written = written
+        return {
+            "tokenizer": "bigram" if self.lang in BIGRAM_LANGUAGES else "word",
+            "docs": len([doc for doc in self.docs if doc is not None]),
+            "prefixes": sorted(self.prefixes),
+            "shards": shards,
+        }
+
+    def state(self) -> dict:
+        return {"docs": self.docs, "pages": self.pages, "prefixes": sorted(self.prefixes)}
+
+
+def remove_previous(out: Path):
+    """Delete the shards, doc tables, manifest and state a previous build wrote
+    under `out`, and nothing else: `out` may be a directory the user shares."""
+    manifest_path = out / "manifest.json"
+    try:
+        languages = json.loads(manifest_path.read_bytes()).get("languages", {})
+    except (OSError, ValueError, AttributeError):
+        languages = {}
+    for lang, data in languages.items():
+        directory = out / lang
+        for name in [*data.get("shards", ()), "docs"]:
+            (directory / f"{name}.json").unlink(missing_ok=True)
+        try:
+            directory.rmdir()
+        except OSError:
+            pass  # missing, or holds files of someone else
+    manifest_path.unlink(missing_ok=True)
+    (out / STATE_FILE).unlink(missing_ok=True)
+
+
+def build(out: Path = OUT_DIR, full: bool = False) -> dict:
+    """Build or update the index; return the manifest plus build statistics."""
+    state_path = out / STATE_FILE
+    state = None
+    if not full and state_path.exists():
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+        if state.get("version") != FORMAT_VERSION:
+            state = None
+    if state is None:
+        remove_previous(out)
+    full = state is None
+
+    pages_by_lang: dict[str, list[Page]] = defaultdict(list)
+    for page in scan():
+        if is_searchable(page):
+            pages_by_lang[page.lang].append(page)
+
+    manifest = {"version": FORMAT_VERSION, "weights": WEIGHTS, "max_prefix": MAX_PREFIX,
+                "cjk_block_bits": 7, "languages": {}}
+    stats = {"pages_changed": 0, "shards_written": 0}
+    new_state = {"version": FORMAT_VERSION, "languages": {}}
+
+    for lang in LANGUAGES:
+        index = LanguageIndex(lang, out, None if full else state["languages"].get(lang))
+        current = {page.rel: page for page in pages_by_lang.get(lang, [])}
+        touched: set[str] = set()
+
+        for rel in [rel for rel in index.pages if rel not in current]:
+            touched |= index.remove(rel)
+            stats["pages_changed"] += 1
+        for rel, page in current.items():
+            digest = page_hash(page)
+            previous = index.pages.get(rel)
+            if previous and previous["hash"] == digest:
+                continue
+            if previous:
+                touched |= index.remove(rel)
+            touched |= index.add(page, digest)
+            stats["pages_changed"] += 1
+
+        if full:
+            index.split_large_shards()
+            touched = set(index.shards)
+        manifest["languages"][lang] = index.write(touched)
+        stats["shards_written"] += index.written
+        new_state["languages"][lang] = index.state()
+
+    write_if_changed(out / "manifest.json", encode(manifest))
+    write_if_changed(state_path, encode(new_state))
+    return {"manifest": manifest, **stats}
+
+
+def query(out: Path, lang: str, text: str, limit: int = 10) -> list[tuple[int, str, str]]:
+    """Reference implementation of the browser lookup: AND over all query terms."""
+    manifest = json.loads((out / "manifest.json").read_bytes())
+    shards = manifest["languages"][lang]["shards"]
+    prefixes = set(manifest["languages"][lang]["prefixes"])
+    terms = set(tokenize(text))
+    if not terms:
+        return []
+    loaded: dict[str, dict] = {}
+    totals: Optional[Counter] = None
+    for term in terms:
+        name = route(term, prefixes)
+        if name not in loaded:
+            path = out / lang / f"{name}.json"
+            loaded[name] = json.loads(path.read_bytes()) if name in shards else {}
+        postings = loaded[name].get(term, [])
+        scores = Counter(dict(zip(postings[::2], postings[1::2])))
+        totals = scores if totals is None else Counter(
+            {doc: totals[doc] + score for doc, score in scores.items() if doc in totals}
+        )
+    docs = json.loads((out / lang / "docs.json").read_bytes())
+    ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return [(score, *docs[doc]) for doc, score in ranked]
+
+
+def check_budgets(out: Path, manifest: dict) -> list[str]:
+    """Return budget violations: oversized shards and slow reference queries."""
+    problems = []
+    for lang, data in manifest["languages"].items():
+        for name, shard in data["shards"].items():
+            if shard["bytes"] > MAX_SHARD_BYTES:
+                problems.append(f"{lang}/{name}.json is {shard['bytes']} bytes (max {MAX_SHARD_BYTES})")
+        docs = json.loads((out / lang / "docs.json").read_bytes())
+        sample = next((doc for doc in docs if doc and doc[1]), None)
+        if sample is None:
+            continue
+        timings = []
+        for _ in range(QUERY_RUNS):
+            start = time.perf_counter()
+            query(out, lang, sample[1])
+            timings.append((time.perf_counter() - start) * 1000)
+        elapsed = min(timings)
+        if elapsed > MAX_QUERY_MS:
+            problems.append(f"{lang}: query {sample[1]!r} took {elapsed:.1f} ms (max {MAX_QUERY_MS} ms)")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the static search index")
+    parser.add_argument("--out", type=Path, default=OUT_DIR, help="Output directory (default: build/search)")
+    parser.add_argument("--full", action="store_true", help="Rebuild from scratch")
+    parser.add_argument("--check", action="store_true", help="Fail when size or query-time budgets are exceeded")
+    parser.add_argument("--query", nargs=2, metavar=("LANG", "TEXT"), help="Query an existing index")
+    args = parser.parse_args()
+
+    if args.query:
+        for score, url, title in query(args.out, *args.query):
+            print(f"{score:>5}  {url}  {title}")
+        return 0
+
+    start = time.perf_counter()
+    result = build(args.out, args.full)
+    manifest = result["manifest"]
+    elapsed = time.perf_counter() - start
+
+    for lang, data in manifest["languages"].items():
+        size = sum(shard["bytes"] for shard in data["shards"].values())
+        print(f"{lang:8} {data['tokenizer']:6} {data['docs']:>5} docs "
+              f"{len(data['shards']):>4} shards {size / 1024:>8.1f} KiB")
+    print(f"{result['pages_changed']} pages changed, {result['shards_written']} shards written "
+          f"in {elapsed:.2f}s")
+
+    if args.check:
+        problems = check_budgets(args.out, manifest)
+        for problem in problems:
+            print(f"budget exceeded: {problem}")
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Split the content tree into shards for parallel CI jobs.
+
+`--shard i/n` makes validate.py or i18n_dashboard.py process only the i-th
+of n parts of the tree and write a shard document instead of a report.
+Every job computes the same partition from the same checkout, with no
+coordination: units (files, or English sources with their translations) go
+largest first to the currently lightest shard, so shards balance by bytes
+rather than by file count, and equal sizes are ordered by a stable hash of
+the unit's name.
+
+Checks that span the whole tree (the URL namespace, identifier conflicts,
+coverage totals) cannot run inside one shard. Shards record the per-page
+facts those checks need, and `merge-reports` runs them once over all shards,
+producing the report an unsharded run would have.
+
+Usage:
+    python scripts/validate.py --shard 1/4 --shard-output shard-1.json
+    python scripts/validate.py merge-reports shard-*.json --report text
+    python scripts/i18n_dashboard.py --shard 2/4 --shard-output i18n-2.json
+    python scripts/i18n_dashboard.py merge-reports i18n-*.json --html
+    python scripts/sharding.py 4          # show how the tree splits
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import heapq
+import json
+import sys
+from pathlib import Path
+
+from corpus import ROOT, iter_markdown
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse "i/n" (1-based) for argparse."""
+    index, _, count = value.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/n, got '{value}'") from None
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard {value} out of range (need 1 <= i <= n)")
+    return index, count
+
+
+def add_shard_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group("sharding")
+    group.add_argument("--shard", type=parse_shard, metavar="I/N",
+                       help="Only process shard I of N and write a shard document for merge-reports")
+    group.add_argument("--shard-output", default="-", metavar="PATH",
+                       help="Where --shard writes its document (default: stdout)")
+
+
+def stable_hash(name: str) -> int:
+    return int.from_bytes(hashlib.sha1(name.encode("utf-8")).digest()[:8], "big")
+
+
+def assign_shards(sizes: dict[str, int], count: int) -> dict[str, int]:
+    """Map each unit name to a 0-based shard, balancing total bytes greedily."""
+    bins = [(0, shard) for shard in range(count)]
+    assignment = {}
+    for name in sorted(sizes, key=lambda name: (-sizes[name], stable_hash(name))):
+        load, shard = heapq.heappop(bins)
+        assignment[name] = shard
+        heapq.heappush(bins, (load + sizes[name], shard))
+    return assignment
+
+
+def tree_fingerprint(sizes: dict[str, int]) -> str:
+    """Digest of the unit names and sizes, so merge-reports can refuse mixed checkouts."""
+    digest = hashlib.sha1()
+    for name in sorted(sizes):
+        digest.update(f"{name}\0{sizes[name]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def write_shard(document: dict, target: str):
+    content = json.dumps(document, ensure_ascii=False) + "\n"
+    if target == "-":
+        sys.stdout.write(content)
+    else:
+        Path(target).write_text(content, encoding="utf-8")
+
+
+def load_shards(paths: list[Path], kind: str) -> list[dict]:
+    """Read shard documents, checking they are one complete set from one tree."""
+    documents = [json.loads(path.read_text(encoding="utf-8")) for path in paths]
+    for path, document in zip(paths, documents):
+        if document.get("kind") != kind:
+            raise ValueError(f"{path}: not a shard document of kind '{kind}'")
+    count = documents[0]["shard"][1]
+    indexes = sorted(document["shard"][0] for document in documents)
+    if any(document["shard"][1] != count for document in documents) or indexes != list(range(1, count + 1)):
+        raise ValueError(f"expected shards 1..{count} exactly once, got {', '.join(map(str, indexes))}")
+    if len({document["tree"] for document in documents}) > 1:
+        raise ValueError("shards were produced from different trees")
+    if len({json.dumps(document.get("checks")) for document in documents}) > 1:
+        raise ValueError("shards ran different checks")
+    return sorted(documents, key=lambda document: document["shard"][0])
+
+
+def file_sizes(root: Path = ROOT) -> dict[str, int]:
+    """Content-relative path -> bytes, in the corpus walk order."""
+    return {path.relative_to(root).as_posix(): path.stat().st_size for path in iter_markdown(root)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Show how the content tree splits into shards")
+    parser.add_argument("count", type=int, help="Number of shards")
+    args = parser.parse_args()
+
+    sizes = file_sizes()
+    assignment = assign_shards(sizes, args.count)
+    for shard in range(args.count):
+        names = [name for name, owner in assignment.items() if owner == shard]
+        print(f"{shard + 1}/{args.count}: {len(names):>5} files {sum(sizes[name] for name in names) / 1e6:>7.2f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
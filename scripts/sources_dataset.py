@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""One deduplicated, sorted dataset of every work cited anywhere in the corpus.
+
+Wiki pages, articles and Timeline chapters each carry their own
+`extra.references` list, so the same work recurs page after page
+(Hamlet's Mill is cited from five chapters in every language) under
+slightly different spellings. The aggregator reduces each citation to
+canonical keys:
+
+    doi:10.1126/science.1190719     from a `doi` field or a DOI inside the URL
+    url:example.org/path            scheme, `www.`, fragment, tracking query dropped
+    path:/library/zephaniah/        a site path, as the link checker normalizes it
+    id:the-book-which-tells-the-truth
+    title:hamlets-mill-an-essay-... a case- and accent-folded title
+
+Citations sharing a DOI, URL, path or id are one source. A citation with
+only a title joins the source carrying that title (or the title without its
+trailing "(...)") when there is exactly one; otherwise citations with equal
+titles form a source of their own. Citations by id alone take their title
+from the page's `cite(id=..., title="Author, *Title* ...")` call.
+Each source keeps back-references to its citing pages, and the dataset is
+written sorted by title to build/sources/sources.json for /sources/.
+
+Rebuilds are incremental: a state file remembers each file's size, mtime
+and reference-block hash, so unchanged files are not even parsed, and only
+pages whose reference block changed are re-normalized before the merge.
+
+Usage:
+    python scripts/sources_dataset.py               # build into build/sources/
+    python scripts/sources_dataset.py --out DIR     # build elsewhere
+    python scripts/sources_dataset.py --full        # ignore the previous state
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from canon_references import cites
+from corpus import DEFAULT_LANGUAGE, ROOT, iter_markdown, load_page, normalize_url
+from search_index import encode, write_if_changed
+
+OUT_DIR = ROOT / "build" / "sources"
+STATE_FILE = ".state.json"
+DATASET_FILE = "sources.json"
+FORMAT_VERSION = 1
+
+# Bibliographic fields merged into the source record; the rest stay per citation
+FIELDS = ("title", "author", "publication", "date", "medium", "url", "path", "id")
+CITATION_FIELDS = ("locator",)
+
+# Identity kinds from strongest to weakest; a source is keyed by its strongest
+KINDS = ("doi", "url", "path", "id", "title")
+
+DOI = re.compile(r"(?<![\w.])10\.\d{4,9}/[^\s?#]+")
+TRACKING_PARAMS = re.compile(r"^(?:utm_\w+|fbclid|gclid)$")
+TRAILING_PARENTHETICAL = re.compile(r"\s*\([^)]*\)\s*$")
+EMPHASIS = re.compile(r"\*([^*]+)\*")
+
+
+def title_key(title: str) -> str:
+    """Casefolded title without accents or punctuation; non-Latin letters are kept."""
+    title = unicodedata.normalize("NFKD", title.casefold())
+    title = "".join(char for char in title if not unicodedata.combining(char))
+    return re.sub(r"[\W_]+", "-", re.sub(r"['’]", "", title)).strip("-")
+
+
+def doi_key(value: str) -> Optional[str]:
+    match = DOI.search(value)
+    return match.group().rstrip(".,;").casefold() if match else None
+
+
+def url_key(url: str) -> str:
+    """`https://www.Example.org/a/?utm_source=x#b` -> `example.org/a`."""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").removeprefix("www.")
+    if parts.port and parts.port not in (80, 443):
+        host += f":{parts.port}"
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if not TRACKING_PARAMS.match(k)])
+    return host + (parts.path.rstrip("/") or "") + (f"?{query}" if query else "")
+
+
+def identities(reference: dict) -> list[str]:
+    """Canonical keys of one citation, strongest first."""
+    keys = []
+    url = reference.get("url")
+    doi = doi_key(str(reference.get("doi", ""))) or (doi_key(url) if isinstance(url, str) else None)
+    if doi:
+        keys.append(f"doi:{doi}")
+    if isinstance(url, str) and url.strip():
+        keys.append(f"url:{url_key(url)}")
+    if isinstance(reference.get("path"), str):
+        keys.append(f"path:{normalize_url(reference['path'])}")
+    if isinstance(reference.get("id"), str):
+        keys.append(f"id:{reference['id']}")
+    title = reference.get("title")
+    if isinstance(title, str) and title_key(title):
+        keys.append(f"title:{title_key(title)}")
+    return keys
+
+
+def strength(key: str) -> tuple[int, str]:
+    return KINDS.index(key.split(":", 1)[0]), key
+
+
+def page_citations(page) -> list[dict]:
+    """The normalized citations of one page's reference block."""
+    cite_titles = {}
+    for cite in cites(page.body):
+        match = EMPHASIS.search(cite.args.get("title", ""))
+        if match and isinstance(cite.args.get("id"), str):
+            cite_titles.setdefault(cite.args["id"], match.group(1))
+    citations = []
+    for reference in page.extra.get("references") or []:
+        if not isinstance(reference, dict):
+            continue
+        if "title" not in reference and reference.get("id") in cite_titles:
+            reference = {**reference, "title": cite_titles[reference["id"]]}
+        keys = identities(reference)
+        if keys:
+            citation = {"keys": keys}
+            citation.update((field, reference[field]) for field in FIELDS + CITATION_FIELDS if field in reference)
+            citations.append(citation)
+    return citations
+
+
+def reference_hash(page) -> str:
+    references = page.extra.get("references")
+    return hashlib.sha1(json.dumps([page.url, references], sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def merge(pages: dict[str, dict]) -> list[dict]:
+    """Group the citations of every page into sources, sorted by title."""
+    parent: dict[str, str] = {}
+
+    def find(key: str) -> str:
+        parent.setdefault(key, key)
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    citations = [(rel, entry, citation) for rel, entry in sorted(pages.items()) for citation in entry["citations"]]
+    # Strong keys (DOI, URL, path, id) of one citation name the same work
+    for _, _, citation in citations:
+        strong = [key for key in citation["keys"] if not key.startswith("title:")]
+        for key in strong[1:]:
+            parent[find(key)] = find(strong[0])
+
+    def title_keys(citation: dict) -> list[str]:
+        title = citation.get("title")
+        if not isinstance(title, str):
+            return []
+        return [f"title:{key}" for key in (title_key(title), title_key(TRAILING_PARENTHETICAL.sub("", title))) if key]
+
+    titled: dict[str, set[str]] = defaultdict(set)
+    for _, _, citation in citations:
+        if not citation["keys"][0].startswith("title:"):
+            for key in title_keys(citation):
+                titled[key].add(find(citation["keys"][0]))
+
+    groups: dict[str, list] = defaultdict(list)
+    for rel, entry, citation in citations:
+        first = citation["keys"][0]
+        if first.startswith("title:"):
+            # Title-only citations join the one source with that title, if unambiguous
+            owners = next((titled[key] for key in title_keys(citation) if key in titled), ())
+            root = next(iter(owners)) if len(owners) == 1 else find(first)
+        else:
+            root = find(first)
+        groups[root].append((rel, entry, citation))
+
+    sources = []
+    for members in groups.values():
+        english = [citation for _, entry, citation in members if entry["lang"] == DEFAULT_LANGUAGE]
+        keys = sorted({key for _, _, citation in members for key in citation["keys"]}, key=strength)
+        source = {"key": keys[0]}
+        for field in FIELDS:
+            values = [citation[field] for citation in english or [c for _, _, c in members] if field in citation]
+            if values:
+                source[field] = Counter(values).most_common(1)[0][0]
+        doi = next((key[4:] for key in keys if key.startswith("doi:")), None)
+        if doi:
+            source["doi"] = doi
+        source["keys"] = keys
+        source["cited_by"] = [
+            {"file": rel, "url": entry["url"], **{field: citation[field] for field in CITATION_FIELDS if field in citation}}
+            for rel, entry, citation in members
+        ]
+        sources.append(source)
+    sources.sort(key=lambda source: (title_key(str(source.get("title") or source.get("id") or "")), source["key"]))
+    return sources
+
+
+def build(out: Path = OUT_DIR, full: bool = False) -> dict:
+    """Build or update the dataset; return it plus build statistics."""
+    state_path = out / STATE_FILE
+    state = None
+    if not full and state_path.exists():
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+        if state.get("version") != FORMAT_VERSION:
+            state = None
+    previous: dict[str, dict] = state["pages"] if state else {}
+
+    pages: dict[str, dict] = {}
+    stats = {"files_read": 0, "pages_changed": 0}
+    for path in iter_markdown(ROOT):
+        rel = path.relative_to(ROOT).as_posix()
+        info = path.stat()
+        signature = [info.st_size, info.st_mtime_ns]
+        entry = previous.get(rel)
+        if entry is not None and entry["stat"] == signature:
+            pages[rel] = entry
+            continue
+        page = load_page(path, ROOT)
+        stats["files_read"] += 1
+        digest = reference_hash(page)
+        if entry is not None and entry["hash"] == digest:
+            pages[rel] = {**entry, "stat": signature}
+            continue
+        # Only pages whose reference block changed are normalized again
+        stats["pages_changed"] += 1
+        pages[rel] = {"stat": signature, "hash": digest, "url": page.url, "lang": page.lang,
+                      "citations": page_citations(page)}
+    stats["pages_changed"] += len(previous.keys() - pages.keys())
+
+    sources = merge(pages)
+    citations = sum(len(entry["citations"]) for entry in pages.values())
+    dataset = {"version": FORMAT_VERSION, "citations": citations, "sources": sources}
+    stats["written"] = write_if_changed(out / DATASET_FILE, encode(dataset))
+    write_if_changed(state_path, encode({"version": FORMAT_VERSION, "pages": pages}))
+    return {"dataset": dataset, **stats}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the deduplicated sources dataset")
+    parser.add_argument("--out", type=Path, default=OUT_DIR, help="Output directory (default: build/sources)")
+    parser.add_argument("--full", action="store_true", help="Rebuild from scratch")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = build(args.out, args.full)
+    elapsed = time.perf_counter() - start
+
+    dataset = result["dataset"]
+    sources = dataset["sources"]
+    shared = sum(len({entry["file"] for entry in source["cited_by"]}) > 1 for source in sources)
+    print(f"{dataset['citations']} citations -> {len(sources)} sources ({shared} cited from several pages)")
+    print(f"{result['files_read']} files read, {result['pages_changed']} reference blocks changed, "
+          f"dataset {'written' if result['written'] else 'unchanged'} in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""Deterministic synthetic content trees for benchmarking the content scripts.
+
+Generates a tree in the real layout — English sections at the root, one
+directory per translation, TOML frontmatter with `see_also`, `same_as` and
+`aliases`, Markdown links, shortcodes and Timeline chapters the curation pass
+recognizes. Scale 1 matches the size of today's tree (~2,800 files); every
+page's content is derived from the seed and its own path, so the same
+parameters always produce byte-identical files.
+
+Usage:
+    python scripts/synthetic_corpus.py /tmp/corpus             # 1× today's size
+    python scripts/synthetic_corpus.py /tmp/corpus --scale 10  # 10×
+    python scripts/synthetic_corpus.py /tmp/corpus --broken-rate 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import shutil
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from corpus import DEFAULT_LANGUAGE, LANGUAGES
+from curate_timeline_sources import CHAPTERS, LIBRARY_TITLE_LINKS, WIKI_LINKS
+from scripture import build_catalogue
+
+# Bump when the generated content changes, so cached corpora are rebuilt.
+GENERATOR_VERSION = 2
+MANIFEST = ".corpus.json"
+
+# English pages per section at scale 1, after today's tree. The Timeline is
+# generated as one set of CHAPTERS per scale step instead.
+SECTION_PAGES = {
+    "wiki": 150,
+    "library": 125,
+    "articles": 27,
+    "datasets": 11,
+    "news": 8,
+    "sources": 6,
+}
+SECTION_TEMPLATES = {
+    "wiki": "wiki-page.html",
+    "library": "library-book.html",
+    "articles": "article-page.html",
+    "datasets": "dataset-page.html",
+    "news": "news-page.html",
+    "sources": "sources-page.html",
+    "timeline": "timeline-page.html",
+}
+# Paragraphs per page; library books carry whole texts and are much longer.
+SECTION_PARAGRAPHS = {"library": 40, "timeline": 14}
+DEFAULT_PARAGRAPHS = 8
+
+# Syllables per script; CJK languages write words without spaces.
+SYLLABLES = {
+    "latin": "ka lo mi ne ra sha tu el oh im an ur be di go".split(),
+    "de": "ka lo mü ne rä scha tu el oh im an ür be di go".split(),
+    "es": "ka lo mi ñe ra cha tú el oh im an ur be dí go".split(),
+    "fr": "ka lo mi né ra cha tu el oh im an ûr be dî go".split(),
+    "ru": "ка ло ми не ра ша ту эл ох им ан ур бе ди го".split(),
+    "he": "כא לו מי נה רא שה תו אל או ים אן אור בה די גו".split(),
+    "ja": "か ろ み ね ら しゃ つ える お いむ あん 天 神 地 人".split(),
+    "ko": "카 로 미 네 라 샤 투 엘 오 임 안 우 베 디 고".split(),
+    "zh": "天 神 地 人 星 海 山 火 水 木 金 土 光 时 古".split(),
+    "zh-Hant": "天 神 地 人 星 海 山 火 水 木 金 土 光 時 語".split(),
+}
+UNSPACED = {"ja", "zh", "zh-Hant"}
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Parameters that fully determine a synthetic tree."""
+
+    scale: int = 1
+    seed: int = 0
+    broken_rate: float = 0.02  # share of internal links pointing nowhere
+    translation_rate: float = 0.74  # share of English pages each language translates
+    version: int = GENERATOR_VERSION
+
+
+@dataclass
+class PageSpec:
+    lang: str
+    key: str  # e.g. "wiki/ka-lo-17.md"
+    section: str
+
+
+class Writer:
+    """Render page specs into Markdown using per-page seeded randomness."""
+
+    def __init__(self, spec: CorpusSpec, pages: list[PageSpec]):
+        self.spec = spec
+        # Chapters cite the books the real library hosts, as the curation pass links them
+        self.books = sorted(book.title for book in build_catalogue().values())
+        self.urls: dict[str, list[str]] = {}
+        for page in pages:
+            if page.key.endswith("_index.md"):
+                continue
+            stem = page.key[: -len(".md")]
+            prefix = "" if page.lang == DEFAULT_LANGUAGE else f"/{page.lang}"
+            self.urls.setdefault(page.lang, []).append(f"{prefix}/{stem}/")
+
+    def words(self, rng: random.Random, lang: str, count: int) -> str:
+        syllables = SYLLABLES.get(lang, SYLLABLES["latin"])
+        words = ("".join(rng.choices(syllables, k=rng.randint(1, 4))) for _ in range(count))
+        return ("" if lang in UNSPACED else " ").join(words)
+
+    def link(self, rng: random.Random, lang: str) -> str:
+        urls = self.urls.get(lang) or self.urls[DEFAULT_LANGUAGE]
+        url = rng.choice(urls)
+        if rng.random() < self.spec.broken_rate:
+            url = url.rstrip("/") + "-missing/"
+        return url
+
+    def paragraph(self, rng: random.Random, lang: str) -> str:
+        parts = [self.words(rng, lang, rng.randint(10, 25))]
+        for _ in range(rng.randint(1, 4)):
+            roll = rng.random()
+            if roll < 0.55:
+                parts.append(f"[{self.words(rng, lang, 2)}]({self.link(rng, lang)})")
+            elif roll < 0.7:
+                slug = self.link(rng, lang).rstrip("/").rsplit("/", 1)[-1]
+                parts.append(f"[{self.words(rng, lang, 1)}](../{slug}/)")
+            elif roll < 0.85:
+                slug = self.link(rng, lang).rstrip("/").rsplit("/", 1)[-1]
+                parts.append(f'{{{{ wiki(slug="{slug}", text="{self.words(rng, lang, 2)}") }}}}')
+            else:
+                parts.append(f'{{{{ cite(id="src-{rng.randint(1, 400)}", title="A \\"quoted\\" title") }}}}')
+            parts.append(self.words(rng, lang, rng.randint(8, 20)))
+        return " ".join(parts) + "."
+
+    def frontmatter(self, rng: random.Random, page: PageSpec, slug: str) -> list[str]:
+        lang = page.lang
+        title = self.words(rng, lang, rng.randint(1, 4))
+        description = self.words(rng, lang, rng.randint(4, 45))
+        lines = [
+            "+++",
+            f"title = {json.dumps(title, ensure_ascii=False)}",
+            f'slug = "{slug}"',
+            f"description = {json.dumps(description, ensure_ascii=False)}",
+            f'template = "{SECTION_TEMPLATES[page.section]}"',
+        ]
+        if rng.random() < 0.05:
+            lines.append(f'aliases = ["/old/{page.section}/{slug}/"]')
+        lines += ["", "[extra]"]
+        # Identifiers come from the page key, so translations share them
+        key_rng = random.Random(f"{self.spec.seed}:same_as:{page.key}")
+        if key_rng.random() < 0.6 and (lang == DEFAULT_LANGUAGE or rng.random() < 0.3):
+            lines.append(f'same_as = ["https://www.wikidata.org/wiki/Q{key_rng.randint(1, 10**6)}"]')
+        lines.append("see_also = [")
+        for _ in range(rng.randint(0, 4)):
+            path = self.link(rng, lang).strip("/")
+            lines.append(
+                f'    {{ title = {json.dumps(self.words(rng, lang, 2), ensure_ascii=False)}, path = "{path}" }},'
+            )
+        lines += ["]", "+++", ""]
+        return lines
+
+    def timeline_body(self, rng: random.Random, page: PageSpec) -> list[str]:
+        """Chapters mention the labels and citations the curation pass links."""
+        chapter = page.key.rsplit("/", 1)[-1][: -len(".md")]
+        labels = [label for label, _ in WIKI_LINKS.get(chapter, []) + LIBRARY_TITLE_LINKS.get(chapter, [])]
+        lines = []
+        for _ in range(SECTION_PARAGRAPHS["timeline"]):
+            text = self.paragraph(rng, page.lang)
+            if labels:
+                text += f" {rng.choice(labels)} {self.words(rng, page.lang, 5)}."
+            text += f" ({rng.choice(self.books)} {rng.randint(1, 30)}:{rng.randint(1, 40)})"
+            lines += [text, ""]
+        return lines
+
+    def render(self, page: PageSpec) -> str:
+        rng = random.Random(f"{self.spec.seed}:{page.lang}:{page.key}")
+        if page.key.endswith("_index.md"):
+            title = self.words(rng, page.lang, 2)
+            return f'+++\ntitle = {json.dumps(title, ensure_ascii=False)}\nsort_by = "title"\n+++\n'
+
+        slug = page.key.rsplit("/", 1)[-1][: -len(".md")]
+        lines = self.frontmatter(rng, page, slug)
+        if page.section == "timeline":
+            lines += self.timeline_body(rng, page)
+        else:
+            for index in range(SECTION_PARAGRAPHS.get(page.section, DEFAULT_PARAGRAPHS)):
+                if index % 3 == 0:
+                    lines += [f"## {self.words(rng, page.lang, 3)}", ""]
+                lines += [self.paragraph(rng, page.lang), ""]
+            if rng.random() < 0.2:
+                lines += ["{% info() %}", self.words(rng, page.lang, 12), "{% end %}", ""]
+            if rng.random() < 0.1:
+                lines += ["```", "[not a link](/wiki/inside-a-fence/)", "```", ""]
+        return "\n".join(lines)
+
+
+def plan(spec: CorpusSpec) -> list[PageSpec]:
+    """List every page of the tree; translations are a seeded subset of English."""
+    rng = random.Random(f"{spec.seed}:plan")
+    english: list[PageSpec] = []
+    for section, count in SECTION_PAGES.items():
+        english.append(PageSpec(DEFAULT_LANGUAGE, f"{section}/_index.md", section))
+        for number in range(count * spec.scale):
+            stem = "-".join(rng.choices(SYLLABLES["latin"], k=2)) + f"-{number}"
+            english.append(PageSpec(DEFAULT_LANGUAGE, f"{section}/{stem}.md", section))
+    english.append(PageSpec(DEFAULT_LANGUAGE, "timeline/_index.md", "timeline"))
+    for cycle in range(spec.scale):
+        folder = "timeline" if cycle == 0 else f"timeline/cycle-{cycle}"
+        english += [PageSpec(DEFAULT_LANGUAGE, f"{folder}/{chapter}.md", "timeline") for chapter in CHAPTERS]
+
+    pages = list(english)
+    for lang in LANGUAGES[1:]:
+        for page in english:
+            if page.key.endswith("_index.md") or rng.random() < spec.translation_rate:
+                pages.append(PageSpec(lang, page.key, page.section))
+    return pages
+
+
+def generate(root: Path, spec: CorpusSpec) -> dict:
+    """Write the tree for `spec` under `root`, replacing whatever was there."""
+    start = time.perf_counter()
+    if root.exists():
+        shutil.rmtree(root)
+    pages = plan(spec)
+    writer = Writer(spec, pages)
+    total = 0
+    for page in pages:
+        rel = page.key if page.lang == DEFAULT_LANGUAGE else f"{page.lang}/{page.key}"
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = writer.render(page).encode("utf-8")
+        path.write_bytes(data)
+        total += len(data)
+    manifest = {
+        "spec": asdict(spec),
+        "files": len(pages),
+        "bytes": total,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    (root / MANIFEST).write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    return manifest
+
+
+def ensure_corpus(root: Path, spec: CorpusSpec) -> dict:
+    """Reuse the tree under `root` if it was generated from `spec`, else regenerate it."""
+    manifest_path = root / MANIFEST
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest.get("spec") == asdict(spec):
+            return manifest
+    return generate(root, spec)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic content tree")
+    parser.add_argument("root", type=Path, help="Directory to write the tree to (replaced)")
+    parser.add_argument("--scale", type=int, default=1, help="Multiple of today's tree size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--broken-rate", type=float, default=CorpusSpec.broken_rate,
+                        help="Share of internal links that point nowhere")
+    parser.add_argument("--translation-rate", type=float, default=CorpusSpec.translation_rate,
+                        help="Share of English pages each language translates")
+    args = parser.parse_args()
+
+    spec = CorpusSpec(args.scale, args.seed, args.broken_rate, args.translation_rate)
+    manifest = generate(args.root, spec)
+    print(f"{manifest['files']} files, {manifest['bytes'] / 1e6:.1f} MB in {manifest['seconds']:.1f}s",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""Memory budget of the content scripts on the 1× synthetic tree.
+
+The tree is generated once under .cache/bench/ and reused. The scheduled
+benchmark workflow covers the larger scales.
+
+Run with:
+    python -m unittest discover -s scripts -p "test_*.py"
+"""
+
+import unittest
+
+from benchmark import PHASES, RSS_CEILING_MB, WORK_DIR, find_overruns, run_scale
+from profiling import peak_rss_mb
+from synthetic_corpus import CorpusSpec
+
+
+class MemoryBudgetTest(unittest.TestCase):
+    @unittest.skipIf(peak_rss_mb() is None, "peak RSS cannot be read on this platform")
+    def test_peak_rss(self):
+        run = run_scale(CorpusSpec(), WORK_DIR, PHASES, repeat=1, trace_memory=False)
+        self.assertEqual(find_overruns({"runs": [run]}, RSS_CEILING_MB), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
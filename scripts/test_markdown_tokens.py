@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Regression tests for markdown_tokens.py.
+
+Run with:
+    python -m unittest discover -s scripts -p "test_*.py"
+"""
+
+import time
+import unittest
+
+from markdown_tokens import LINK, SHORTCODE, links, tokenize, url_span
+
+# A linear pass over these inputs takes milliseconds; a quadratic one minutes
+SECONDS = 1.0
+UNBALANCED = {
+    "open brackets": "[a" * 100_000,
+    "link without a closing parenthesis": "[a](b " * 50_000,
+    "wrapped open brackets": "[a\n" * 100_000,
+    "shortcode without a closing parenthesis": "{{ x(" * 50_000,
+    "shortcode with an open string": '{{ x(a="' * 50_000,
+    "link targets without a closing parenthesis": "[x](" * 30_000,
+    "link targets in unspaced prose": ("[x](" + "漢字" * 50) * 2_000,
+    "shortcode strings with escaped quotes": '{{ x("a\\"' * 20_000,
+    "growing backtick runs": " ".join("`" * length + "a" for length in range(1, 600)),
+}
+
+
+class UnbalancedInputTest(unittest.TestCase):
+    def test_linear(self):
+        for name, body in UNBALANCED.items():
+            with self.subTest(name):
+                started = time.perf_counter()
+                tokens = list(tokenize(body))
+                self.assertLess(time.perf_counter() - started, SECONDS)
+                self.assertFalse([token for token in tokens if token.kind in (LINK, SHORTCODE)])
+
+
+class LinkTest(unittest.TestCase):
+    def test_wrapped_label(self):
+        body = "See [*The Book Closest to the\n  Truth*](/articles/the-book-closest-to-the-truth/)."
+        self.assertEqual([link.url for link in links(body)], ["/articles/the-book-closest-to-the-truth/"])
+
+    def test_innermost_brackets(self):
+        body = "[See [Forerunners](../forerunners/)"
+        self.assertEqual([(link.text, link.url) for link in links(body)], [("Forerunners", "../forerunners/")])
+
+    def test_balanced_parentheses(self):
+        body = "[Eli](https://en.wikipedia.org/wiki/Eli_(biblical_figure)) (see also)"
+        self.assertEqual([link.url for link in links(body)], ["https://en.wikipedia.org/wiki/Eli_(biblical_figure)"])
+
+    def test_title(self):
+        body = """[Elohim](/wiki/elohim/ "The Elohim") and [Yahweh](/wiki/yahweh/ 'Yahweh')"""
+        self.assertEqual([(link.url, body[link.end - 1]) for link in links(body)],
+                         [("/wiki/elohim/", ")"), ("/wiki/yahweh/", ")")])
+
+    def test_image_in_link(self):
+        body = "[![Map](/images/map.png)](/map/)"
+        self.assertEqual([(link.text, link.url) for link in links(body)], [("![Map](/images/map.png)", "/map/")])
+        self.assertEqual(url_span(body, next(links(body))), (len(body) - len("/map/)"), len(body) - 1))
+
+    def test_code_is_opaque(self):
+        self.assertEqual(list(links("`[a](b)` and\n```\n[c](d)\n```\n")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
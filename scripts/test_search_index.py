@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Size and query-time budgets of the search index built from the tree.
+
+The index is built once, from scratch, into a temporary directory.
+
+Run with:
+    python -m unittest discover -s scripts -p "test_*.py"
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from search_index import MAX_SHARD_BYTES, build, check_budgets
+
+
+class BudgetTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.out = Path(cls.tmp.name)
+        cls.manifest = build(cls.out, full=True)["manifest"]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_shard_sizes(self):
+        for lang, data in self.manifest["languages"].items():
+            with self.subTest(lang=lang):
+                self.assertTrue(data["shards"])
+                largest = max(shard["bytes"] for shard in data["shards"].values())
+                self.assertLessEqual(largest, MAX_SHARD_BYTES)
+
+    def test_budgets(self):
+        self.assertEqual(check_budgets(self.out, self.manifest), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
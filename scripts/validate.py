@@ -3,8 +3,11 @@
 Content Validation Script for Wheel of Heaven
 
 Validates:
-- Frontmatter (required fields, correct types)
+- Frontmatter (required fields, types and values, per scripts/schemas/)
 - Internal links (checks if referenced pages exist)
+- External identifiers (same_as duplicates and translation drift)
+- Core claims (core_claim_ids and core_versions agree across pages and translations)
+- Canon cross-references (hub sources, motifs and cite ids against the catalogue)
 - Translation coverage (compares against English source)
 
 Usage:
@@ -12,299 +15,326 @@ Usage:
     python scripts/validate.py --frontmatter      # Only frontmatter
     python scripts/validate.py --links            # Only links
     python scripts/validate.py --coverage         # Only translation coverage
+    python scripts/validate.py --coverage --db    # Coverage from the SQLite index
+    python scripts/validate.py --identifiers      # Only same_as identifiers
+    python scripts/validate.py --claims           # Only core claim ids and versions
+    python scripts/validate.py --canon            # Only canon cross-references
     python scripts/validate.py --fix              # Auto-fix simple issues
+    python scripts/validate.py --fix --dry-run    # Show the fixes as a diff
+    python scripts/validate.py --sync-frontmatter # Copy slug, same_as, ... from English
+    python scripts/validate.py --profile          # Append per-phase timings
+    python scripts/validate.py --watch            # Re-validate on every save
+    python scripts/validate.py --report text --report sarif:out.sarif --report junit:out.xml
+                                                  # Several reports from one run
+    python scripts/validate.py --shard 1/4 --shard-output shard-1.json
+    python scripts/validate.py merge-reports shard-*.json --report text
+                                                  # Split a run across CI jobs
 """
 
 import argparse
-import json
-import re
+import posixpath
 import sys
+import time
 from collections import defaultdict
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-# Content root
-CONTENT_ROOT = Path(__file__).parent.parent
-
-# Supported languages
-LANGUAGES = ["en", "de", "es", "fr", "ja", "ko", "ru", "zh", "zh-Hant"]
-
-# Sections that should have content
-SECTIONS = ["wiki", "timeline", "resources", "essentials", "explainers"]
-
-# Required frontmatter fields by section (for English source)
-REQUIRED_FIELDS = {
-    "wiki": ["title", "description", "template"],
-    "timeline": ["title", "description", "template"],
-    "resources": ["title", "description", "template"],
-    "essentials": ["title", "description", "template"],
-    "explainers": ["title", "description", "template"],
-    "_default": ["title"],
-}
-
-# Required fields for translations (less strict - can inherit template)
-REQUIRED_FIELDS_TRANSLATION = {
-    "wiki": ["title", "description"],
-    "timeline": ["title", "description"],
-    "resources": ["title", "description"],
-    "essentials": ["title", "description"],
-    "explainers": ["title", "description"],
-    "_default": ["title"],
-}
-
-# Valid templates by section
-VALID_TEMPLATES = {
-    "wiki": ["wiki-page.html"],
-    "timeline": ["timeline-section.html", "timeline-page.html"],
-    "resources": ["resources-page.html", "resources-section.html"],
-    "essentials": ["essentials-page.html", "essentials-section.html"],
-    "explainers": ["explainer-page.html"],
-}
+from canon_references import CATALOGUE, cites, join_canon
+from claims import badge_claims, build_claim_index
+from corpus import LANGUAGES, ROOT, Page, language_of, load_page, normalize_url, read_ahead, scan
+from corpus_db import coverage_rows, link_target, open_index
+from frontmatter_schema import load_schema, schema_sections
+from frontmatter_sync import find_drift, sync_frontmatter
+from identifiers import build_identifier_index
+from link_fixer import MIN_SCORE, LinkSuggester, apply_fixes, plan_fixes
+from markdown_tokens import links
+from namespace import build_namespace, describe_collision
+from profiling import PROFILE, add_profile_arguments, finish_profile, format_report, start_profile
+from reporting import SINKS, JsonSink, JunitSink, Reporter, TextSink, parse_report
+from sharding import add_shard_arguments, assign_shards, file_sizes, load_shards, tree_fingerprint, write_shard
+from watcher import DEFAULT_DEBOUNCE, batches, open_watcher
 
+# Content root
+CONTENT_ROOT = ROOT
 
-class ValidationError:
-    def __init__(self, file: Path, message: str, severity: str = "error"):
-        self.file = file
-        self.message = message
-        self.severity = severity  # error, warning, info
-
-    def __str__(self):
-        icon = {"error": "❌", "warning": "⚠️", "info": "ℹ️"}.get(self.severity, "•")
-        rel_path = self.file.relative_to(CONTENT_ROOT) if self.file else "N/A"
-        return f"{icon} [{self.severity.upper()}] {rel_path}: {self.message}"
-
+# Sections that should have content: those with a schema in scripts/schemas/
+SECTIONS = schema_sections()
 
-def parse_frontmatter(content: str) -> tuple[dict, str]:
-    """Extract TOML frontmatter from markdown content."""
-    normalized = content.lstrip("\ufeff \t\r\n")
-    if not normalized.startswith("+++"):
-        return {}, content
+# Frontmatter rules per section and template, from scripts/schemas/
+SCHEMA = load_schema()
 
-    parts = normalized.split("+++", 2)
-    if len(parts) < 3:
-        return {}, content
+CHECKS = ["frontmatter", "links", "identifiers", "claims", "canon", "coverage"]
 
-    frontmatter_str = parts[1].strip()
-    body = parts[2].strip()
+LINK_MESSAGES = {
+    "internal": "Broken internal link",
+    "relative": "Broken relative link",
+    "invalid": "Invalid relative link",
+}
 
-    # Simple TOML parser
-    frontmatter = {}
-    current_section = frontmatter
 
-    for line in frontmatter_str.split("\n"):
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
+class ValidationError:
+    """One finding, about a file given as a Path or as its POSIX path below CONTENT_ROOT.
 
-        if line.startswith("[") and line.endswith("]"):
-            section_name = line[1:-1]
-            if section_name not in frontmatter:
-                frontmatter[section_name] = {}
-            current_section = frontmatter[section_name]
-            continue
+    Only the interned relative path is kept (the same string as the page's
+    `rel`), so holding every finding of a large tree costs no Path objects.
+    """
 
-        if "=" in line:
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip()
+    __slots__ = ("rel", "message", "severity", "rule")
 
-            # Parse value
-            if value.startswith('"') and value.endswith('"'):
-                value = value[1:-1]
-            elif value.startswith("'") and value.endswith("'"):
-                value = value[1:-1]
-            elif value.startswith("["):
-                try:
-                    value = json.loads(value.replace("'", '"'))
-                except:
-                    pass
-            elif value == "true":
-                value = True
-            elif value == "false":
-                value = False
-            elif value.isdigit():
-                value = int(value)
+    def __init__(self, file: Path | str | None, message: str, severity: str = "error", rule: Optional[str] = None):
+        if isinstance(file, Path):
+            file = file.relative_to(CONTENT_ROOT).as_posix() if file.is_absolute() else file.as_posix()
+        self.rel = sys.intern(file) if file else None
+        self.message = message
+        self.severity = severity  # error, warning, info
+        self.rule = rule  # report rule id; derived from the message when None
 
-            current_section[key] = value
+    @property
+    def file(self) -> Optional[Path]:
+        return CONTENT_ROOT / self.rel if self.rel else None
 
-    return frontmatter, body
+    def __str__(self):
+        icon = {"error": "❌", "warning": "⚠️", "info": "ℹ️"}.get(self.severity, "•")
+        return f"{icon} [{self.severity.upper()}] {self.rel or 'N/A'}: {self.message}"
 
 
-def get_section(file_path: Path) -> Optional[str]:
-    """Get the section name from file path."""
-    rel_path = file_path.relative_to(CONTENT_ROOT)
-    parts = rel_path.parts
+def check_page_frontmatter(page: Page, errors: list[ValidationError]) -> bool:
+    """Validate one page's frontmatter; return False if it has none to check."""
+    frontmatter = page.frontmatter
 
-    # Skip language directories
-    if parts[0] in LANGUAGES[1:]:  # Non-English
-        if len(parts) > 1 and parts[1] in SECTIONS:
-            return parts[1]
-    elif parts[0] in SECTIONS:
-        return parts[0]
+    if page.error:
+        errors.append(ValidationError(page.rel, page.error))
+        return False
 
-    return None
+    if not frontmatter:
+        if not page.is_index:
+            errors.append(ValidationError(page.rel, "Missing frontmatter"))
+        return False
 
+    for message, severity, rule in SCHEMA.check(page):
+        errors.append(ValidationError(page.rel, message, severity, rule))
 
-def is_translation(file_path: Path) -> bool:
-    """Check if file is a translation (non-English)."""
-    rel_path = file_path.relative_to(CONTENT_ROOT)
-    parts = rel_path.parts
-    return parts[0] in LANGUAGES[1:]
+    return True
 
 
 def validate_frontmatter(errors: list[ValidationError]) -> int:
     """Validate frontmatter in all markdown files."""
-    count = 0
+    return sum(check_page_frontmatter(page, errors) for page in scan(CONTENT_ROOT))
 
-    for md_file in CONTENT_ROOT.rglob("*.md"):
-        if md_file.name == "README.md":
-            continue
 
-        content = md_file.read_text(encoding="utf-8")
-        frontmatter, body = parse_frontmatter(content)
+def find_broken_links(pages, namespace):
+    """Yield (page, kind, link_url, target) for every link that resolves nowhere.
 
-        if not frontmatter:
-            if md_file.name != "_index.md":
-                errors.append(ValidationError(md_file, "Missing frontmatter"))
-            continue
+    kind is "internal" for absolute links, "relative" for relative ones and
+    "invalid" for relative links climbing above the site root.
+    """
+    # Also accept section roots
+    section_roots = set()
+    for section in SECTIONS:
+        section_roots.add(f"/{section}/")
+        for lang in LANGUAGES[1:]:
+            section_roots.add(f"/{lang.lower()}/{section}/")
 
-        section = get_section(md_file)
-        is_trans = is_translation(md_file)
+    def exists(url: str) -> bool:
+        url = normalize_url(url)
+        return url in namespace or url in section_roots
 
-        # Use less strict requirements for translations
-        if is_trans:
-            required = REQUIRED_FIELDS_TRANSLATION.get(section, REQUIRED_FIELDS_TRANSLATION["_default"])
-        else:
-            required = REQUIRED_FIELDS.get(section, REQUIRED_FIELDS["_default"])
+    matches = 0
 
-        # Check required fields
-        for field in required:
-            if field not in frontmatter:
-                errors.append(ValidationError(md_file, f"Missing required field: {field}"))
+    for page in pages:
+        for link in links(page.body):
+            matches += 1
+            link_url = link.url
 
-        # Check template validity
-        if section and "template" in frontmatter:
-            valid = VALID_TEMPLATES.get(section, [])
-            if valid and frontmatter["template"] not in valid:
-                errors.append(ValidationError(
-                    md_file,
-                    f"Invalid template '{frontmatter['template']}' for section '{section}'",
-                    "warning"
-                ))
-
-        # Check description length
-        if "description" in frontmatter:
-            desc = frontmatter["description"]
-            if isinstance(desc, str):
-                if len(desc) < 50:
-                    errors.append(ValidationError(
-                        md_file, f"Description too short ({len(desc)} chars, min 50)", "warning"
-                    ))
-                elif len(desc) > 300:
-                    errors.append(ValidationError(
-                        md_file, f"Description too long ({len(desc)} chars, max 300)", "warning"
-                    ))
-
-        # Check title
-        if "title" in frontmatter:
-            title = frontmatter["title"]
-            if isinstance(title, str) and len(title) > 70:
-                errors.append(ValidationError(
-                    md_file, f"Title too long ({len(title)} chars, max 70 for SEO)", "warning"
-                ))
+            # Skip external links, anchors, and special protocols
+            if link_url.startswith(("http://", "https://", "mailto:", "#", "/")):
+                if link_url.startswith("/"):
+                    # Check internal absolute links (aliases count as valid targets)
+                    if not exists(link_url) and not link_url.lower().startswith("/images/"):
+                        yield page, "internal", link_url, normalize_url(link_url)
+                continue
 
-        count += 1
+            # Relative links resolve against the page URL, as in the browser
+            target = posixpath.normpath(posixpath.join(page.url, link_url.split("#")[0]))
+            if target.startswith("/.."):
+                yield page, "invalid", link_url, None
+            elif not exists(target):
+                yield page, "relative", link_url, normalize_url(target)
 
-    return count
+    PROFILE.count("tokenizer: markdown links", matches)
 
 
-def validate_links(errors: list[ValidationError]) -> int:
+def validate_links(errors: list[ValidationError], pages: Optional[list[Page]] = None) -> int:
     """Validate internal links in markdown files."""
-    count = 0
-
-    # Build index of existing pages
-    existing_pages = set()
-    for md_file in CONTENT_ROOT.rglob("*.md"):
-        if md_file.name == "README.md":
+    pages = scan(CONTENT_ROOT) if pages is None else pages
+    with PROFILE.span("namespace"):
+        namespace = build_namespace(pages)
+
+    # Pages claiming the same URL shadow each other in Zola
+    for first, second in namespace.collisions:
+        errors.append(ValidationError(second.page.rel, describe_collision(first, second), rule="links/url-collision"))
+
+    with PROFILE.span("suggestion index"):
+        suggester = LinkSuggester(namespace)
+    with PROFILE.span("resolve + suggest"):
+        check_links(pages, namespace, suggester, errors)
+
+    return len(pages)
+
+
+def check_links(pages, namespace, suggester: LinkSuggester, errors: list[ValidationError]):
+    """Report the broken links of `pages`, with a suggestion where one is close enough."""
+    for page, kind, link_url, target in find_broken_links(pages, namespace):
+        message = f"{LINK_MESSAGES[kind]}: {link_url}"
+        suggestion = suggester.suggest(page.lang, target) if target else None
+        if suggestion and suggestion.score >= MIN_SCORE:
+            message += f" (did you mean {suggestion.url}?)"
+        errors.append(ValidationError(page.rel, message, "warning"))
+
+
+def validate_identifiers(errors: list[ValidationError], pages: Optional[list[Page]] = None) -> int:
+    """Check same_as identifiers for duplicate entities and translation drift."""
+    index = build_identifier_index(scan(CONTENT_ROOT) if pages is None else pages)
+
+    for lang, identifier, pages in index.conflicts():
+        owner = pages[0]
+        for page in pages[1:]:
+            errors.append(ValidationError(
+                page.rel, f"same_as {identifier} is also claimed by {owner.rel}", "warning",
+                rule="identifiers/duplicate-same-as",
+            ))
+
+    for page, missing, extra in index.translation_drift():
+        if not index.by_page[page.lang, page.key][1]:
+            # Translations without same_as fall back to nothing in structured data
+            errors.append(ValidationError(
+                page.rel, f"same_as not carried over from English source ({len(missing)} identifiers)", "info",
+                rule="identifiers/same-as-missing",
+            ))
             continue
-        rel_path = md_file.relative_to(CONTENT_ROOT)
-        # Convert to URL path
-        if md_file.name == "_index.md":
-            url_path = "/" + str(rel_path.parent) + "/"
-        else:
-            url_path = "/" + str(rel_path.with_suffix("")) + "/"
-        url_path = url_path.replace("\\", "/")
-        existing_pages.add(url_path.lower())
+        message = "same_as differs from English source"
+        if missing:
+            message += f"; missing {', '.join(missing)}"
+        if extra:
+            message += f"; extra {', '.join(extra)}"
+        errors.append(ValidationError(page.rel, message, "warning", rule="identifiers/same-as-drift"))
 
-    # Also add section roots
-    for section in SECTIONS:
-        existing_pages.add(f"/{section}/")
-        for lang in LANGUAGES[1:]:
-            existing_pages.add(f"/{lang}/{section}/")
+    return len(index.by_page)
 
-    # Check links in each file
-    link_pattern = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
-    wiki_link_pattern = re.compile(r'\[\[([^\]|]+)(?:\|[^\]]+)?\]\]')
-
-    for md_file in CONTENT_ROOT.rglob("*.md"):
-        if md_file.name == "README.md":
-            continue
 
-        content = md_file.read_text(encoding="utf-8")
-        _, body = parse_frontmatter(content)
+def validate_claims(errors: list[ValidationError], pages: Optional[list[Page]] = None) -> int:
+    """Check that pages and translations agree on the core claims they pin."""
+    index = build_claim_index(scan(CONTENT_ROOT) if pages is None else pages)
 
-        # Check markdown links
-        for match in link_pattern.finditer(body):
-            link_text, link_url = match.groups()
+    for lang, claim, versions in index.version_skew():
+        newest, *older = versions
+        for version in older:
+            for page in versions[version]:
+                errors.append(ValidationError(
+                    page.rel, f"{claim} pinned at {version}, other pages pin {newest}"
+                               f" ({versions[newest][0].rel})", "warning",
+                    rule="claims/version-skew",
+                ))
 
-            # Skip external links, anchors, and special protocols
-            if link_url.startswith(("http://", "https://", "mailto:", "#", "/")):
-                if link_url.startswith("/"):
-                    # Check internal absolute links
-                    clean_url = link_url.split("#")[0].lower()
-                    if not clean_url.endswith("/"):
-                        clean_url += "/"
-                    if clean_url not in existing_pages and not clean_url.startswith("/images/"):
-                        errors.append(ValidationError(
-                            md_file, f"Broken internal link: {link_url}", "warning"
-                        ))
-                continue
+    for page, claim, english, translated in index.translation_skew():
+        if translated is None:
+            message = f"{claim} pinned at {english} in the English source but not here"
+        elif english is None:
+            message = f"{claim} pinned at {translated} but not in the English source"
+        else:
+            message = f"{claim} pinned at {translated}, English source pins {english}"
+        errors.append(ValidationError(page.rel, message + " (run --sync-frontmatter)", "warning",
+                                      rule="claims/translation-skew"))
+
+    for page, pinned in index.not_carried_over():
+        # Most translations predate the claim fields; --sync-frontmatter copies them over
+        errors.append(ValidationError(
+            page.rel, f"core_versions not carried over from English source ({len(pinned)} claims)", "info",
+            rule="claims/not-carried-over",
+        ))
+
+    for page, claim in index.unpinned:
+        errors.append(ValidationError(
+            page.rel, f"{claim} is in core_claim_ids but has no core_versions pin", "warning",
+            rule="claims/unpinned",
+        ))
+
+    unknown = list(index.unknown())
+    reported = {(page.rel, claim) for page, claim in unknown}
+    for page, claim in index.unlisted:
+        if (page.rel, claim) not in reported:
+            errors.append(ValidationError(
+                page.rel, f"{claim} is pinned in core_versions but not listed in core_claim_ids", "info",
+                rule="claims/unlisted",
+            ))
+    for page, claim in unknown:
+        errors.append(ValidationError(
+            page.rel, f"unknown claim {claim}: no page lists it in core_claim_ids", "warning",
+            rule="claims/unknown",
+        ))
+
+    return len(index.by_page)
+
+
+def validate_canon(errors: list[ValidationError], pages: Optional[list[Page]] = None, memo=None) -> int:
+    """Resolve hub sources, motifs and cite ids against the canon catalogue and the library and wiki."""
+    catalogue = CONTENT_ROOT / CATALOGUE
+    join = join_canon(scan(CONTENT_ROOT) if pages is None else pages, catalogue, memo)
+
+    for reference in join.dangling:
+        if reference.kind == "cite":
+            # A cite with its own title still renders; it only lacks a page to link to
+            errors.append(ValidationError(
+                reference.page.rel, f"cite id '{reference.value}' matches no library or wiki page or canon entry",
+                "info" if reference.titled else "warning", rule="canon/unresolved-cite",
+            ))
+        else:
+            errors.append(ValidationError(
+                reference.page.rel, f"{reference.kind} '{reference.value}' matches no library or wiki page or canon entry",
+                "warning", rule=f"canon/dangling-{reference.kind.replace('_', '-')}",
+            ))
 
-            # Relative links
-            if link_url.startswith("../") or not link_url.startswith("/"):
-                # Resolve relative path
-                try:
-                    target = (md_file.parent / link_url).resolve()
-                    target_rel = target.relative_to(CONTENT_ROOT.resolve())
-                    url_path = "/" + str(target_rel).replace("\\", "/")
-                    if not url_path.endswith("/"):
-                        url_path += "/"
-                    if url_path.lower() not in existing_pages:
-                        errors.append(ValidationError(
-                            md_file, f"Broken relative link: {link_url}", "warning"
-                        ))
-                except (ValueError, OSError):
-                    errors.append(ValidationError(
-                        md_file, f"Invalid relative link: {link_url}", "warning"
-                    ))
+    for page, value, count in join.out_of_range:
+        errors.append(ValidationError(
+            page.rel, f"cite id '{value}' is past the end of extra.references ({count} entries)", "warning",
+            rule="canon/cite-out-of-range",
+        ))
 
-        count += 1
+    for entry in join.uncovered:
+        errors.append(ValidationError(
+            catalogue, f"Canon entry {entry.id} ({entry.name}) has no library or wiki page", "info",
+            rule="canon/no-landing-page",
+        ))
 
-    return count
+    return join.citing_pages
 
 
-def validate_coverage(errors: list[ValidationError]) -> dict:
+def validate_coverage(errors: list[ValidationError], db=None) -> dict:
     """Check translation coverage against English source."""
     coverage = defaultdict(lambda: {"total": 0, "translated": 0, "missing": []})
 
-    # Get English source files (files in section directories, not in language directories)
+    # Answer from the SQLite corpus index when one is open
+    if db is not None:
+        for lang, _, key, _, translation_id, *_ in coverage_rows(db, SECTIONS):
+            if lang not in LANGUAGES[1:]:
+                continue
+            coverage[lang]["total"] += 1
+            if translation_id is not None:
+                coverage[lang]["translated"] += 1
+            else:
+                coverage[lang]["missing"].append(key)
+        return dict(coverage)
+
+    # Get English source files (files in section directories, not in language directories),
+    # ordered by section and path like the index's rows
     english_files = {}
-    for section in SECTIONS:
+    for section in sorted(SECTIONS):
         section_path = CONTENT_ROOT / section
         if section_path.exists():
-            for md_file in section_path.rglob("*.md"):
-                rel_path = md_file.relative_to(CONTENT_ROOT)
-                english_files[str(rel_path)] = md_file
+            rel_paths = (md_file.relative_to(CONTENT_ROOT).as_posix() for md_file in section_path.rglob("*.md"))
+            for rel_path in sorted(rel_paths):
+                english_files[rel_path] = CONTENT_ROOT / rel_path
 
     # Check each language
     for lang in LANGUAGES[1:]:
@@ -324,92 +354,470 @@ def validate_coverage(errors: list[ValidationError]) -> dict:
     return dict(coverage)
 
 
-def print_coverage_report(coverage: dict):
-    """Print translation coverage report."""
-    print("\n📊 Translation Coverage Report")
-    print("=" * 50)
+def run_sync_frontmatter(dry_run: bool) -> int:
+    """Report or rewrite translation frontmatter that drifted from English."""
+    pages = scan(CONTENT_ROOT)
+    drift = find_drift(pages)
+    for lang in sorted(drift):
+        for _, page, fields in drift[lang]:
+            keys = ", ".join(f"{table}.{key}" if table else key for table, key in fields)
+            print(f"{page.rel}: {keys}")
+
+    total = sum(len(items) for items in drift.values())
+    if dry_run:
+        print(f"\n{total} translations drifted from their English source")
+        return 0
+    written = sync_frontmatter(pages)
+    print(f"\nSynced {len(written)} of {total} drifted translations")
+    return 0
+
+
+def run_fix(dry_run: bool) -> int:
+    """Rewrite broken internal links to their unambiguous nearest target."""
+    pages = scan(CONTENT_ROOT)
+    namespace = build_namespace(pages)
+    fixes = plan_fixes(find_broken_links(pages, namespace), LinkSuggester(namespace))
+    diff = apply_fixes(fixes, dry_run)
+    if dry_run:
+        sys.stdout.writelines(diff)
+
+    links = sum(len(replacements) for replacements in fixes.values())
+    action = "Would rewrite" if dry_run else "Rewrote"
+    print(f"\n{action} {links} distinct links in {len(fixes)} files")
+    return 0
+
+
+def served_urls(page: Optional[Page]) -> set[str]:
+    if page is None:
+        return set()
+    return {page.url, page.file_url} | {normalize_url(alias) for alias in page.aliases}
+
+
+class WatchSession:
+    """Pages, URL namespace, reverse link graph and findings kept between saves.
+
+    A save re-reads only the saved files. Frontmatter is re-checked for those
+    files; links are re-checked for them and for every page linking to a URL
+    the save added or removed. Identifier, claim and canon checks span pages, but
+    their indexes are cheap enough to rebuild each time.
+    """
+
+    def __init__(self):
+        self.pages: dict[str, Page] = {page.rel: page for page in scan(CONTENT_ROOT, refresh=True)}
+        self.linkers: dict[str, set[str]] = defaultdict(set)  # target URL -> rels linking to it
+        self.targets: dict[str, set[str]] = {}  # rel -> target URLs
+        for page in self.pages.values():
+            self.index_links(page)
+        self.findings: dict[tuple[str, str], list[ValidationError]] = {}
+        self.canon_memo: dict = {}  # rel -> (page, references), see join_canon
+        self.rebuild_namespace()
+        self.check_frontmatter(self.pages)
+        self.check_links(self.pages)
+        self.check_identifiers()
+        self.check_claims()
+        self.check_canon()
+
+    def index_links(self, page: Page):
+        targets = {target for link in links(page.body) if (target := link_target(page, link.url))}
+        self.targets[page.rel] = targets
+        for target in targets:
+            self.linkers[target].add(page.rel)
+
+    def unindex_links(self, rel: str):
+        for target in self.targets.pop(rel, ()):
+            self.linkers[target].discard(rel)
+
+    def rebuild_namespace(self):
+        pages = list(self.pages.values())
+        self.namespace = build_namespace(pages)
+        self.suggester = LinkSuggester(self.namespace)
+        errors: list[ValidationError] = []
+        for first, second in self.namespace.collisions:
+            errors.append(ValidationError(second.page.rel, describe_collision(first, second), rule="links/url-collision"))
+        self.replace("collisions", errors)
+
+    def replace(self, checker: str, errors: list[ValidationError], rels=None):
+        """Swap in fresh findings for `checker`, for `rels` or for every page."""
+        for key in [key for key in self.findings if key[0] == checker and (rels is None or key[1] in rels)]:
+            del self.findings[key]
+        for error in errors:
+            self.findings.setdefault((checker, error.rel), []).append(error)
+
+    def check_frontmatter(self, rels):
+        errors: list[ValidationError] = []
+        for rel in rels:
+            if rel in self.pages:
+                check_page_frontmatter(self.pages[rel], errors)
+        self.replace("frontmatter", errors, set(rels))
+
+    def check_links(self, rels):
+        errors: list[ValidationError] = []
+        pages = [self.pages[rel] for rel in rels if rel in self.pages]
+        check_links(pages, self.namespace, self.suggester, errors)
+        self.replace("links", errors, set(rels))
+
+    def check_identifiers(self):
+        errors: list[ValidationError] = []
+        validate_identifiers(errors, list(self.pages.values()))
+        self.replace("identifiers", errors)
+
+    def check_claims(self):
+        errors: list[ValidationError] = []
+        validate_claims(errors, list(self.pages.values()))
+        self.replace("claims", errors)
+
+    def check_canon(self):
+        errors: list[ValidationError] = []
+        validate_canon(errors, list(self.pages.values()), self.canon_memo)
+        self.replace("canon", errors)
+
+    def snapshot(self) -> set[tuple[str, str, str]]:
+        return {
+            (rel, error.severity, error.message)
+            for (_, rel), errors in self.findings.items() for error in errors
+        }
 
-    for lang in sorted(coverage.keys()):
-        data = coverage[lang]
-        total = data["total"]
-        translated = data["translated"]
-        pct = (translated / total * 100) if total > 0 else 0
+    def update(self, changed: Optional[set[Path]]) -> tuple[set[str], set[str]]:
+        """Apply a batch of changed paths (None: everything); return (saved, re-validated) rels."""
+        if changed is None:
+            self.__init__()
+            return set(self.pages), set(self.pages)
+
+        saved: set[str] = set()
+        moved_urls: set[str] = set()
+        for path in changed:
+            rel = path.relative_to(CONTENT_ROOT).as_posix()
+            old = self.pages.pop(rel, None)
+            new = load_page(path, CONTENT_ROOT) if path.is_file() else None
+            self.unindex_links(rel)
+            if new is not None:
+                self.pages[rel] = new
+                self.index_links(new)
+            moved_urls |= served_urls(old) ^ served_urls(new)
+            saved.add(rel)
+
+        # Pages linking to a URL that appeared or disappeared change verdict too
+        dependents = set().union(*(self.linkers.get(url, ()) for url in moved_urls))
+        affected = saved | dependents
+        if moved_urls:
+            self.rebuild_namespace()
+        self.check_frontmatter(saved)
+        self.check_links(affected)
+        self.check_identifiers()
+        self.check_claims()
+        self.check_canon()
+        return saved, affected
+
+    def counts(self) -> tuple[int, int]:
+        errors = [error for found in self.findings.values() for error in found]
+        return (sum(error.severity == "error" for error in errors),
+                sum(error.severity == "warning" for error in errors))
+
+
+def run_watch(poll: bool, debounce: float) -> int:
+    """Validate once, then re-validate whatever each save touches until interrupted."""
+    start = time.perf_counter()
+    session = WatchSession()
+    error_count, warning_count = session.counts()
+    print(f"👀 Watching {len(session.pages)} pages ({error_count} errors, {warning_count} warnings,"
+          f" loaded in {time.perf_counter() - start:.1f}s). Coverage is not re-checked; Ctrl+C stops.")
+
+    watcher = open_watcher(CONTENT_ROOT, poll)
+    try:
+        for changed in batches(watcher, debounce):
+            start = time.perf_counter()
+            before = session.snapshot()
+            saved, affected = session.update(changed)
+            after = session.snapshot()
+            elapsed = (time.perf_counter() - start) * 1000
+
+            names = ", ".join(sorted(saved)[:3]) + (f" (+{len(saved) - 3} more)" if len(saved) > 3 else "")
+            print(f"\n[{datetime.now():%H:%M:%S}] {names}: re-validated {len(affected)} pages in {elapsed:.0f} ms")
+            icons = {"error": "❌", "warning": "⚠️", "info": "ℹ️"}
+            for rel, severity, message in sorted(after - before):
+                print(f"  {icons.get(severity, '•')} [{severity.upper()}] {rel}: {message}")
+            for rel, severity, message in sorted(before - after):
+                print(f"  ✅ resolved {rel}: {message}")
+            if after == before:
+                print("  no new or resolved issues")
+            error_count, warning_count = session.counts()
+            print(f"  now {error_count} errors, {warning_count} warnings")
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return 0
+
+
+# Extra fields the whole-tree checks read: identifiers, claims, then the canon join
+SHARD_EXTRA = ("same_as", "core_claim_ids", "core_versions", "alternative_names", "cited_sources", "motifs",
+               "references")
+
+
+def shard_record(page: Page, order: int, errors: list[ValidationError]) -> dict:
+    """What merge-reports needs of a page: its findings, URLs, identifiers, claims, links and citations."""
+    frontmatter = {key: page.frontmatter[key] for key in ("title", "slug", "aliases") if key in page.frontmatter}
+    extra = {key: page.extra[key] for key in SHARD_EXTRA if key in page.extra}
+    if isinstance(extra.get("references"), list):
+        # Numbered cites are only checked against the length of the list
+        extra["references"] = [{}] * len(extra["references"])
+    if extra:
+        frontmatter["extra"] = extra
+    return {
+        "rel": page.rel,
+        "order": order,
+        "error": page.error,
+        "frontmatter": frontmatter,
+        "links": [page.body[link.start:link.end] for link in links(page.body)],
+        "cites": [page.body[cite.start:cite.end] for cite in cites(page.body)],
+        "badges": [f'{{{{ claim_badge(id="{claim}") }}}}' for claim in badge_claims(page)],
+        "findings": [
+            {"message": error.message, "severity": error.severity, "rule": error.rule} for error in errors
+        ],
+    }
+
+
+def shard_page(record: dict) -> Page:
+    lang, key = language_of(record["rel"])
+    return Page(
+        root=CONTENT_ROOT,
+        rel=sys.intern(record["rel"]),
+        lang=sys.intern(lang),
+        key=sys.intern(key),
+        frontmatter=record["frontmatter"],
+        # The link, claim and canon checkers only read link, badge and cite syntax from the body
+        body="\n".join(record["links"] + record["badges"] + record["cites"]),
+        error=record["error"],
+    )
+
+
+def run_shard(index: int, count: int, checks: list[str], target: str, db=None) -> int:
+    """Check one shard's pages on their own and write the facts merge-reports needs."""
+    sizes = file_sizes(CONTENT_ROOT)
+    assignment = assign_shards(sizes, count)
+    with PROFILE.span("scan"):
+        shard = [(order, CONTENT_ROOT / rel) for order, rel in enumerate(sizes) if assignment[rel] == index - 1]
+        pages = [
+            (order, load_page(path, CONTENT_ROOT, data))
+            for (order, _), (path, data) in zip(shard, read_ahead(path for _, path in shard))
+        ]
+
+    records = []
+    frontmatter_files = 0
+    with PROFILE.span("frontmatter"):
+        for order, page in pages:
+            errors: list[ValidationError] = []
+            if "frontmatter" in checks:
+                frontmatter_files += check_page_frontmatter(page, errors)
+            records.append(shard_record(page, order, errors))
+
+    # Coverage only needs the file layout, so the first shard answers it for all
+    coverage = None
+    if "coverage" in checks and index == 1:
+        with PROFILE.span("coverage"):
+            coverage = validate_coverage([], db)
+
+    write_shard({
+        "kind": "validate",
+        "shard": [index, count],
+        "tree": tree_fingerprint(sizes),
+        "checks": checks,
+        "frontmatter_files": frontmatter_files,
+        "coverage": coverage,
+        "pages": records,
+    }, target)
+    return 0
+
+
+def run_merge(argv: list[str]) -> int:
+    """Combine --shard documents and run the whole-tree checks over them once."""
+    parser = argparse.ArgumentParser(prog="validate.py merge-reports",
+                                     description="Combine --shard outputs into one validation report")
+    parser.add_argument("shards", nargs="+", type=Path, help="Shard documents, one per shard")
+    add_report_arguments(parser)
+    args = parser.parse_args(argv)
+    try:
+        documents = load_shards(args.shards, "validate")
+    except ValueError as e:
+        parser.error(str(e))
+
+    records = sorted((record for document in documents for record in document["pages"]),
+                     key=lambda record: record["order"])
+    pages = [shard_page(record) for record in records]
+    checks = documents[0]["checks"]
+    reporter = Reporter(CONTENT_ROOT, build_sinks(parser, args))
+    stats = {}
 
-        bar_len = 30
-        filled = int(bar_len * pct / 100)
-        bar = "█" * filled + "░" * (bar_len - filled)
+    if "frontmatter" in checks:
+        with reporter.section("frontmatter", "Checking frontmatter"):
+            for record in records:
+                for finding in record["findings"]:
+                    reporter.append(ValidationError(
+                        record["rel"], finding["message"], finding["severity"], finding["rule"]
+                    ))
+            stats["frontmatter_files"] = sum(document["frontmatter_files"] for document in documents)
 
-        print(f"{lang:8} [{bar}] {pct:5.1f}% ({translated}/{total})")
+    if "links" in checks:
+        with reporter.section("links", "Checking internal links"):
+            stats["link_files"] = validate_links(reporter, pages)
+
+    if "identifiers" in checks:
+        with reporter.section("identifiers", "Checking same_as identifiers"):
+            stats["identifier_files"] = validate_identifiers(reporter, pages)
+
+    if "claims" in checks:
+        with reporter.section("claims", "Checking core claims"):
+            stats["claim_files"] = validate_claims(reporter, pages)
+
+    if "canon" in checks:
+        with reporter.section("canon", "Checking canon cross-references"):
+            stats["canon_files"] = validate_canon(reporter, pages)
+
+    coverage = {}
+    if "coverage" in checks:
+        with reporter.section("coverage", "Checking translation coverage"):
+            coverage = next(document["coverage"] for document in documents if document["coverage"] is not None)
 
-    print()
+    summary = reporter.finish(stats, coverage)
+    return exit_code(reporter, summary, args.strict)
+
+
+def add_report_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--json", action="store_true", help="Output as JSON (same as --report json)")
+    parser.add_argument("--report", action="append", default=[], metavar="FORMAT[:PATH]",
+                        help=f"Write a report ({', '.join(SINKS)}) to PATH or stdout; repeatable")
+    parser.add_argument("--no-group", action="store_true",
+                        help="In the text report, list repeated findings one by one as they are found")
+    parser.add_argument("--strict", action="store_true", help="Treat warnings as errors")
+
+
+def exit_code(reporter: Reporter, summary: dict, strict: bool) -> int:
+    if strict:
+        return 1 if len(reporter) else 0
+    return 1 if summary["errors"] > 0 else 0
+
+
+def build_sinks(parser: argparse.ArgumentParser, args: argparse.Namespace) -> list:
+    """Create one sink per --report (plain text, or JSON with --json, by default)."""
+    specs = list(args.report)
+    if args.json:
+        specs.append("json")
+    try:
+        reports = [parse_report(spec) for spec in specs or ["text"]]
+    except ValueError as e:
+        parser.error(str(e))
+    if sum(target == "-" for _, target in reports) > 1:
+        parser.error("only one report can be written to stdout")
+
+    sinks = []
+    for name, target in reports:
+        if name == "text":
+            sinks.append(TextSink(target, group=not args.no_group))
+        elif name == "junit":
+            sinks.append(JunitSink(target, strict=args.strict))
+        elif name == "json":
+            sinks.append(JsonSink(target, root=CONTENT_ROOT))
+        else:
+            sinks.append(SINKS[name](target))
+    return sinks
 
 
 def main():
-    parser = argparse.ArgumentParser(description="Validate Wheel of Heaven content")
+    if sys.argv[1:2] == ["merge-reports"]:
+        sys.exit(run_merge(sys.argv[2:]))
+
+    parser = argparse.ArgumentParser(description="Validate Wheel of Heaven content",
+                                     epilog="Run 'validate.py merge-reports SHARD...' to combine --shard outputs.")
     parser.add_argument("--frontmatter", action="store_true", help="Only validate frontmatter")
     parser.add_argument("--links", action="store_true", help="Only validate internal links")
     parser.add_argument("--coverage", action="store_true", help="Only check translation coverage")
-    parser.add_argument("--json", action="store_true", help="Output as JSON")
-    parser.add_argument("--strict", action="store_true", help="Treat warnings as errors")
+    parser.add_argument("--identifiers", action="store_true", help="Only check same_as identifiers")
+    parser.add_argument("--claims", action="store_true", help="Only check core claim ids and versions")
+    parser.add_argument("--canon", action="store_true", help="Only check canon cross-references")
+    parser.add_argument("--sync-frontmatter", action="store_true",
+                        help="Copy non-translatable frontmatter fields from English into translations")
+    parser.add_argument("--fix", action="store_true", help="Rewrite broken links with an unambiguous suggestion")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="With --fix or --sync-frontmatter, only show what would change")
+    add_report_arguments(parser)
+    parser.add_argument("--db", action="store_true", help="Answer coverage from the SQLite corpus index")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and re-validate the pages each save touches")
+    parser.add_argument("--poll", action="store_true", help="With --watch, poll instead of using inotify")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE * 1000, metavar="MS",
+                        help="With --watch, wait this long for a burst of saves to settle")
+    add_shard_arguments(parser)
+    add_profile_arguments(parser)
     args = parser.parse_args()
+    if args.shard and (args.watch or args.fix or args.sync_frontmatter):
+        parser.error("--shard cannot be combined with --watch, --fix or --sync-frontmatter")
+    start_profile(args)
+
+    if args.watch:
+        sys.exit(run_watch(args.poll, args.debounce / 1000))
+
+    if args.sync_frontmatter or args.fix:
+        code = run_sync_frontmatter(args.dry_run) if args.sync_frontmatter else run_fix(args.dry_run)
+        profile = finish_profile(args)
+        if profile:
+            print(format_report(profile))
+        sys.exit(code)
 
     # Default to all if none specified
-    run_all = not (args.frontmatter or args.links or args.coverage)
+    run_all = not (args.frontmatter or args.links or args.coverage or args.identifiers or args.claims or args.canon)
+
+    if args.shard:
+        checks = [check for check in CHECKS if run_all or getattr(args, check)]
+        code = run_shard(*args.shard, checks, args.shard_output, open_index() if args.db else None)
+        profile = finish_profile(args)
+        if profile:
+            print(format_report(profile), file=sys.stderr)
+        sys.exit(code)
 
-    errors: list[ValidationError] = []
+    sinks = build_sinks(parser, args)
+
+    reporter = Reporter(CONTENT_ROOT, sinks)
     stats = {}
 
-    print("🔍 Validating content...\n")
+    # Read the tree once up front so the checkers below are timed on their own
+    if run_all or args.frontmatter or args.links or args.identifiers or args.claims or args.canon:
+        with PROFILE.span("scan"):
+            scan(CONTENT_ROOT)
 
     # Frontmatter validation
     if run_all or args.frontmatter:
-        print("Checking frontmatter...")
-        stats["frontmatter_files"] = validate_frontmatter(errors)
+        with reporter.section("frontmatter", "Checking frontmatter"), PROFILE.span("frontmatter"):
+            stats["frontmatter_files"] = validate_frontmatter(reporter)
 
     # Link validation
     if run_all or args.links:
-        print("Checking internal links...")
-        stats["link_files"] = validate_links(errors)
+        with reporter.section("links", "Checking internal links"), PROFILE.span("links"):
+            stats["link_files"] = validate_links(reporter)
+
+    # Identifier validation
+    if run_all or args.identifiers:
+        with reporter.section("identifiers", "Checking same_as identifiers"), PROFILE.span("identifiers"):
+            stats["identifier_files"] = validate_identifiers(reporter)
+
+    # Core claim consistency
+    if run_all or args.claims:
+        with reporter.section("claims", "Checking core claims"), PROFILE.span("claims"):
+            stats["claim_files"] = validate_claims(reporter)
+
+    # Canon cross-references
+    if run_all or args.canon:
+        with reporter.section("canon", "Checking canon cross-references"), PROFILE.span("canon"):
+            stats["canon_files"] = validate_canon(reporter)
 
     # Coverage report
     coverage = {}
     if run_all or args.coverage:
-        print("Checking translation coverage...")
-        coverage = validate_coverage(errors)
-
-    # Output results
-    if args.json:
-        result = {
-            "errors": [{"file": str(e.file), "message": e.message, "severity": e.severity} for e in errors],
-            "stats": stats,
-            "coverage": coverage
-        }
-        print(json.dumps(result, indent=2))
-    else:
-        # Print errors
-        error_count = sum(1 for e in errors if e.severity == "error")
-        warning_count = sum(1 for e in errors if e.severity == "warning")
-
-        if errors:
-            print(f"\n{'='*50}")
-            print("Issues Found:")
-            print("="*50)
-            for error in sorted(errors, key=lambda e: (e.severity != "error", str(e.file))):
-                print(error)
-
-        # Print coverage
-        if coverage:
-            print_coverage_report(coverage)
-
-        # Summary
-        print("="*50)
-        print(f"Summary: {error_count} errors, {warning_count} warnings")
-
-        if args.strict:
-            sys.exit(1 if errors else 0)
-        else:
-            sys.exit(1 if error_count > 0 else 0)
+        with reporter.section("coverage", "Checking translation coverage"), PROFILE.span("coverage"):
+            coverage = validate_coverage(reporter, open_index() if args.db else None)
 
+    summary = reporter.finish(stats, coverage, finish_profile(args))
+    sys.exit(exit_code(reporter, summary, args.strict))
 
 if __name__ == "__main__":
     main()
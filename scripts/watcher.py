@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Watch the content tree for changed Markdown files.
+
+On Linux the tree is watched through inotify (via ctypes, so no extra
+dependency); elsewhere, or when inotify is unavailable, the tree is polled for
+size and mtime changes. Either way `batches` debounces bursts of events, such
+as an editor's write-to-temp-and-rename save, into one set of paths.
+
+Usage (via validate.py):
+    python scripts/validate.py --watch
+    python scripts/validate.py --watch --poll   # force the polling fallback
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, Optional
+
+from corpus import IGNORED_FILES
+
+# inotify(7) event bits
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+
+DEFAULT_DEBOUNCE = 0.15  # seconds of quiet that end a burst
+DEFAULT_POLL_INTERVAL = 0.5
+
+
+def is_content_file(path: Path) -> bool:
+    return path.suffix == ".md" and path.name not in IGNORED_FILES and not path.name.startswith(".")
+
+
+def content_dirs(root: Path) -> Iterator[Path]:
+    """Yield `root` and every directory below it that is not hidden."""
+    for dirpath, dirnames, _ in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        yield Path(dirpath)
+
+
+class InotifyWatcher:
+    """Kernel change notifications for every non-hidden directory of the tree."""
+
+    def __init__(self, root: Path):
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or not libc_name:
+            raise OSError("inotify is only available on Linux")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: dict[int, Path] = {}
+        for directory in content_dirs(root):
+            self.add(directory)
+
+    def add(self, directory: Path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"cannot watch {directory}")
+        self.dirs[wd] = directory
+
+    def wait(self, timeout: Optional[float]) -> Optional[set[Path]]:
+        """Return the files changed within `timeout` seconds (None: rescan everything)."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed: set[Path] = set()
+        data = os.read(self.fd, 256 * 1024)
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                return None
+            directory = self.dirs.get(wd)
+            if directory is None:
+                continue
+            if mask & (IN_DELETE_SELF | IN_IGNORED):
+                self.dirs.pop(wd, None)
+                continue
+            path = directory / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and not path.name.startswith("."):
+                    # Files can land in a new directory before it is watched
+                    for sub in content_dirs(path):
+                        self.add(sub)
+                        changed.update(p for p in sub.iterdir() if is_content_file(p))
+                elif mask & IN_MOVED_FROM:
+                    return None  # a moved-away tree: let the caller rescan
+                continue
+            if is_content_file(path):
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback that compares (size, mtime) snapshots of the tree."""
+
+    def __init__(self, root: Path, interval: float = DEFAULT_POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.snapshot = self.take_snapshot()
+
+    def take_snapshot(self) -> dict[Path, tuple[int, int]]:
+        snapshot = {}
+        for directory in content_dirs(self.root):
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file() and is_content_file(Path(entry.name)):
+                        stat = entry.stat()
+                        snapshot[Path(entry.path)] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def wait(self, timeout: Optional[float]) -> Optional[set[Path]]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self.take_snapshot()
+            changed = {
+                path for path in snapshot.keys() | self.snapshot.keys()
+                if snapshot.get(path) != self.snapshot.get(path)
+            }
+            self.snapshot = snapshot
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            remaining = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            time.sleep(max(remaining, 0.0))
+
+    def close(self):
+        pass
+
+
+def open_watcher(root: Path, poll: bool = False):
+    """inotify when available (and not declined), else polling."""
+    if not poll:
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError) as e:
+            print(f"inotify unavailable ({e}); polling every {DEFAULT_POLL_INTERVAL}s", file=sys.stderr)
+    return PollingWatcher(root)
+
+
+def batches(watcher, debounce: float = DEFAULT_DEBOUNCE) -> Iterator[Optional[set[Path]]]:
+    """Yield one set of changed paths per burst; None asks for a full rescan."""
+    while True:
+        changed = watcher.wait(None)
+        while changed:
+            more = watcher.wait(debounce)
+            if more is None:
+                changed = None
+            elif not more:
+                break
+            else:
+                changed |= more
+        if changed is None or changed:
+            yield changed